@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+KPI Pipeline Benchmark
+Times the generate → restructure → serialize → load pipeline on synthetic
+catalogs and records wall time, peak RSS and output bytes per stage in a JSON
+file that can be compared between commits.
+
+Every (size, stage) runs in a fresh interpreter so peak RSS belongs to that
+stage alone. Generation is seeded, so output bytes are comparable run to run.
+
+  python3 benchmark_kpi_pipeline.py                          # 213, 10k, 100k KPIs
+  python3 benchmark_kpi_pipeline.py --sizes 213,10000 --output bench_before.json
+  python3 benchmark_kpi_pipeline.py --compare bench_before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DEFAULT_SIZES = [213, 10_000, 100_000]
+
+# Pipeline stages in run order; later stages read the document written by "generate"
+STAGES = ["generate", "tree_pillar", "tree_simple", "serialize", "load"]
+
+def _peak_rss_kb():
+    """Peak resident set size of this process so far, in KB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def run_stage(stage, size, workdir):
+    """Run one stage in this process; returns its measurements"""
+    document = os.path.join(workdir, f"kpi_map_{size}.json")
+
+    if stage == "generate":
+        from generate_complete_nyss_kpis import generate_kpi_tree, synthetic_catalog
+        catalog = list(synthetic_catalog(size))
+        random.seed(0)
+        setup_rss = _peak_rss_kb()
+        start = time.perf_counter()
+        kpi_tree, _ = generate_kpi_tree(catalog, progress_every=0)
+        elapsed = time.perf_counter() - start
+        peak_rss = _peak_rss_kb()
+        with open(document, 'w', encoding='utf-8') as f:
+            json.dump(kpi_tree, f, indent=2, ensure_ascii=False)
+        output_bytes = os.path.getsize(document)
+
+    elif stage in ("tree_pillar", "tree_simple"):
+        from kpi_tree_builder import KPI_LEAF_FIELDS, KpiGrouping, build_root, pillar_order
+        data = _load(document)
+        setup_rss = _peak_rss_kb()
+        start = time.perf_counter()
+        grouping = KpiGrouping(data["nodes"])
+        if stage == "tree_pillar":
+            # fix_pillar_structure.main: pillar → macro → category → KPI
+            tree = build_root(grouping.build_tree(3, pillar_order(), keep_empty=True))
+        else:
+            # create_simple_kpi_tree.py: pillar → KPI
+            tree = build_root(grouping.build_tree(1, pillar_order(False), leaf_fields=KPI_LEAF_FIELDS + ["trend"]))
+        elapsed = time.perf_counter() - start
+        peak_rss = _peak_rss_kb()
+        output_bytes = len(json.dumps(tree).encode("utf-8"))
+
+    elif stage == "serialize":
+        from kpi_artifacts import publish_document
+        data = _load(document)
+        target = os.path.join(workdir, f"serialized_{size}.json")
+        setup_rss = _peak_rss_kb()
+        start = time.perf_counter()
+        output_bytes = publish_document(data, [target])
+        elapsed = time.perf_counter() - start
+        peak_rss = _peak_rss_kb()
+        os.remove(target)
+
+    elif stage == "load":
+        setup_rss = _peak_rss_kb()
+        start = time.perf_counter()
+        data = _load(document)
+        elapsed = time.perf_counter() - start
+        peak_rss = _peak_rss_kb()
+        output_bytes = os.path.getsize(document)
+
+    else:
+        raise ValueError(f"unknown stage {stage!r}")
+
+    return {
+        "stage": stage,
+        "size": size,
+        "wall_s": round(elapsed, 6),
+        "peak_rss_kb": peak_rss,
+        "setup_rss_kb": setup_rss,
+        "output_bytes": output_bytes
+    }
+
+def _run_isolated(stage, size, workdir):
+    """Run one stage in a fresh interpreter and parse its JSON result"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-stage", stage, "--size", str(size), "--workdir", workdir],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def run_benchmarks(sizes, stages=STAGES, repeat=1):
+    """Run every stage for every catalog size; keeps the fastest of `repeat` runs"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="kpi_bench_") as workdir:
+        for size in sizes:
+            for stage in stages:
+                runs = [_run_isolated(stage, size, workdir) for _ in range(repeat if stage != "generate" else 1)]
+                best = min(runs, key=lambda run: run["wall_s"])
+                results.append(best)
+                print(f"  ✓ {stage:<12} {size:>8,} KPIs  {best['wall_s']:>9.3f}s  "
+                      f"{best['peak_rss_kb'] / 1024:>8.1f} MB peak  {best['output_bytes']:>13,} bytes")
+    return {
+        "commit": _git_commit(),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+
+def compare(report, baseline):
+    """Print per-stage wall time and peak RSS changes against a baseline report"""
+    previous = {(r["stage"], r["size"]): r for r in baseline["results"]}
+    print(f"\n📊 Compared with {baseline.get('commit') or 'baseline'}:")
+    for result in report["results"]:
+        before = previous.get((result["stage"], result["size"]))
+        if before is None:
+            continue
+        wall = (result["wall_s"] / before["wall_s"] - 1) * 100 if before["wall_s"] else 0.0
+        rss = (result["peak_rss_kb"] / before["peak_rss_kb"] - 1) * 100 if before["peak_rss_kb"] else 0.0
+        print(f"  • {result['stage']:<12} {result['size']:>8,} KPIs  wall {wall:+7.1f}%  peak RSS {rss:+7.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the KPI data pipeline")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated synthetic catalog sizes")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to run")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage (fastest is kept)")
+    parser.add_argument("--output", default="bench_results.json", help="machine-readable results file")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from another commit to compare with")
+    parser.add_argument("--run-stage", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        print(json.dumps(run_stage(args.run_stage, args.size, args.workdir)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    stages = [stage for stage in STAGES if stage in args.stages.split(",")]
+    if "generate" not in stages:
+        parser.error("the generate stage is required: later stages read its output")
+
+    print(f"🚀 Benchmarking KPI pipeline ({', '.join(stages)}) on {', '.join(f'{s:,}' for s in sizes)} KPIs")
+    report = run_benchmarks(sizes, stages, args.repeat)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
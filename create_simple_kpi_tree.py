@@ -3,91 +3,54 @@
 Create simple tree structure: Root → 5 Pillars → KPIs directly
 No intermediate Macro/Category levels - just 2 levels for easy access
 """
-import json
+from kpi_artifacts import publish_document
+from kpi_derived import write_derived_artifacts
+from kpi_profiling import finish, profile_cli, stage
+from kpi_rollup import rollup_tree
+from kpi_tree_builder import KPI_LEAF_FIELDS, PILLAR_ORDER, build_root, load_grouping, pillar_order
 
-# Load existing KPI data
-with open('public/kpi_map.json', 'r') as f:
-    data = json.load(f)
+profiler, args = profile_cli("create_simple_kpi_tree", "Rebuild public/kpi_map.json as a 2-level pillar → KPI tree")
 
-nodes = data['nodes']
-
-# Group KPIs by pillar
-from collections import defaultdict
-kpis_by_pillar = defaultdict(list)
+# Load existing KPI data, grouped by pillar in one pass
+data, grouping = load_grouping('public/kpi_map.json')
 
-for kpi in nodes:
-    pillar = kpi.get('pillar', 'Unknown')
-    kpis_by_pillar[pillar].append(kpi)
+nodes = data['nodes']
 
 print(f'Creating simple tree structure...')
 print(f'Total KPIs: {len(nodes)}')
 print()
 
-# Define pillar order
-pillar_order = [
-    'Patient Access & Intake',
-    'Clinical Operations',
-    'Surgical Coordination',
-    'Revenue Cycle Management',
-    'Compliance & Risk Management'
-]
+for pillar_name in PILLAR_ORDER:
+    if (pillar_name,) not in grouping.members:
+        print(f'⚠️ No KPIs found for pillar: {pillar_name}')
 
-# Create tree structure
-tree = {
-    'id': 'root',
-    'name': 'NYSS Complete Operations',
-    'level': 0,
-    'type': 'root',
-    'children': []
-}
+# Create tree structure: KPIs directly under pillars (Level 2)
+tree = build_root(grouping.build_tree(1, pillar_order(with_macros=False),
+                                      leaf_fields=KPI_LEAF_FIELDS + ['trend']))
 
-for i, pillar_name in enumerate(pillar_order, 1):
-    kpis = kpis_by_pillar.get(pillar_name, [])
-    
-    if not kpis:
-        print(f'⚠️ No KPIs found for pillar: {pillar_name}')
-        continue
-    
-    # Create pillar node
-    pillar_node = {
-        'id': f'pillar_{i}',
-        'name': pillar_name,
-        'level': 1,
-        'type': 'pillar',
-        'children': []
-    }
-    
-    # Add KPIs directly under pillar (Level 2)
-    for kpi in kpis:
-        kpi_node = {
-            'id': kpi['id'],
-            'name': kpi['name'],
-            'level': 2,  # KPIs are now Level 2 (directly under pillars)
-            'type': 'kpi',
-            'value': kpi['value'],
-            'target': kpi['target'],
-            'unit': kpi.get('unit', ''),
-            'rag': kpi['rag'],
-            'trend': kpi['trend']
-        }
-        pillar_node['children'].append(kpi_node)
-    
-    tree['children'].append(pillar_node)
-    print(f'✅ {pillar_name}: {len(kpis)} KPIs')
+# RAG distribution, worst status, mean gap and monthly impact on the root and every pillar
+with stage("rollup"):
+    tree = rollup_tree(tree, nodes)
+
+for pillar in tree['children']:
+    print(f'✅ {pillar["name"]}: {len(pillar["children"])} KPIs')
 
 # Update data structure
 data['tree'] = tree
 data['version'] = '1.0-nyss-simple-2level'
 
-# Save updated structure
-with open('public/kpi_map.json', 'w') as f:
-    json.dump(data, f, indent=2)
+# Save updated structure (atomically, so pages never read a half-written file)
+publish_document(data, ['public/kpi_map.json'])
+
+# Index, normalized copy, search, ownership, delta, detail shards and hashed copies
+written = write_derived_artifacts(data, 'public')
 
 print()
 print('=' * 60)
 print('✅ SIMPLE TREE STRUCTURE CREATED!')
 print('=' * 60)
 print('Structure: Root (L0) → 5 Pillars (L1) → 213 KPIs (L2)')
+print(f'Skeleton + {len(written["shards"]["shards"])} detail shards written to public/kpi_detail/')
 print()
 print('Summary:')
 for pillar in tree['children']:
@@ -96,3 +59,5 @@ print()
 print('Now KPI cards will open with just 2 clicks:')
 print('  1. Click Pillar (Level 1)')
 print('  2. Click KPI (Level 2) → Card opens! 🎉')
+
+finish(profiler, args)
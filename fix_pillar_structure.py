@@ -4,158 +4,81 @@ Fix Tree Structure - Create proper pillar hierarchy
 Correct structure: Root → Pillars → Macro Processes → Categories → KPIs
 """
 
-import json
+import argparse
+
+from kpi_artifacts import publish_document
+from kpi_derived import write_derived_artifacts
+from kpi_incremental import add_incremental_argument, save_state, update_tree
+from kpi_profiling import add_profiling_arguments, finish, profiler_from_args, stage
+from kpi_rollup import rollup_tree
+from kpi_tree_builder import KPI_LEAF_FIELDS, build_root, load_grouping, pillar_order
+
+DOCUMENT = 'public/kpi_map.json'
+ALIASES = ['public/complete_kpi_tree.json', 'public/kpi_map_complete.json']
+
+# build_tree() arguments and version of the 4-level pillar tree
+TREE_SHAPE = {
+    "depth": 3,
+    "order": pillar_order(),
+    "id_style": "index",
+    "leaf_fields": KPI_LEAF_FIELDS,
+    "keep_empty": True,
+    "version": "1.0-nyss-complete-all-pillars-fixed"
+}
 
 def main():
-    # Load current KPI data
-    with open('public/kpi_map.json', 'r') as f:
-        data = json.load(f)
-    
-    nodes = data['nodes']
-    print(f"Total KPI nodes: {len(nodes)}")
+    parser = argparse.ArgumentParser(description="Rebuild the 4-level pillar tree in public/kpi_map.json")
+    add_incremental_argument(parser)
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    profiler = profiler_from_args(args, "fix_pillar_structure")
     
-    # Define 5 pillars with their macro processes (using exact names from data)
-    pillar_structure = {
-        "Patient Access & Intake": [
-            "Patient Acquisition",
-            "Scheduling & Appointment Mgmt",
-            "Intake Documentation",
-            "Clinical Pre-Visit Prep",
-            "Patient Experience"
-        ],
-        "Clinical Operations": [
-            "Provider Documentation",
-            "Clinical Workflow",
-            "Orders Management",
-            "Provider Performance",
-            "Care Quality & Safety"
-        ],
-        "Surgical Coordination": [
-            "Surgical Candidacy",
-            "Pre-Cert & Authorization",
-            "Surgical Scheduling",
-            "Post-Op Care",
-            "Surgical Billing"
-        ],
-        "Revenue Cycle Management": [
-            "Pre-Billing Readiness",
-            "Claim Creation",
-            "Payer Response",
-            "Appeals",
-            "AR & Cash Posting",
-            "Financial Performance"
-        ],
-        "Compliance & Risk Management": [
-            "Regulatory Compliance",
-            "Risk Management",
-            "Quality Assurance",
-            "Credentialing",
-            "Audit & Monitoring",
-            "Policy Management"
-        ]
-    }
-    
-    # Group nodes by pillar and macro process
-    pillar_map = {}
-    
-    for node in nodes:
-        pillar_name = node['pillar']
-        macro_name = node['macro_process']
-        category_name = node.get('category', 'General')
-        
-        if pillar_name not in pillar_map:
-            pillar_map[pillar_name] = {}
+    # Patch only the subtrees whose KPIs changed since the previous build, when its state is usable
+    update = update_tree(DOCUMENT, ALIASES, TREE_SHAPE) if args.incremental else None
+    if args.incremental and update is None:
+        print("🔄 No usable state from a previous build: full rebuild")
+    if update is not None:
+        update.print_report()
+        if not update.written:
+            finish(profiler, args)
+            return
+        data = update.data
+        tree_children = update.tree['children']
+        index_data = update.index_data()
+    else:
+        # Load current KPI data, grouped by pillar → macro → category in one pass
+        data, grouping = load_grouping(DOCUMENT)
         
-        if macro_name not in pillar_map[pillar_name]:
-            pillar_map[pillar_name][macro_name] = {}
+        nodes = data['nodes']
+        print(f"Total KPI nodes: {len(nodes)}")
         
-        if category_name not in pillar_map[pillar_name][macro_name]:
-            pillar_map[pillar_name][macro_name][category_name] = []
+        # Build hierarchical tree: 5 pillars with their macro processes in PILLAR_STRUCTURE order
+        build_args = {key: value for key, value in TREE_SHAPE.items() if key != "version"}
+        tree_children = grouping.build_tree(**build_args)
         
-        pillar_map[pillar_name][macro_name][category_name].append(node)
-    
-    # Build hierarchical tree with pillars
-    tree_children = []
-    node_counter = 1
-    
-    for pillar_idx, (pillar_name, macro_list) in enumerate(pillar_structure.items(), 1):
-        pillar_node = {
-            "id": f"pillar_{pillar_idx}",
-            "name": pillar_name,
-            "level": 1,
-            "type": "pillar",
-            "children": []
-        }
+        # Create root node with pillars, every level carrying its RAG / gap / impact rollup
+        with stage("rollup"):
+            tree = rollup_tree(build_root(tree_children), nodes)
+        tree_children = tree['children']
         
-        # Add macro processes to this pillar
-        for macro_name in macro_list:
-            if pillar_name not in pillar_map or macro_name not in pillar_map[pillar_name]:
-                continue
-            
-            macro_node = {
-                "id": f"pillar_{pillar_idx}_macro_{len(pillar_node['children'])+1}",
-                "name": macro_name,
-                "level": 2,
-                "type": "macro",
-                "children": []
-            }
-            
-            # Add categories to this macro process
-            categories = pillar_map[pillar_name][macro_name]
-            for category_name, kpis in categories.items():
-                category_node = {
-                    "id": f"pillar_{pillar_idx}_macro_{len(pillar_node['children'])+1}_cat_{len(macro_node['children'])+1}",
-                    "name": category_name,
-                    "level": 3,
-                    "type": "category",
-                    "children": []
-                }
-                
-                # Add KPIs to this category
-                for kpi in kpis:
-                    kpi_node = {
-                        "id": kpi['id'],
-                        "name": kpi['name'],
-                        "level": 4,
-                        "type": "kpi",
-                        "value": kpi['value'],
-                        "target": kpi['target'],
-                        "unit": kpi['unit'],
-                        "rag": kpi['rag']
-                    }
-                    category_node['children'].append(kpi_node)
-                
-                macro_node['children'].append(category_node)
-            
-            pillar_node['children'].append(macro_node)
+        # Update data structure
+        data['tree'] = tree
+        data['version'] = TREE_SHAPE["version"]
         
-        tree_children.append(pillar_node)
-    
-    # Create root node with pillars
-    tree = {
-        "id": "root",
-        "name": "NYSS Complete Operations",
-        "level": 0,
-        "type": "root",
-        "children": tree_children
-    }
-    
-    # Update data structure
-    data['tree'] = tree
-    data['version'] = "1.0-nyss-complete-all-pillars-fixed"
+        # Save updated structure: serialized once, published atomically under all three names
+        publish_document(data, [DOCUMENT] + ALIASES)
+        if args.incremental:
+            save_state(DOCUMENT, TREE_SHAPE)
+        index_data = data
     
-    # Save updated structure
-    with open('public/kpi_map.json', 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    with open('public/complete_kpi_tree.json', 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    with open('public/kpi_map_complete.json', 'w') as f:
-        json.dump(data, f, indent=2)
+    # Index, normalized copy, search, ownership, delta, detail shards and hashed copies
+    written = write_derived_artifacts(data, 'public', index_data=index_data)
+    manifest, build_manifest = written["shards"], written["hashed"]
     
     print("\n✅ Tree structure fixed!")
     print(f"📊 Structure: Root → {len(tree_children)} Pillars → Macro Processes → Categories → 213 KPIs")
+    print(f"📦 Skeleton + {len(manifest['shards'])} detail shards written to public/kpi_detail/")
+    print(f"🔖 {len(build_manifest['artifacts'])} hashed artifacts listed in public/build-manifest.json")
     
     # Print summary
     print("\n🎯 Pillar Summary:")
@@ -167,6 +90,8 @@ def main():
             for cat in macro['children']
         )
         print(f"  • {pillar['name']}: {macro_count} macros, {kpi_count} KPIs")
+    
+    finish(profiler, args)
 
 if __name__ == "__main__":
     main()
@@ -1,70 +1,59 @@
-import json
-
-# Read the current KPI data
-with open('public/kpi_map.json', 'r') as f:
-    kpi_data = json.load(f)
-
-# Rebuild tree structure correctly
-tree_structure = {}
-
-for node in kpi_data['nodes']:
-    pillar = node['pillar']
-    macro = node['macro_process']
-    category = node['category']
-    
-    if pillar not in tree_structure:
-        tree_structure[pillar] = {}
-    if macro not in tree_structure[pillar]:
-        tree_structure[pillar][macro] = {}
-    if category not in tree_structure[pillar][macro]:
-        tree_structure[pillar][macro][category] = []
-    
-    tree_structure[pillar][macro][category].append({
-        "name": node['name'],
-        "id": node['id'],
-        "level": 4
-    })
-
-# Build proper tree
-tree_children = []
-for pillar_name, macros in tree_structure.items():
-    macro_children = []
-    for macro_name, categories in macros.items():
-        category_children = []
-        for category_name, kpis in categories.items():
-            category_children.append({
-                "name": category_name,
-                "id": f"cat_{category_name.replace(' ', '_').replace('&', 'and').lower()}",
-                "level": 3,
-                "children": kpis
-            })
-        macro_children.append({
-            "name": macro_name,
-            "id": f"macro_{macro_name.replace(' ', '_').replace('&', 'and').lower()}",
-            "level": 2,
-            "children": category_children
-        })
-    tree_children.append({
-        "name": pillar_name,
-        "id": f"pillar_{pillar_name.replace(' ', '_').replace('&', 'and').lower()}",
-        "level": 1,
-        "children": macro_children
-    })
-
-kpi_data['tree']['children'] = tree_children
-
-# Save fixed data
-with open('public/kpi_map.json', 'w') as f:
-    json.dump(kpi_data, f, indent=2)
-
-with open('public/complete_kpi_tree.json', 'w') as f:
-    json.dump(kpi_data, f, indent=2)
-
-with open('public/kpi_map_complete.json', 'w') as f:
-    json.dump(kpi_data, f, indent=2)
-
-print(f"✅ Fixed tree structure!")
-print(f"📊 Pillars: {len(tree_structure)}")
-for pillar_name, macros in tree_structure.items():
-    kpi_count = sum(len(kpis) for categories in macros.values() for kpis in categories.values())
-    print(f"  • {pillar_name}: {kpi_count} KPIs")
+import argparse
+
+from kpi_artifacts import publish_document
+from kpi_derived import write_derived_artifacts
+from kpi_incremental import add_incremental_argument, save_state, update_tree
+from kpi_profiling import add_profiling_arguments, finish, profiler_from_args, stage
+from kpi_rollup import rollup_tree
+from kpi_tree_builder import load_grouping
+
+DOCUMENT = 'public/kpi_map.json'
+ALIASES = ['public/complete_kpi_tree.json', 'public/kpi_map_complete.json']
+
+# build_tree() arguments of the slug-id tree; the document version is left as it is
+TREE_SHAPE = {"depth": 3, "id_style": "slug", "leaf_fields": [], "version": None}
+
+parser = argparse.ArgumentParser(description="Rebuild the slug-id tree in public/kpi_map.json")
+add_incremental_argument(parser)
+add_profiling_arguments(parser)
+args = parser.parse_args()
+profiler = profiler_from_args(args, "fix_tree_structure")
+
+# Patch only the subtrees whose KPIs changed since the previous build, when its state is usable
+update = update_tree(DOCUMENT, ALIASES, TREE_SHAPE) if args.incremental else None
+if args.incremental and update is None:
+    print("🔄 No usable state from a previous build: full rebuild")
+
+if update is not None:
+    update.print_report()
+    if update.written:
+        kpi_data = update.data
+        index_data = update.index_data()
+else:
+    # Read the current KPI data, grouped by pillar → macro → category in one pass
+    kpi_data, grouping = load_grouping(DOCUMENT)
+
+    # Rebuild tree structure correctly
+    kpi_data['tree']['children'] = grouping.build_tree(**{key: value for key, value in TREE_SHAPE.items() if key != "version"})
+    with stage("rollup"):
+        kpi_data['tree'] = rollup_tree(kpi_data['tree'], kpi_data['nodes'])
+
+    # Save fixed data: serialized once, published atomically under all three names
+    publish_document(kpi_data, [DOCUMENT] + ALIASES)
+    if args.incremental:
+        save_state(DOCUMENT, TREE_SHAPE)
+    index_data = kpi_data
+
+if update is None or update.written:
+    # Index, normalized copy, search, ownership, delta, detail shards and hashed copies
+    written = write_derived_artifacts(kpi_data, 'public', index_data=index_data)
+
+    pillars = kpi_data['tree']['children']
+    print(f"✅ Fixed tree structure!")
+    print(f"📊 Pillars: {len(pillars)}")
+    for pillar in pillars:
+        kpi_count = sum(len(cat['children']) for macro in pillar['children'] for cat in macro['children'])
+        print(f"  • {pillar['name']}: {kpi_count} KPIs")
+    print(f"📦 Skeleton + {len(written['shards']['shards'])} detail shards written to public/kpi_detail/")
+
+finish(profiler, args)
@@ -4,79 +4,81 @@ Complete NYSS KPI Data Generator - All Pillars
 Generates 200+ KPIs from the NYSJ document with full 10-layer intelligence
 """
 
+import argparse
+import functools
+import hashlib
+import inspect
+import itertools
 import json
+import multiprocessing
+import os
 import random
 from datetime import datetime, timedelta
 
-def generate_trend_data():
-    """Generate 6 months of realistic trend data"""
-    base = random.uniform(70, 95)
+from kpi_artifacts import DATA_ARTIFACTS, atomic_open, publish_document
+from kpi_cache import DEFAULT_CACHE_DIR, NodeCache, node_key
+from kpi_dependencies import DependencyGraph
+from kpi_derived import write_derived_artifacts
+from kpi_profiling import add_profiling_arguments, finish, profiler_from_args, stage
+from kpi_rag import rag_status, rules_digest
+from kpi_store import DEFAULT_DB, KpiStore
+
+# Parallel generation: catalog rows queued per worker per batch, and rows per pool task
+PARALLEL_BATCH_PER_WORKER = 256
+PARALLEL_CHUNKSIZE = 16
+
+def generate_trend_data(periods=6, rng=random):
+    """Generate `periods` months of realistic trend data (6 by default)"""
+    base = rng.uniform(70, 95)
     trend = []
-    for i in range(6):
-        variation = random.uniform(-5, 5)
+    for i in range(periods):
+        variation = rng.uniform(-5, 5)
         value = max(0, min(100, base + variation))
         trend.append(round(value, 1))
         base = value
     return trend
 
-def determine_rag_status(value, target, is_percentage=True):
-    """Determine RAG status based on value vs target"""
-    if is_percentage:
-        if value >= target * 0.95:
-            return "green"
-        elif value >= target * 0.85:
-            return "amber"
-        else:
-            return "red"
-    else:  # For metrics like days where lower is better
-        if value <= target * 1.05:
-            return "green"
-        elif value <= target * 1.15:
-            return "amber"
-        else:
-            return "red"
-
-def generate_root_causes(kpi_name):
+def generate_root_causes(kpi_name, rng=random):
     """Generate AI-powered root causes"""
     causes_pool = [
-        {"cause": "Incomplete documentation process", "confidence": random.randint(85, 95), "impact": "High", "data_points": random.randint(800, 1500)},
-        {"cause": "Insurance verification delays", "confidence": random.randint(75, 90), "impact": "Medium", "data_points": random.randint(500, 1000)},
-        {"cause": "Staff training gaps", "confidence": random.randint(70, 85), "impact": "Medium", "data_points": random.randint(300, 700)},
-        {"cause": "System integration issues", "confidence": random.randint(80, 92), "impact": "High", "data_points": random.randint(600, 1200)},
-        {"cause": "Payer policy changes", "confidence": random.randint(75, 88), "impact": "High", "data_points": random.randint(400, 900)},
-        {"cause": "Provider workflow bottlenecks", "confidence": random.randint(78, 90), "impact": "Medium", "data_points": random.randint(350, 800)},
+        {"cause": "Incomplete documentation process", "confidence": rng.randint(85, 95), "impact": "High", "data_points": rng.randint(800, 1500)},
+        {"cause": "Insurance verification delays", "confidence": rng.randint(75, 90), "impact": "Medium", "data_points": rng.randint(500, 1000)},
+        {"cause": "Staff training gaps", "confidence": rng.randint(70, 85), "impact": "Medium", "data_points": rng.randint(300, 700)},
+        {"cause": "System integration issues", "confidence": rng.randint(80, 92), "impact": "High", "data_points": rng.randint(600, 1200)},
+        {"cause": "Payer policy changes", "confidence": rng.randint(75, 88), "impact": "High", "data_points": rng.randint(400, 900)},
+        {"cause": "Provider workflow bottlenecks", "confidence": rng.randint(78, 90), "impact": "Medium", "data_points": rng.randint(350, 800)},
     ]
-    return random.sample(causes_pool, k=min(3, len(causes_pool)))
+    return rng.sample(causes_pool, k=min(3, len(causes_pool)))
 
-def generate_predictive_insights(current_value, trend_data):
+def generate_predictive_insights(current_value, trend_data, rng=random):
     """Generate AI predictive insights"""
     recent_trend = sum(trend_data[-3:]) / 3
     if recent_trend > current_value:
         pattern = "Improving"
-        best_case = current_value + random.uniform(3, 8)
-        likely_case = current_value + random.uniform(1, 4)
-        worst_case = current_value - random.uniform(0, 2)
+        best_case = current_value + rng.uniform(3, 8)
+        likely_case = current_value + rng.uniform(1, 4)
+        worst_case = current_value - rng.uniform(0, 2)
     elif recent_trend < current_value:
         pattern = "Deteriorating"
-        best_case = current_value + random.uniform(0, 3)
-        likely_case = current_value - random.uniform(1, 4)
-        worst_case = current_value - random.uniform(3, 8)
+        best_case = current_value + rng.uniform(0, 3)
+        likely_case = current_value - rng.uniform(1, 4)
+        worst_case = current_value - rng.uniform(3, 8)
     else:
         pattern = "Stabilizing"
-        best_case = current_value + random.uniform(2, 5)
-        likely_case = current_value + random.uniform(-1, 1)
-        worst_case = current_value - random.uniform(2, 5)
+        best_case = current_value + rng.uniform(2, 5)
+        likely_case = current_value + rng.uniform(-1, 1)
+        worst_case = current_value - rng.uniform(2, 5)
     
     return {
         "pattern": pattern,
-        "confidence": random.randint(75, 90),
+        "confidence": rng.randint(75, 90),
         "timeframe": "Next 30 days",
         "scenarios": [
-            {"name": "Best Case Scenario", "value": round(max(0, min(100, best_case)), 1), "probability": f"{random.randint(20, 30)}%"},
-            {"name": "Most Likely Scenario", "value": round(max(0, min(100, likely_case)), 1), "probability": f"{random.randint(45, 60)}%"},
-            {"name": "Worst Case Scenario", "value": round(max(0, min(100, worst_case)), 1), "probability": f"{random.randint(15, 25)}%"}
+            {"name": "Best Case Scenario", "value": round(max(0, min(100, best_case)), 1), "probability": f"{rng.randint(20, 30)}%"},
+            {"name": "Most Likely Scenario", "value": round(max(0, min(100, likely_case)), 1), "probability": f"{rng.randint(45, 60)}%"},
+            {"name": "Worst Case Scenario", "value": round(max(0, min(100, worst_case)), 1), "probability": f"{rng.randint(15, 25)}%"}
         ],
-        "leading_indicators": random.sample(["System utilization", "Staff availability", "Protocol adherence", "Market conditions", "Technology adoption"], 3)
+        "leading_indicators": rng.sample(["System utilization", "Staff availability", "Protocol adherence", "Market conditions", "Technology adoption"], 3)
     }
 
 def generate_recommended_actions(rag_status):
@@ -127,17 +129,19 @@ def generate_recommended_actions(rag_status):
             }
         ]
 
-def create_kpi_node(kpi_id, name, value, target, unit, category_id, pillar_name, macro_name, category_name):
-    """Create a complete KPI node with all 10 layers"""
-    is_percentage = unit in ["%", "score", "rating"]
-    is_lower_better = unit in ["days", "minutes", "hours", "rate"] and "time" in name.lower() or "lag" in name.lower()
-    
-    if is_lower_better:
-        rag = "green" if value <= target else ("amber" if value <= target * 1.15 else "red")
-    else:
-        rag = determine_rag_status(value, target, is_percentage)
-    
-    trend_data = generate_trend_data()
+def create_kpi_node(kpi_id, name, value, target, unit, category_id, pillar_name, macro_name, category_name, trend_data=None, rng=random):
+    """Create a complete KPI node with all 10 layers
+
+    `trend_data` may be a precomputed history (e.g. a row from kpi_trends); by
+    default 6 monthly points are generated for this KPI alone. `rng` is the
+    source of randomness: the global random module, or a random.Random seeded
+    per KPI for reproducible output.
+    """
+    # Direction and bands come from the KPI's entry in the kpi_rag rule table
+    rag = rag_status(kpi_id, value, target)
+    
+    if trend_data is None:
+        trend_data = generate_trend_data(rng=rng)
     recent_avg = sum(trend_data[-3:]) / 3
     trend = "up" if value > recent_avg else ("down" if value < recent_avg else "stable")
     
@@ -152,7 +156,7 @@ def create_kpi_node(kpi_id, name, value, target, unit, category_id, pillar_name,
         {"name": "James Taylor", "title": "Provider Relations Manager", "department": "Clinical Quality", "email": "jtaylor@nyss.com"},
     ]
     
-    owner = random.choice(people_pool)
+    owner = rng.choice(people_pool)
     
     node = {
         "id": kpi_id,
@@ -176,22 +180,18 @@ def create_kpi_node(kpi_id, name, value, target, unit, category_id, pillar_name,
             "target": str(target),
             "gap": round(abs(target - value), 2),
             "gap_percentage": round(abs(target - value) / target * 100, 1) if target != 0 else 0,
-            "financial_impact": f"${abs(target - value) * random.randint(500, 5000):,} impact per month"
+            "financial_impact": f"${abs(target - value) * rng.randint(500, 5000):,} impact per month"
         },
         "trend_data": trend_data,
-        "root_causes": generate_root_causes(name),
-        "predictive_insights": generate_predictive_insights(value, trend_data),
+        "root_causes": generate_root_causes(name, rng),
+        "predictive_insights": generate_predictive_insights(value, trend_data, rng),
         "trend_analysis": {
             "current_trend": trend.capitalize(),
-            "trend_strength": random.choice(["Strong", "Moderate", "Weak"]),
-            "volatility": random.choice(["High", "Medium", "Low"]),
+            "trend_strength": rng.choice(["Strong", "Moderate", "Weak"]),
+            "volatility": rng.choice(["High", "Medium", "Low"]),
             "key_insights": f"{name} shows {trend} trajectory requiring {'immediate attention' if rag == 'red' else 'close monitoring' if rag == 'amber' else 'maintenance'}"
         },
-        "dependencies": {
-            "upstream": [f"{macro_name} upstream dependency {i+1}" for i in range(2)],
-            "downstream": [f"Downstream impact on {pillar_name} metric {i+1}" for i in range(2)],
-            "peer_metrics": [f"Related {category_name} metric {i+1}" for i in range(2)]
-        },
+        "dependencies": node_dependencies(kpi_id),
         "people_accountable": [
             {
                 "name": owner["name"],
@@ -199,56 +199,26 @@ def create_kpi_node(kpi_id, name, value, target, unit, category_id, pillar_name,
                 "department": owner["department"],
                 "email": owner["email"],
                 "role": "Primary Owner",
-                "avatar_color": random.choice(["#4A90E2", "#7B68EE", "#50C878", "#FF6B6B", "#FFA500", "#20B2AA"])
+                "avatar_color": rng.choice(["#4A90E2", "#7B68EE", "#50C878", "#FF6B6B", "#FFA500", "#20B2AA"])
             }
         ],
         "recommended_actions": generate_recommended_actions(rag),
         "contributing_factors": {
             "internal": [
-                {"factor": "Process efficiency", "impact": random.choice(["High", "Medium", "Low"])},
-                {"factor": "Staff training", "impact": random.choice(["High", "Medium", "Low"])},
-                {"factor": "Technology adoption", "impact": random.choice(["High", "Medium", "Low"])}
+                {"factor": "Process efficiency", "impact": rng.choice(["High", "Medium", "Low"])},
+                {"factor": "Staff training", "impact": rng.choice(["High", "Medium", "Low"])},
+                {"factor": "Technology adoption", "impact": rng.choice(["High", "Medium", "Low"])}
             ],
             "external": [
-                {"factor": "Market conditions", "impact": random.choice(["High", "Medium", "Low"])},
-                {"factor": "Regulatory environment", "impact": random.choice(["High", "Medium", "Low"])},
-                {"factor": "Payer policies", "impact": random.choice(["High", "Medium", "Low"])}
+                {"factor": "Market conditions", "impact": rng.choice(["High", "Medium", "Low"])},
+                {"factor": "Regulatory environment", "impact": rng.choice(["High", "Medium", "Low"])},
+                {"factor": "Payer policies", "impact": rng.choice(["High", "Medium", "Low"])}
             ]
         }
     }
     
     return node
 
-print("🚀 Generating Complete NYSS KPI Universe (200+ KPIs)...")
-print("=" * 60)
-
-# Main KPI Data Structure
-kpi_tree = {
-    "version": "1.0-nyss-complete-all-pillars",
-    "total_nodes": 0,
-    "organization": "New York Spine Specialists (NYSS)",
-    "scope": "Complete Operations - All Pillars",
-    "intelligence_layers": [
-        "Context & Business Impact",
-        "Current State Analysis",
-        "Historical Trends (6 months)",
-        "Root Cause Analysis",
-        "Predictive Insights (AI-powered)",
-        "Trend Analysis (Statistical)",
-        "Dependencies (Upstream/Downstream)",
-        "People & Accountability",
-        "Recommended Actions (Detailed)",
-        "Contributing Factors"
-    ],
-    "tree": {
-        "name": "NYSS Complete Operations",
-        "id": "nyss_root",
-        "level": 0,
-        "children": []
-    },
-    "nodes": []
-}
-
 # Define all KPIs across all pillars
 all_kpis = [
     # PILLAR 1: Patient Access & Intake (30 KPIs)
@@ -507,10 +477,60 @@ all_kpis = [
     ("pillar5", "Compliance & Risk Management", "Policy Management", "Training", "kpi_5_6_5", "Training Effectiveness Score", 88, 94, "%"),
 ]
 
-# Build tree structure
-tree_structure = {}
-for kpi_tuple in all_kpis:
-    pillar_id, pillar_name, macro_name, category_name = kpi_tuple[1], kpi_tuple[2], kpi_tuple[3], kpi_tuple[4]
+# Declared cause → effect graph over the catalog (kpi_dependencies.DEPENDENCY_EDGES)
+DEPENDENCY_GRAPH = DependencyGraph.from_catalog(all_kpis)
+
+def node_dependencies(kpi_id):
+    """Dependencies layer for a KPI: names of its declared upstream, downstream and peer KPIs"""
+    return DEPENDENCY_GRAPH.node_dependencies(kpi_id)
+
+def new_kpi_tree():
+    """Create the top-level KPI document with an empty tree and node list"""
+    return {
+        "version": "1.0-nyss-complete-all-pillars",
+        "total_nodes": 0,
+        "organization": "New York Spine Specialists (NYSS)",
+        "scope": "Complete Operations - All Pillars",
+        "intelligence_layers": [
+            "Context & Business Impact",
+            "Current State Analysis",
+            "Historical Trends (6 months)",
+            "Root Cause Analysis",
+            "Predictive Insights (AI-powered)",
+            "Trend Analysis (Statistical)",
+            "Dependencies (Upstream/Downstream)",
+            "People & Accountability",
+            "Recommended Actions (Detailed)",
+            "Contributing Factors"
+        ],
+        "tree": {
+            "name": "NYSS Complete Operations",
+            "id": "nyss_root",
+            "level": 0,
+            "children": []
+        },
+        "nodes": []
+    }
+
+def synthetic_catalog(count, base_catalog=None):
+    """Yield `count` catalog rows by replicating the base catalog across synthetic sites
+
+    The first copy is the base catalog unchanged; later copies get a site suffix
+    on id and name. Rows are produced lazily so load-test catalogs of any size
+    are never held in memory.
+    """
+    base_catalog = base_catalog or all_kpis
+    for i in range(count):
+        site, row = divmod(i, len(base_catalog))
+        pillar_id, pillar_name, macro_name, category_name, kpi_id, name, value, target, unit = base_catalog[row]
+        if site:
+            kpi_id = f"{kpi_id}_site{site + 1}"
+            name = f"{name} (Site {site + 1})"
+        yield (pillar_id, pillar_name, macro_name, category_name, kpi_id, name, value, target, unit)
+
+def add_to_tree_structure(tree_structure, kpi_tuple):
+    """Group a catalog row under pillar → macro → category, keeping only its id and name"""
+    pillar_name, macro_name, category_name = kpi_tuple[1], kpi_tuple[2], kpi_tuple[3]
     
     if pillar_name not in tree_structure:
         tree_structure[pillar_name] = {}
@@ -519,71 +539,375 @@ for kpi_tuple in all_kpis:
     if category_name not in tree_structure[pillar_name][macro_name]:
         tree_structure[pillar_name][macro_name][category_name] = []
     
-    tree_structure[pillar_name][macro_name][category_name].append(kpi_tuple)
+    tree_structure[pillar_name][macro_name][category_name].append((kpi_tuple[4], kpi_tuple[5]))
 
-# Generate all KPI nodes
-print(f"\n📊 Generating {len(all_kpis)} KPI nodes...\n")
+def iter_tree_children(tree_structure):
+    """Lazily yield the pillar → macro → category → KPI children of the root node
 
-for kpi_tuple in all_kpis:
-    pillar_id, pillar_name, macro_name, category_name, kpi_id, name, value, target, unit = kpi_tuple
-    
-    node = create_kpi_node(kpi_id, name, value, target, unit, category_name, pillar_name, macro_name, category_name)
-    kpi_tree["nodes"].append(node)
-    
-    if len(kpi_tree["nodes"]) % 50 == 0:
-        print(f"  ✓ Generated {len(kpi_tree['nodes'])} KPIs...")
+    Pillars and macros are yielded as (fields, children) pairs whose children are
+    themselves lazy; categories are yielded as complete dicts.
+    """
+    for pillar_name, macros in tree_structure.items():
+        yield {
+            "name": pillar_name,
+            "id": f"pillar_{pillar_name.replace(' ', '_').lower()}",
+            "level": 1
+        }, _iter_macro_children(macros)
 
-# Build complete tree
-tree_children = []
-for pillar_name, macros in tree_structure.items():
-    macro_children = []
+def _iter_macro_children(macros):
     for macro_name, categories in macros.items():
-        category_children = []
-        for category_name, kpis in categories.items():
-            kpi_children = []
-            for kpi_tuple in kpis:
-                kpi_id, name = kpi_tuple[4], kpi_tuple[5]
-                kpi_children.append({
-                    "name": name,
-                    "id": kpi_id,
-                    "level": 4
-                })
-            category_children.append({
-                "name": category_name,
-                "id": f"cat_{category_name.replace(' ', '_').lower()}",
-                "level": 3,
-                "children": kpi_children
-            })
-        macro_children.append({
+        yield {
             "name": macro_name,
             "id": f"macro_{macro_name.replace(' ', '_').lower()}",
-            "level": 2,
-            "children": category_children
-        })
-    tree_children.append({
-        "name": pillar_name,
-        "id": f"pillar_{pillar_name.replace(' ', '_').lower()}",
-        "level": 1,
-        "children": macro_children
-    })
-
-kpi_tree["tree"]["children"] = tree_children
-kpi_tree["total_nodes"] = len(kpi_tree["nodes"])
-
-print(f"\n✅ Generated {kpi_tree['total_nodes']} total KPI nodes")
-print(f"📁 Saving to public/kpi_map.json...")
-
-# Save to file
-output_file = "public/kpi_map.json"
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(kpi_tree, f, indent=2, ensure_ascii=False)
-
-print(f"\n✅ Complete KPI data saved to {output_file}")
-print(f"📊 Total nodes: {kpi_tree['total_nodes']}")
-print(f"\n🎯 KPI Breakdown by Pillar:")
-for pillar_name, macros in tree_structure.items():
-    total_kpis = sum(len(kpis) for categories in macros.values() for kpis in categories.values())
-    print(f"  • {pillar_name}: {total_kpis} KPIs across {len(macros)} macro processes")
-
-print(f"\n🎉 Complete NYSS KPI Universe Generated Successfully!")
-print(f"=" * 60)
+            "level": 2
+        }, _iter_category_children(categories)
+
+def _iter_category_children(categories):
+    for category_name, kpis in categories.items():
+        yield {
+            "name": category_name,
+            "id": f"cat_{category_name.replace(' ', '_').lower()}",
+            "level": 3,
+            "children": [{"name": name, "id": kpi_id, "level": 4} for kpi_id, name in kpis]
+        }
+
+def _materialize(child):
+    if isinstance(child, dict):
+        return child
+    fields, children = child
+    return {**fields, "children": [_materialize(c) for c in children]}
+
+def build_tree_children(tree_structure):
+    """Build the pillar → macro → category → KPI children of the root node"""
+    return [_materialize(child) for child in iter_tree_children(tree_structure)]
+
+def kpi_seed(kpi_id, seed=0):
+    """Derive a stable 64-bit seed for one KPI from its id and the run seed"""
+    digest = hashlib.sha256(f"{seed}:{kpi_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def create_seeded_kpi_node(kpi_tuple, seed=0, trend_periods=None):
+    """Create the node for one catalog row from its own kpi_id-derived random stream
+
+    The node depends only on the row and `seed`, never on which process
+    generates it or in what order, so parallel runs are reproducible.
+    """
+    pillar_id, pillar_name, macro_name, category_name, kpi_id, name, value, target, unit = kpi_tuple
+    rng = random.Random(kpi_seed(kpi_id, seed))
+    trend_data = generate_trend_data(trend_periods or 6, rng)
+    return create_kpi_node(kpi_id, name, value, target, unit, category_name, pillar_name, macro_name, category_name, trend_data, rng)
+
+@functools.lru_cache(maxsize=None)
+def generator_version():
+    """Hash of the code that shapes a seeded node, so cached nodes never outlive a generator change"""
+    functions = [generate_trend_data, generate_root_causes, generate_predictive_insights,
+                 generate_recommended_actions, create_kpi_node, node_dependencies, kpi_seed, create_seeded_kpi_node]
+    source = "".join(inspect.getsource(function) for function in functions) + DEPENDENCY_GRAPH.digest() + rules_digest()
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+def _seeded_node_job(job):
+    kpi_tuple, seed, trend_periods, encoder = job
+    node = create_seeded_kpi_node(kpi_tuple, seed, trend_periods)
+    return encoder(node) if encoder else node
+
+def _iter_seeded_nodes(catalog, seed, trend_periods, encoder, workers, cache=None):
+    if cache is not None:
+        yield from _iter_cached_nodes(catalog, seed, trend_periods, encoder, workers, cache)
+        return
+    
+    jobs = ((kpi_tuple, seed, trend_periods, encoder) for kpi_tuple in catalog)
+    if workers <= 1:
+        yield from map(_seeded_node_job, jobs)
+        return
+    
+    # Feed the pool in bounded batches so streaming runs keep flat memory;
+    # imap returns results in catalog order whatever the worker count.
+    with multiprocessing.Pool(workers) as pool:
+        while True:
+            batch = list(itertools.islice(jobs, workers * PARALLEL_BATCH_PER_WORKER))
+            if not batch:
+                break
+            yield from pool.imap(_seeded_node_job, batch, chunksize=PARALLEL_CHUNKSIZE)
+
+def _iter_cached_nodes(catalog, seed, trend_periods, encoder, workers, cache):
+    """Seeded nodes, loaded from `cache` where an entry exists; only the other rows are generated
+    
+    Encoding happens here rather than in the workers, since most nodes
+    never reach a worker.
+    """
+    version = generator_version()
+    rows = iter(catalog)
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        while True:
+            batch = list(itertools.islice(rows, max(workers, 1) * PARALLEL_BATCH_PER_WORKER))
+            if not batch:
+                break
+            keys = [node_key(kpi_tuple, seed, trend_periods, version) for kpi_tuple in batch]
+            nodes = [cache.get(key) for key in keys]
+            missing = [i for i, node in enumerate(nodes) if node is None]
+            jobs = [(batch[i], seed, trend_periods, None) for i in missing]
+            generated = pool.imap(_seeded_node_job, jobs, chunksize=PARALLEL_CHUNKSIZE) if pool else map(_seeded_node_job, jobs)
+            for i, node in zip(missing, generated):
+                cache.put(keys[i], node)
+                nodes[i] = node
+            for node in nodes:
+                yield encoder(node) if encoder else node
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+def generate_nodes(catalog, progress_every=50, trend_periods=None, seed=None, workers=1, encoder=None, cache=None):
+    """Yield a complete KPI node for every catalog row, printing progress as it goes
+
+    With `trend_periods` set, trend histories of that length are generated in
+    vectorized batches by kpi_trends (requires NumPy) instead of per KPI.
+
+    With a `seed` (implied by workers > 1) every KPI is generated from its own
+    kpi_id-derived random stream, optionally split across a process pool of
+    `workers`; the output is then identical for any worker count. Trend
+    histories are generated per KPI in this mode so they stay reproducible.
+
+    `encoder` optionally turns each node into its serialized form inside the
+    worker, so serialization is parallelized too.
+    
+    With a kpi_cache.NodeCache (implies a seed) nodes whose catalog row, seed,
+    trend length and generator code are unchanged are loaded from the cache
+    and only the rest are generated.
+    """
+    if (workers > 1 or cache is not None) and seed is None:
+        seed = 0
+    
+    if seed is not None:
+        nodes = _iter_seeded_nodes(catalog, seed, trend_periods, encoder, workers, cache)
+    else:
+        nodes = _iter_nodes(catalog, trend_periods, encoder)
+    
+    count = 0
+    for node in nodes:
+        yield node
+        
+        count += 1
+        if progress_every and count % progress_every == 0:
+            print(f"  ✓ Generated {count} KPIs...")
+
+def _iter_nodes(catalog, trend_periods, encoder):
+    trend_rows = None
+    if trend_periods:
+        from kpi_trends import iter_trend_rows
+        total = len(catalog) if hasattr(catalog, "__len__") else None
+        trend_rows = iter_trend_rows(trend_periods, total=total)
+    
+    for kpi_tuple in catalog:
+        pillar_id, pillar_name, macro_name, category_name, kpi_id, name, value, target, unit = kpi_tuple
+        trend_data = next(trend_rows) if trend_rows is not None else None
+        
+        node = create_kpi_node(kpi_id, name, value, target, unit, category_name, pillar_name, macro_name, category_name, trend_data)
+        yield encoder(node) if encoder else node
+
+def generate_kpi_tree(catalog, progress_every=50, trend_periods=None, seed=None, workers=1, cache=None):
+    """Build the complete KPI document in memory
+
+    Returns the document and the pillar → macro → category grouping used for the tree.
+    """
+    kpi_tree = new_kpi_tree()
+    with stage("node generation"):
+        kpi_tree["nodes"].extend(generate_nodes(catalog, progress_every, trend_periods, seed, workers, cache=cache))
+    
+    with stage("tree build"):
+        tree_structure = {}
+        for kpi_tuple in catalog:
+            add_to_tree_structure(tree_structure, kpi_tuple)
+        kpi_tree["tree"]["children"] = build_tree_children(tree_structure)
+    kpi_tree["total_nodes"] = len(kpi_tree["nodes"])
+    return kpi_tree, tree_structure
+
+def _encode(value, indent, depth):
+    """Serialize `value` as it would appear `depth` levels deep inside json.dump output"""
+    if indent is None:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    text = json.dumps(value, indent=indent, ensure_ascii=False)
+    return text.replace("\n", "\n" + " " * (indent * depth))
+
+def _write_tree_node(f, fields, children, indent, depth):
+    """Write a tree node whose children come from iter_tree_children, one subtree at a time"""
+    newline = "" if indent is None else "\n"
+    pad = "" if indent is None else " " * indent
+    key_sep = ":" if indent is None else ": "
+    
+    f.write("{")
+    for key, value in fields.items():
+        f.write(f"{newline}{pad * (depth + 1)}{json.dumps(key)}{key_sep}{_encode(value, indent, depth + 1)},")
+    f.write(f'{newline}{pad * (depth + 1)}"children"{key_sep}[')
+    empty = True
+    for child in children:
+        f.write(f"{'' if empty else ','}{newline}{pad * (depth + 2)}")
+        if isinstance(child, dict):
+            f.write(_encode(child, indent, depth + 2))
+        else:
+            _write_tree_node(f, *child, indent, depth + 2)
+        empty = False
+    f.write("]" if empty else f"{newline}{pad * (depth + 1)}]")
+    f.write(f"{newline}{pad * depth}}}")
+
+def write_kpi_tree_streaming(catalog, output_file, indent=2, progress_every=50, trend_periods=None, seed=None, workers=1,
+                             cache=None):
+    """Write the KPI document node by node while building the tree alongside
+
+    Each node is serialized and written as soon as it is generated, and the
+    tree is written one category at a time, so peak memory is one node plus
+    the id/name grouping whatever the catalog size. `tree` and `total_nodes`
+    are written after `nodes` because they are only known once the catalog
+    has been consumed; readers look keys up by name, so the document is
+    otherwise identical to the in-memory output.
+
+    Returns the node count and the pillar → macro → category grouping.
+    """
+    header = new_kpi_tree()
+    tree = header.pop("tree")
+    del tree["children"], header["total_nodes"], header["nodes"]
+    
+    newline = "" if indent is None else "\n"
+    pad = "" if indent is None else " " * indent
+    key_sep = ":" if indent is None else ": "
+    
+    tree_structure = {}
+    total_nodes = 0
+    
+    def catalog_rows():
+        for kpi_tuple in catalog:
+            add_to_tree_structure(tree_structure, kpi_tuple)
+            yield kpi_tuple
+    
+    with atomic_open(output_file) as f:
+        f.write("{")
+        for key, value in header.items():
+            f.write(f"{newline}{pad}{json.dumps(key)}{key_sep}{_encode(value, indent, 1)},")
+        
+        # Generation, serialization and writing are interleaved, so they are timed together
+        with stage("node generation + write"):
+            f.write(f'{newline}{pad}"nodes"{key_sep}[')
+            encoder = functools.partial(_encode, indent=indent, depth=2)
+            for text in generate_nodes(catalog_rows(), progress_every, trend_periods, seed, workers, encoder, cache):
+                f.write(f"{',' if total_nodes else ''}{newline}{pad * 2}{text}")
+                total_nodes += 1
+            f.write(f"{newline}{pad}]," if total_nodes else "],")
+        
+        with stage("tree build + write"):
+            f.write(f'{newline}{pad}"tree"{key_sep}')
+            _write_tree_node(f, tree, iter_tree_children(tree_structure), indent, 1)
+            f.write(f',{newline}{pad}"total_nodes"{key_sep}{total_nodes}{newline}}}')
+    
+    return total_nodes, tree_structure
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the complete NYSS KPI universe")
+    parser.add_argument("--output", default="public/kpi_map.json", help="output JSON file")
+    parser.add_argument("--stream", action="store_true",
+                        help="write nodes one by one as they are generated instead of building the document in memory")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="generate N KPIs by replicating the catalog across synthetic sites (load testing)")
+    parser.add_argument("--compact", action="store_true", help="write minified JSON instead of indent=2")
+    parser.add_argument("--trend-periods", metavar="N|HORIZON",
+                        help="trend history length, e.g. 36, 36m or 3y-daily; generated in NumPy batches")
+    parser.add_argument("--seed", type=int,
+                        help="generate each KPI from a seed derived from its kpi_id for reproducible output")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="generate KPIs on a process pool of this size (implies --seed 0 unless given)")
+    parser.add_argument("--shard-by", choices=["pillar", "kpi", "none"], default="pillar",
+                        help="also write kpi_skeleton.json and kpi_detail/ shards next to the output")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_DIR, metavar="DIR",
+                        help=f"reuse generated nodes whose catalog row is unchanged (default {DEFAULT_CACHE_DIR}; implies --seed 0)")
+    parser.add_argument("--cache-max-mb", type=float, default=512, help="evict least recently used cache entries beyond this size")
+    parser.add_argument("--columns", action="store_true",
+                        help="also write kpi_columns.bin (binary value/target/trend columns) next to the output")
+    parser.add_argument("--store", default=DEFAULT_DB, metavar="DB",
+                        help=f"record the run as a snapshot in this SQLite store (default {DEFAULT_DB})")
+    parser.add_argument("--no-store", dest="store", action="store_const", const=None, help="do not record a snapshot")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    profiler = profiler_from_args(args, "generate_complete_nyss_kpis")
+    
+    catalog = synthetic_catalog(args.synthetic) if args.synthetic else all_kpis
+    kpi_count = args.synthetic or len(all_kpis)
+    progress_every = max(50, kpi_count // 20)
+    indent = None if args.compact else 2
+    output_file = args.output
+    trend_periods = None
+    if args.trend_periods:
+        from kpi_trends import horizon_periods
+        trend_periods = horizon_periods(args.trend_periods)
+    cache = NodeCache(args.cache, int(args.cache_max_mb * 1024 * 1024)) if args.cache else None
+    
+    print(f"🚀 Generating Complete NYSS KPI Universe ({kpi_count} KPIs)...")
+    print("=" * 60)
+    print(f"\n📊 Generating {kpi_count} KPI nodes...\n")
+    
+    if args.stream:
+        if args.shard_by != "none":
+            print("⚠️ Detail shards need the in-memory document; run kpi_shards.py on the output to split it")
+        if args.columns:
+            print("⚠️ Numeric columns need the in-memory document; run kpi_columns.py on the output")
+        print(f"📁 Streaming to {output_file}...")
+        total_nodes, tree_structure = write_kpi_tree_streaming(catalog, output_file, indent, progress_every, trend_periods, args.seed, args.workers,
+                                                               cache)
+        print(f"\n✅ Generated {total_nodes} total KPI nodes")
+    else:
+        with stage("catalog load"):
+            catalog = list(catalog)
+        kpi_tree, tree_structure = generate_kpi_tree(catalog, progress_every, trend_periods, args.seed, args.workers, cache)
+        total_nodes = kpi_tree["total_nodes"]
+        
+        print(f"\n✅ Generated {total_nodes} total KPI nodes")
+        print(f"📁 Saving to {output_file}...")
+        
+        publish_document(kpi_tree, [output_file], indent, ensure_ascii=False)
+        
+        # Minifying re-parses every document, so load-test runs skip the hashed copies
+        public_dir = os.path.dirname(output_file) or "."
+        written = write_derived_artifacts(kpi_tree, public_dir, os.path.basename(output_file), shard_by=args.shard_by,
+                                          hashed=os.path.basename(output_file) in DATA_ARTIFACTS and not args.synthetic)
+        if written["shards"]:
+            print(f"📦 Skeleton + {len(written['shards']['shards'])} detail shards written")
+        if args.columns:
+            from kpi_columns import COLUMNS_FILE, write_columns
+            with stage("columns"):
+                write_columns(kpi_tree, os.path.join(public_dir, COLUMNS_FILE))
+            print(f"🔢 Numeric columns written to {COLUMNS_FILE}")
+    
+    # One row per KPI in the snapshot history, for queries across runs (kpi_store.py)
+    if args.store:
+        with stage("snapshot store"), KpiStore(args.store) as store:
+            if args.stream:
+                from kpi_reader import KpiReader
+                with KpiReader(output_file) as reader:
+                    snapshot = store.record(reader.iter_nodes(), reader.field("version"), output_file)
+            else:
+                snapshot = store.record_document(kpi_tree, output_file)
+        print(f"🗄️ Recorded as snapshot {snapshot} in {args.store}")
+    
+    print(f"\n✅ Complete KPI data saved to {output_file}")
+    if cache is not None:
+        cache.evict()
+        print(f"💾 Node cache ({args.cache}): {cache.summary()}")
+    
+    if os.path.basename(output_file) in DATA_ARTIFACTS:
+        if args.stream or args.synthetic:
+            # Streamed / load-test runs keep their flat memory profile
+            print("ℹ️ Hashed artifacts skipped for streamed / synthetic output; run kpi_artifacts.py to publish them")
+        else:
+            print(f"🔖 {len(written['hashed']['artifacts'])} hashed artifacts listed in build-manifest.json")
+    print(f"📊 Total nodes: {total_nodes}")
+    print(f"\n🎯 KPI Breakdown by Pillar:")
+    for pillar_name, macros in tree_structure.items():
+        total_kpis = sum(len(kpis) for categories in macros.values() for kpis in categories.values())
+        print(f"  • {pillar_name}: {total_kpis} KPIs across {len(macros)} macro processes")
+    
+    print(f"\n🎉 Complete NYSS KPI Universe Generated Successfully!")
+    print(f"=" * 60)
+    
+    finish(profiler, args)
+
+if __name__ == "__main__":
+    main()
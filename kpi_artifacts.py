@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+KPI Build Artifacts
+Publishes the generated data files under content-hash names with a build
+manifest, so pages can cache them forever and only download a file again
+when its content actually changes. Hashed copies are minified. Cloudflare
+Pages compresses responses at the edge and ignores precompressed files, so
+the build does not write .gz/.br siblings; `--compress` adds them for hosts
+that serve them (nginx gzip_static / brotli_static).
+
+  public/data/kpi_map.<hash>.json      immutable, minified, content-addressed copy
+  public/data/kpi_map.<hash>.json.gz   gzip -9 sibling (--compress)
+  public/data/kpi_map.<hash>.json.br   brotli sibling (--compress, needs the brotli package)
+  public/build-manifest.json           logical name → hashed file (always revalidated)
+
+All files are written through atomic_open()/publish_document(): content goes
+to a temp file that is fsynced and then renamed into place, so a dashboard
+reading during a rebuild sees either the old or the new file, never a
+truncated one.
+
+Build state kept next to a document (delta snapshot, tree state, offsets)
+lives under sidecar_path(), outside the published directory: vite copies all
+of public/ into dist/, and everything there is deployed.
+"""
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+
+from kpi_profiling import stage
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are skipped without it
+    brotli = None
+
+HASHED_DIR = "data"
+STATE_DIR = ".kpi_state"
+BUILD_MANIFEST = "build-manifest.json"
+HASH_LENGTH = 12
+
+# Brotli quality of the --compress siblings: q11 costs minutes on large documents for a few % less
+BROTLI_QUALITY = 9
+
+# Logical data files published by the build, relative to the public directory
+DATA_ARTIFACTS = [
+    "kpi_map.json",
+    "complete_kpi_tree.json",
+    "kpi_map_complete.json",
+    "kpi_skeleton.json",
+    "kpi_index.json",
+    "kpi_map_normalized.json",
+    "kpi_search.json",
+    "kpi_ownership.json",
+    "people_data.json",
+]
+
+# mkstemp creates 0600 files; published files get the usual umask-derived mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _fsync_dir(directory):
+    """Persist renames in `directory` (a no-op where directories cannot be opened)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextlib.contextmanager
+def atomic_open(path, mode='w', encoding='utf-8'):
+    """Open a temp file next to `path`; on success fsync it and rename it over `path`
+
+    If the block raises, the temp file is removed and `path` is left untouched.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, 0o666 & ~_UMASK)
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _fsync_dir(directory)
+
+def sidecar_path(path, suffix):
+    """Build state file of the document at `path`, kept out of its (published) directory
+
+    public/kpi_map.json + ".snapshot" → .kpi_state/public/kpi_map.json.snapshot,
+    next to public/ rather than inside it.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    return os.path.join(os.path.dirname(directory), STATE_DIR, os.path.basename(directory),
+                        os.path.basename(path) + suffix)
+
+def remove_legacy_sidecar(path, suffix):
+    """Remove <path><suffix>, where builds used to keep state inside the published directory"""
+    try:
+        os.remove(path + suffix)
+    except FileNotFoundError:
+        pass
+
+def link_alias(source, alias):
+    """Atomically make `alias` a hard link to `source` (a copy where links are unsupported)"""
+    directory = os.path.dirname(alias) or "."
+    tmp = os.path.join(directory, f".{os.path.basename(alias)}.{os.getpid()}.link")
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+        with open(tmp, 'rb') as f:
+            os.fsync(f.fileno())
+    os.replace(tmp, alias)
+    _fsync_dir(directory)
+
+def publish_document(data, paths, indent=2, ensure_ascii=True):
+    """Serialize `data` once and publish it atomically under every path in `paths`
+
+    The first path is written through atomic_open(); the others are published
+    as hard links to it, each swapped in by rename. Because every writer
+    replaces files instead of rewriting them in place, the shared inode is
+    never modified after publication.
+    """
+    first, *aliases = paths
+    with stage("serialize"):
+        content = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii).encode('utf-8')
+    with stage("write"):
+        with atomic_open(first, 'wb') as f:
+            f.write(content)
+        for alias in aliases:
+            link_alias(first, alias)
+    return len(content)
+
+def file_hash(path, chunk_size=1 << 20):
+    """Full SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def minify_json(path):
+    """Re-serialize a JSON file without whitespace; returns the UTF-8 bytes"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def write_compressed_siblings(path, brotli_quality=BROTLI_QUALITY):
+    """Write <path>.gz (gzip -9) and <path>.br (brotli at `brotli_quality`); returns their sizes
+
+    Siblings that already exist are reused: `path` is content-addressed, so
+    they are already up to date. The brotli size is None without the brotli
+    package.
+    """
+    sizes = {"gzip_bytes": None, "brotli_bytes": None}
+    content = None
+
+    if not os.path.exists(path + ".gz"):
+        with open(path, 'rb') as f:
+            content = f.read()
+        # mtime=0 keeps the .gz byte-identical across rebuilds
+        _write_atomic(path + ".gz", gzip.compress(content, compresslevel=9, mtime=0))
+    sizes["gzip_bytes"] = os.path.getsize(path + ".gz")
+
+    if brotli is not None:
+        if not os.path.exists(path + ".br"):
+            if content is None:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            _write_atomic(path + ".br", brotli.compress(content, quality=brotli_quality))
+        sizes["brotli_bytes"] = os.path.getsize(path + ".br")
+    return sizes
+
+def _write_atomic(path, content):
+    with atomic_open(path, 'wb') as f:
+        f.write(content)
+
+def hashed_name(logical_name, digest):
+    """kpi_map.json + digest → kpi_map.<first HASH_LENGTH hex chars>.json"""
+    stem, ext = os.path.splitext(os.path.basename(logical_name))
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+def _prune_hashed(hashed_dir, logical_name, keep):
+    """Remove all but the `keep` most recent hashed copies (and siblings) of one logical file"""
+    stem, ext = os.path.splitext(os.path.basename(logical_name))
+    pattern = re.compile(rf"^{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}$")
+    copies = [os.path.join(hashed_dir, name) for name in os.listdir(hashed_dir) if pattern.match(name)]
+    copies.sort(key=os.path.getmtime, reverse=True)
+    for old in copies[keep:]:
+        for path in (old, old + ".gz", old + ".br"):
+            if os.path.exists(path):
+                os.remove(path)
+
+def publish_hashed(logical_names=None, public_dir="public", keep=2, minify=True, compress=False,
+                   brotli_quality=BROTLI_QUALITY):
+    """Copy each existing data file to its content-hash name and write the build manifest
+
+    With `minify` the hashed copy is the whitespace-free serialization (and
+    the hash is of those bytes); with `compress` it gets .gz/.br siblings
+    (brotli at `brotli_quality`).
+    Unchanged files map to the same hashed name, so re-running the build is
+    cheap and leaves cached URLs valid. The previous `keep - 1` copies of each
+    file are kept for pages that loaded an older manifest. Returns the manifest,
+    which records the source, minified and compressed sizes of every file.
+    """
+    logical_names = logical_names or DATA_ARTIFACTS
+    hashed_dir = os.path.join(public_dir, HASHED_DIR)
+    os.makedirs(hashed_dir, exist_ok=True)
+
+    artifacts = {}
+    for logical_name in logical_names:
+        source = os.path.join(public_dir, logical_name)
+        if not os.path.exists(source):
+            continue
+
+        if minify:
+            content = minify_json(source)
+            digest = hashlib.sha256(content).hexdigest()
+        else:
+            content = None
+            digest = file_hash(source)
+
+        target = os.path.join(hashed_dir, hashed_name(logical_name, digest))
+        if os.path.exists(target):
+            os.utime(target)
+        elif content is not None:
+            _write_atomic(target, content)
+        else:
+            link_alias(source, target)
+
+        entry = {
+            "path": f"{HASHED_DIR}/{os.path.basename(target)}",
+            "sha256": digest,
+            "source_bytes": os.path.getsize(source),
+            "bytes": os.path.getsize(target)
+        }
+        if compress:
+            entry.update(write_compressed_siblings(target, brotli_quality))
+        _prune_hashed(hashed_dir, logical_name, keep)
+        artifacts[logical_name] = entry
+
+    manifest = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "artifacts": artifacts
+    }
+    publish_document(manifest, [os.path.join(public_dir, BUILD_MANIFEST)])
+    return manifest
+
+def resolve_artifact(logical_name, public_dir="public"):
+    """Path of the current hashed copy of `logical_name`, or the logical file if not published"""
+    try:
+        with open(os.path.join(public_dir, BUILD_MANIFEST), 'r', encoding='utf-8') as f:
+            entry = json.load(f)["artifacts"].get(logical_name)
+    except FileNotFoundError:
+        entry = None
+    return os.path.join(public_dir, entry["path"] if entry else logical_name)
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish data files under content-hash names")
+    parser.add_argument("--public-dir", default="public")
+    parser.add_argument("--keep", type=int, default=2, help="hashed copies to keep per file")
+    parser.add_argument("--no-minify", action="store_true", help="publish the files byte-for-byte")
+    parser.add_argument("--compress", action="store_true",
+                        help="also write .gz/.br siblings, for hosts that serve precompressed files")
+    parser.add_argument("--brotli-quality", type=int, default=BROTLI_QUALITY,
+                        help=f"brotli quality of the .br siblings (default {BROTLI_QUALITY})")
+    args = parser.parse_args()
+
+    manifest = publish_hashed(public_dir=args.public_dir, keep=args.keep,
+                              minify=not args.no_minify, compress=args.compress, brotli_quality=args.brotli_quality)
+    print(f"✅ Build manifest written to {os.path.join(args.public_dir, BUILD_MANIFEST)}")
+    print_size_report(manifest)
+    if brotli is None and args.compress:
+        print("⚠️ brotli package not installed: .br siblings skipped (pip install brotli)")
+
+def print_size_report(manifest):
+    """Print source / minified / gzip / brotli sizes for every published file"""
+    def size(value):
+        return f"{value:>11,}" if value is not None else f"{'-':>11}"
+
+    print(f"\n  {'artifact':<26}{'source':>11}{'minified':>11}{'gzip':>11}{'brotli':>11}")
+    for logical_name, entry in manifest["artifacts"].items():
+        print(f"  {logical_name:<26}{size(entry.get('source_bytes'))}{size(entry['bytes'])}"
+              f"{size(entry.get('gzip_bytes'))}{size(entry.get('brotli_bytes'))}")
+
+if __name__ == "__main__":
+    main()
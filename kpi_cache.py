@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+KPI Node Cache
+Content-addressed on-disk cache of generated KPI nodes. Each entry is keyed
+by a hash of everything that determines the node (catalog row, run seed,
+trend length and generator version) and holds the node as compact JSON, so
+a rebuild after a catalog edit only regenerates the rows that changed.
+
+Entries live in <cache dir>/<first 2 hex digits>/<key>.json. Hits refresh an
+entry's mtime; evict() removes least recently used entries until the cache
+fits its size limit.
+
+  python3 kpi_cache.py --stats
+  python3 kpi_cache.py --evict --max-mb 64
+  python3 kpi_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+DEFAULT_CACHE_DIR = ".kpi_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+def node_key(kpi_tuple, seed, trend_periods, generator_version):
+    """Cache key for the node generated from one catalog row"""
+    material = json.dumps([generator_version, seed, trend_periods, list(kpi_tuple)], separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+class NodeCache:
+    """Generated nodes on disk, keyed by node_key()"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key):
+        """The cached node for `key`, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                node = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return node
+
+    def put(self, key, node):
+        """Store `node` under `key`
+
+        The entry is renamed into place but not fsynced: a torn entry after a
+        crash fails to parse and is regenerated as a miss, which is cheaper
+        than two fsyncs per generated node.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(node, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def entries(self):
+        """(mtime, size, path) of every entry"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def evict(self, max_bytes=None):
+        """Remove least recently used entries until the cache fits `max_bytes`; returns bytes freed"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            freed += size
+            self.evicted += 1
+        return freed
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = f", {self.hits / lookups:.1%} hit rate" if lookups else ""
+        evicted = f", {self.evicted} evicted" if self.evicted else ""
+        return f"{self.hits} cached, {self.misses} generated{rate}{evicted}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the generated KPI node cache")
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR, help="cache directory")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024, help="size limit for --evict")
+    parser.add_argument("--stats", action="store_true", help="print entry count and size")
+    parser.add_argument("--evict", action="store_true", help="remove least recently used entries down to --max-mb")
+    parser.add_argument("--clear", action="store_true", help="remove every entry")
+    args = parser.parse_args()
+
+    cache = NodeCache(args.dir, int(args.max_mb * 1024 * 1024))
+    if args.clear:
+        cache.clear()
+        print(f"🧹 Cleared {args.dir}")
+    if args.evict:
+        freed = cache.evict()
+        print(f"🧹 Evicted {cache.evicted} entries ({freed / 1024 / 1024:.1f} MB)")
+    if args.stats or not (args.clear or args.evict):
+        entries = cache.entries()
+        print(f"📦 {args.dir}: {len(entries)} nodes, {sum(size for _, size, _ in entries) / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+KPI Numeric Columns
+Binary columnar export of the numbers in a KPI document (kpi_columns.bin):
+value, target, gap and gap percentage as float32 columns, RAG as uint8 codes,
+scenario values as a KPIs × 3 matrix and trend histories as a KPIs × periods
+float32 matrix (shorter histories are NaN-padded). Analytics and charts get
+the numbers without parsing the JSON text.
+
+Layout: 8-byte magic, uint32 little-endian header length, UTF-8 JSON header,
+then the data section from the next 8-byte boundary. The header lists every
+column's dtype, shape and byte offset within the data section (each column
+is 8-byte aligned), so Python can np.memmap it and the browser can view it
+as `new Float32Array(buffer, offset, length)` (see
+public/static/kpi_columns.js).
+
+  python3 kpi_columns.py                                  # public/kpi_map.json → public/kpi_columns.bin
+  python3 kpi_columns.py --input big.json --output big_columns.bin
+"""
+
+import argparse
+import json
+import os
+import struct
+
+import numpy as np
+
+from kpi_artifacts import atomic_open
+from kpi_rag import RAG_CODES
+
+COLUMNS_FILE = "kpi_columns.bin"
+MAGIC = b"KPICOL1\0"
+FORMAT = "kpi-columns/1"
+ALIGNMENT = 8
+
+def _number(text):
+    """Numeric value of a "245" / "5.2" / 245 field; NaN when it is not a number"""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return float("nan")
+
+def build_columns(nodes):
+    """{column name: numpy array} for a list of KPI nodes"""
+    count = len(nodes)
+    periods = max((len(node.get("trend_data", [])) for node in nodes), default=0)
+    scenarios = max((len(node.get("predictive_insights", {}).get("scenarios", [])) for node in nodes), default=0)
+
+    columns = {
+        "value": np.empty(count, dtype=np.float32),
+        "target": np.empty(count, dtype=np.float32),
+        "gap": np.empty(count, dtype=np.float32),
+        "gap_percentage": np.empty(count, dtype=np.float32),
+        "rag": np.empty(count, dtype=np.uint8),
+        "scenarios": np.full((count, scenarios), np.nan, dtype=np.float32),
+        "trend": np.full((count, periods), np.nan, dtype=np.float32),
+    }
+    rag_codes = {rag: code for code, rag in enumerate(RAG_CODES)}
+    for row, node in enumerate(nodes):
+        state = node.get("current_state", {})
+        columns["value"][row] = _number(node.get("value"))
+        columns["target"][row] = _number(node.get("target"))
+        columns["gap"][row] = _number(state.get("gap"))
+        columns["gap_percentage"][row] = _number(state.get("gap_percentage"))
+        columns["rag"][row] = rag_codes.get(node.get("rag"), 255)
+        values = [_number(s.get("value")) for s in node.get("predictive_insights", {}).get("scenarios", [])]
+        columns["scenarios"][row, :len(values)] = values
+        trend = node.get("trend_data", [])
+        columns["trend"][row, :len(trend)] = trend
+    return columns
+
+def _align(offset):
+    return -offset % ALIGNMENT
+
+def data_offset(header_length):
+    """File offset of the data section for a header of `header_length` bytes"""
+    offset = len(MAGIC) + 4 + header_length
+    return offset + _align(offset)
+
+def write_columns(data, path=os.path.join("public", COLUMNS_FILE)):
+    """Write the numeric columns of a KPI document; returns the header"""
+    nodes = data["nodes"]
+    columns = build_columns(nodes)
+
+    specs = {name: {"dtype": array.dtype.name, "shape": list(array.shape)} for name, array in columns.items()}
+    header = {
+        "format": FORMAT,
+        "version": data.get("version"),
+        "count": len(nodes),
+        "periods": columns["trend"].shape[1],
+        "ids": [node["id"] for node in nodes],
+        "rag_codes": RAG_CODES,
+        "columns": specs
+    }
+
+    offset = 0
+    for name, array in columns.items():
+        specs[name]["offset"] = offset
+        offset += array.nbytes + _align(array.nbytes)
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = data_offset(len(encoded))
+
+    with atomic_open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(encoded)
+        for name, array in columns.items():
+            f.write(b"\0" * (data_start + specs[name]["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<")).tobytes())
+    return header
+
+def read_header(path):
+    """The JSON header of a columns file and the file offset of its data section"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a KPI columns file")
+        (length,) = struct.unpack("<I", f.read(4))
+        return json.loads(f.read(length)), data_offset(length)
+
+class KpiColumns:
+    """Memory-mapped read access to a kpi_columns.bin file"""
+
+    def __init__(self, path=os.path.join("public", COLUMNS_FILE)):
+        self.path = path
+        self.header, self.data_start = read_header(path)
+        self.ids = self.header["ids"]
+        self._rows = None
+        self._columns = {}
+
+    def __len__(self):
+        return self.header["count"]
+
+    def column(self, name):
+        """Read-only memmap of one column; only the pages touched are read"""
+        if name not in self._columns:
+            spec = self.header["columns"][name]
+            dtype = np.dtype(spec["dtype"]).newbyteorder("<")
+            shape = tuple(spec["shape"])
+            if 0 in shape:
+                self._columns[name] = np.empty(shape, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(self.path, dtype=dtype, mode="r",
+                                                 offset=self.data_start + spec["offset"], shape=shape)
+        return self._columns[name]
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def row(self, kpi_id):
+        """Row number of a KPI"""
+        if self._rows is None:
+            self._rows = {kpi_id: row for row, kpi_id in enumerate(self.ids)}
+        return self._rows[kpi_id]
+
+    def rag(self):
+        """RAG status names per row"""
+        codes = self.header["rag_codes"]
+        return [codes[code] if code < len(codes) else None for code in self.column("rag")]
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the numbers of a KPI document as binary columns")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document")
+    parser.add_argument("--output", help=f"columns file (default: {COLUMNS_FILE} next to the input)")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    output = args.output or os.path.join(os.path.dirname(args.input), COLUMNS_FILE)
+    header = write_columns(data, output)
+
+    columns = KpiColumns(output)
+    print(f"✅ {output}: {os.path.getsize(output):,} bytes for {header['count']} KPIs × {header['periods']} periods")
+    for name, spec in header["columns"].items():
+        print(f"  • {name:<15} {spec['dtype']:<8} {'×'.join(map(str, spec['shape']))}")
+    if len(columns) and header["periods"]:
+        print(f"📈 Mean of latest trend period: {np.nanmean(columns['trend'][:, -1]):.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+KPI Delta Feed
+RFC 6902 JSON Patch deltas between successive snapshots of kpi_map.json, so
+a dashboard that already holds one build only downloads what changed.
+
+Each build keeps the snapshot it published (.kpi_state/<dir>/<document>.snapshot,
+outside the deployed directory; in canonical form: minified, keys sorted)
+and diffs the new document against it. Snapshots are identified by the SHA-256 of that canonical JSON (first
+HASH_LENGTH hex chars), so a document brought up to date by a delta has the
+id of the build it reproduces even though the keys a patch adds end up last
+in their object; they carry the document's `version` field for display.
+
+  kpi_delta.json                   latest snapshot + recent deltas, newest first (always revalidated)
+  kpi_delta/<from>_<to>.json       {format, from, to, ops}; immutable once written
+
+diff() aligns lists of objects with ids (nodes, tree children) by id, so a
+changed KPI patches /nodes/<i>/... rather than shifting the array.
+apply_patch() implements all six RFC 6902 operations and compose() merges
+successive patches into one, dropping writes a later write replaces.
+
+  python3 kpi_delta.py                                     # diff public/kpi_map.json against its snapshot
+  python3 kpi_delta.py --apply public/kpi_delta/a_b.json --input old.json --output new.json
+  python3 kpi_delta.py --compose public/kpi_delta/a_b.json public/kpi_delta/b_c.json --output a_c.json
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+
+from kpi_artifacts import HASH_LENGTH, atomic_open, publish_document, remove_legacy_sidecar, sidecar_path
+
+FORMAT = "kpi-delta/1"
+FEED_FILE = "kpi_delta.json"
+DELTA_DIR = "kpi_delta"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Deltas listed in the feed; older ones are removed, and clients that far
+# behind reload the full document
+KEEP_DELTAS = 20
+
+def canonical(data):
+    """Canonical JSON bytes of a document: minified, keys sorted"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+def snapshot_id(content):
+    """Id of a snapshot from its canonical JSON bytes"""
+    return hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+
+# ---------------------------------------------------------------- diff
+
+def _pointer(tokens):
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens)
+
+def _ids(values):
+    """Ids of a list of objects that all have distinct ids, else None"""
+    if not values or not all(isinstance(value, dict) and "id" in value for value in values):
+        return None
+    ids = [value["id"] for value in values]
+    return ids if len(set(ids)) == len(ids) else None
+
+def _diff(old, new, path, ops):
+    if type(old) is not type(new):
+        ops.append({"op": "replace", "path": _pointer(path), "value": new})
+    elif isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path + [key])})
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, path + [key], ops)
+            else:
+                ops.append({"op": "add", "path": _pointer(path + [key]), "value": value})
+    elif isinstance(new, list):
+        _diff_list(old, new, path, ops)
+    elif old != new:
+        ops.append({"op": "replace", "path": _pointer(path), "value": new})
+
+def _diff_list(old, new, path, ops):
+    old_ids, new_ids = _ids(old), _ids(new)
+    if old_ids is not None and new_ids is not None:
+        kept = set(old_ids) & set(new_ids)
+        survivors = [kpi_id for kpi_id in old_ids if kpi_id in kept]
+        if survivors == [kpi_id for kpi_id in new_ids if kpi_id in kept]:
+            # Removals from the back (indices stay valid), then in-place changes at the
+            # surviving positions, then insertions at their final positions, front to back
+            for index in reversed(range(len(old_ids))):
+                if old_ids[index] not in kept:
+                    ops.append({"op": "remove", "path": _pointer(path + [index])})
+            old_by_id = {value["id"]: value for value in old}
+            positions = {kpi_id: index for index, kpi_id in enumerate(new_ids)}
+            for index, kpi_id in enumerate(survivors):
+                _diff(old_by_id[kpi_id], new[positions[kpi_id]], path + [index], ops)
+            for index, kpi_id in enumerate(new_ids):
+                if kpi_id not in kept:
+                    ops.append({"op": "add", "path": _pointer(path + [index]), "value": new[index]})
+            return
+    if len(old) == len(new):
+        for index, (old_value, new_value) in enumerate(zip(old, new)):
+            _diff(old_value, new_value, path + [index], ops)
+    elif old != new:
+        ops.append({"op": "replace", "path": _pointer(path), "value": new})
+
+def diff(old, new):
+    """RFC 6902 operations turning `old` into `new`"""
+    ops = []
+    _diff(old, new, [], ops)
+    return ops
+
+# ---------------------------------------------------------------- apply
+
+def _tokens(pointer):
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"invalid JSON pointer {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+def _index(container, token, pointer, allow_end=False):
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise ValueError(f"invalid array index in {pointer!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise ValueError(f"array index out of range in {pointer!r}")
+    return index
+
+def _parent(doc, pointer):
+    """(container, last token) of a non-root pointer"""
+    tokens = _tokens(pointer)
+    container = doc
+    for token in tokens[:-1]:
+        if isinstance(container, list):
+            container = container[_index(container, token, pointer)]
+        elif isinstance(container, dict) and token in container:
+            container = container[token]
+        else:
+            raise ValueError(f"path not found: {pointer!r}")
+    return container, tokens[-1]
+
+def _get(doc, pointer):
+    if pointer == "":
+        return doc
+    container, token = _parent(doc, pointer)
+    if isinstance(container, list):
+        return container[_index(container, token, pointer)]
+    if isinstance(container, dict) and token in container:
+        return container[token]
+    raise ValueError(f"path not found: {pointer!r}")
+
+def _add(doc, pointer, value):
+    if pointer == "":
+        return value
+    container, token = _parent(doc, pointer)
+    if isinstance(container, list):
+        container.insert(_index(container, token, pointer, allow_end=True), value)
+    elif isinstance(container, dict):
+        container[token] = value
+    else:
+        raise ValueError(f"path not found: {pointer!r}")
+    return doc
+
+def _replace(doc, pointer, value):
+    if pointer == "":
+        return value
+    container, token = _parent(doc, pointer)
+    if isinstance(container, list):
+        container[_index(container, token, pointer)] = value
+    elif isinstance(container, dict) and token in container:
+        container[token] = value
+    else:
+        raise ValueError(f"path not found: {pointer!r}")
+    return doc
+
+def _remove(doc, pointer):
+    """Remove the value at `pointer`; returns it"""
+    if pointer == "":
+        raise ValueError("cannot remove the whole document")
+    container, token = _parent(doc, pointer)
+    if isinstance(container, list):
+        return container.pop(_index(container, token, pointer))
+    if isinstance(container, dict) and token in container:
+        return container.pop(token)
+    raise ValueError(f"path not found: {pointer!r}")
+
+def apply_patch(doc, ops, in_place=False):
+    """Apply RFC 6902 operations to `doc`; returns the patched document
+
+    Without `in_place` the input is left untouched. Raises ValueError when an
+    operation does not apply (missing path, failed test); the document is
+    then in an undefined state if `in_place` was set.
+    """
+    if not in_place:
+        doc = json.loads(json.dumps(doc))
+    for op in ops:
+        kind, path = op["op"], op["path"]
+        if kind == "add":
+            doc = _add(doc, path, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            _remove(doc, path)
+        elif kind == "replace":
+            doc = _replace(doc, path, copy.deepcopy(op["value"]))
+        elif kind == "move":
+            if path.startswith(op["from"] + "/"):
+                raise ValueError(f"cannot move {op['from']!r} into itself")
+            doc = _add(doc, path, _remove(doc, op["from"]))
+        elif kind == "copy":
+            doc = _add(doc, path, copy.deepcopy(_get(doc, op["from"])))
+        elif kind == "test":
+            if _get(doc, path) != op["value"]:
+                raise ValueError(f"test failed at {path!r}")
+        else:
+            raise ValueError(f"unknown operation {kind!r}")
+    return doc
+
+# ---------------------------------------------------------------- compose
+
+def _under(path, parent):
+    return path == parent or path.startswith(parent + "/")
+
+def compose(*patches):
+    """One patch with the effect of applying `patches` in order
+
+    Operations are concatenated, then a replace is dropped when a later
+    replace or remove covers its path with only replaces in between (those
+    never move array elements, so paths stay valid).
+    """
+    ops = [op for patch in patches for op in patch]
+    kept = []
+    covered = []
+    for op in reversed(ops):
+        if op["op"] == "replace":
+            if any(_under(op["path"], path) for path in covered):
+                continue
+            covered.append(op["path"])
+        else:
+            covered = [op["path"]] if op["op"] == "remove" else []
+        kept.append(op)
+    kept.reverse()
+    return kept
+
+def compose_deltas(deltas):
+    """Merge a chain of delta documents (each starting where the previous ends) into one"""
+    for previous, following in zip(deltas, deltas[1:]):
+        if previous["to"]["id"] != following["from"]["id"]:
+            raise ValueError(f"delta to {previous['to']['id']} is followed by one from {following['from']['id']}")
+    return {
+        "format": FORMAT,
+        "from": deltas[0]["from"],
+        "to": deltas[-1]["to"],
+        "ops": compose(*(delta["ops"] for delta in deltas))
+    }
+
+# ---------------------------------------------------------------- build
+
+def load_feed(out_dir="public"):
+    try:
+        with open(os.path.join(out_dir, FEED_FILE), 'r', encoding='utf-8') as f:
+            feed = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return feed if feed.get("format") == FORMAT else None
+
+def write_delta(data, out_dir="public", source="kpi_map.json", keep=KEEP_DELTAS):
+    """Diff `data` against the previous snapshot of <out_dir>/<source> and update the delta feed
+
+    The first build only records its snapshot. Every delta is checked by
+    applying it to the previous snapshot before it is published. Returns the
+    new feed entry, or None when there is no delta to publish.
+    """
+    snapshot_path = sidecar_path(os.path.join(out_dir, source), SNAPSHOT_SUFFIX)
+    content = canonical(data)
+    latest = {"id": snapshot_id(content), "version": data.get("version")}
+
+    # A snapshot left in out_dir by an older build still continues the chain
+    previous_content = None
+    for path in (snapshot_path, os.path.join(out_dir, source + SNAPSHOT_SUFFIX)):
+        try:
+            with open(path, 'rb') as f:
+                previous_content = f.read()
+            break
+        except FileNotFoundError:
+            continue
+
+    feed = load_feed(out_dir) or {"format": FORMAT, "source": source, "latest": None, "deltas": []}
+    entry = None
+    ops = None
+    if previous_content is not None and snapshot_id(previous_content) != latest["id"]:
+        previous = json.loads(previous_content)
+        base = {"id": snapshot_id(previous_content), "version": previous.get("version")}
+        ops = diff(previous, data)
+        if apply_patch(previous, ops, in_place=True) != data:
+            print(f"⚠️ Delta for {source} does not reproduce the new document; clients will reload it in full")
+            ops = None
+    if ops is not None:
+        name = f"{base['id']}_{latest['id']}.json"
+        os.makedirs(os.path.join(out_dir, DELTA_DIR), exist_ok=True)
+        size = publish_document({"format": FORMAT, "from": base, "to": latest, "ops": ops},
+                                [os.path.join(out_dir, DELTA_DIR, name)], indent=None, ensure_ascii=False)
+        entry = {"from": base["id"], "to": latest["id"], "path": f"{DELTA_DIR}/{name}",
+                 "ops": len(ops), "bytes": size}
+        feed["deltas"] = [entry] + [d for d in feed["deltas"] if d["path"] != entry["path"]][:keep - 1]
+
+    if feed["latest"] != latest or entry is not None:
+        feed["latest"] = latest
+        feed["source_bytes"] = len(content)
+        publish_document(feed, [os.path.join(out_dir, FEED_FILE)], indent=None, ensure_ascii=False)
+
+    # Deltas that fell out of the feed are no longer reachable
+    delta_dir = os.path.join(out_dir, DELTA_DIR)
+    if os.path.isdir(delta_dir):
+        listed = {os.path.basename(d["path"]) for d in feed["deltas"]}
+        for name in os.listdir(delta_dir):
+            if name.endswith(".json") and name not in listed:
+                os.remove(os.path.join(delta_dir, name))
+
+    if previous_content != content or not os.path.exists(snapshot_path):
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        with atomic_open(snapshot_path, 'wb') as f:
+            f.write(content)
+    remove_legacy_sidecar(os.path.join(out_dir, source), SNAPSHOT_SUFFIX)
+    return entry
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish, apply or compose JSON-Patch deltas between KPI snapshots")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document")
+    parser.add_argument("--apply", metavar="DELTA", help="apply a delta file to --input")
+    parser.add_argument("--compose", nargs="+", metavar="DELTA", help="merge a chain of delta files into one")
+    parser.add_argument("--output", help="output file for --apply / --compose")
+    args = parser.parse_args()
+
+    if args.apply or args.compose:
+        if not args.output:
+            parser.error("--apply and --compose need --output")
+        if args.apply:
+            with open(args.apply, 'r', encoding='utf-8') as f:
+                delta = json.load(f)
+            with open(args.input, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if snapshot_id(canonical(data)) != delta["from"]["id"]:
+                print(f"❌ {args.input} is not snapshot {delta['from']['id']}")
+                sys.exit(1)
+            data = apply_patch(data, delta["ops"], in_place=True)
+            if snapshot_id(canonical(data)) != delta["to"]["id"]:
+                print(f"❌ Applying the delta does not reproduce snapshot {delta['to']['id']}")
+                sys.exit(1)
+            publish_document(data, [args.output])
+            print(f"✅ Applied {len(delta['ops'])} operations: {delta['from']['id']} → {delta['to']['id']}")
+        else:
+            deltas = []
+            for path in args.compose:
+                with open(path, 'r', encoding='utf-8') as f:
+                    deltas.append(json.load(f))
+            composed = compose_deltas(deltas)
+            publish_document(composed, [args.output], indent=None, ensure_ascii=False)
+            print(f"✅ Composed {len(deltas)} deltas ({sum(len(d['ops']) for d in deltas)} → "
+                  f"{len(composed['ops'])} operations): {composed['from']['id']} → {composed['to']['id']}")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    out_dir = os.path.dirname(args.input) or "."
+    entry = write_delta(data, out_dir, os.path.basename(args.input))
+    feed = load_feed(out_dir)
+    if entry is None:
+        print(f"✅ Snapshot {feed['latest']['id']} is current; no delta to publish")
+    else:
+        print(f"✅ Delta {entry['from']} → {entry['to']}: {entry['ops']} operations, "
+              f"{entry['bytes']:,} bytes (full document {feed['source_bytes']:,} bytes)")
+
+if __name__ == "__main__":
+    main()
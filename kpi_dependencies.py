@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+KPI Dependency Graph
+Declared cause → effect edges between catalog KPIs (DEPENDENCY_EDGES), turned
+into an id-based DAG: nodes numbered in topological order, upstream and
+downstream adjacency in CSR arrays, and a transitive closure kept as one
+integer bitset per KPI (built once, on first use, in a single pass over the
+topological order). "Everything downstream of Clean Claim Rate" is then one
+bitset lookup instead of a recursive walk.
+
+The generator fills each node's `dependencies` (upstream / downstream /
+peer_metrics KPI names) from this graph.
+
+  python3 kpi_dependencies.py --impact "Clean Claim Rate"
+  python3 kpi_dependencies.py --upstream kpi_4_6_1 --benchmark
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import time
+from array import array
+
+# (upstream KPI, downstream KPI): a change in the first moves the second
+DEPENDENCY_EDGES = [
+    # Lead intake and access
+    ("kpi_1_1_6", "kpi_1_1_5"), ("kpi_1_1_8", "kpi_1_1_7"),
+    ("kpi_1_1_1", "kpi_1_2_3"), ("kpi_1_1_7", "kpi_1_2_3"),
+    ("kpi_1_2_3", "kpi_1_2_2"), ("kpi_1_2_2", "kpi_1_2_1"), ("kpi_1_2_4", "kpi_1_2_1"),
+    ("kpi_1_2_1", "kpi_1_2_9"), ("kpi_1_2_9", "kpi_1_2_8"), ("kpi_1_2_10", "kpi_1_2_8"),
+    ("kpi_1_2_6", "kpi_1_2_5"), ("kpi_1_2_7", "kpi_1_2_5"),
+    ("kpi_1_2_5", "kpi_1_5_2"), ("kpi_1_2_5", "kpi_1_5_4"),
+    ("kpi_1_5_2", "kpi_1_5_1"), ("kpi_1_5_3", "kpi_1_5_1"), ("kpi_1_5_4", "kpi_1_5_1"),
+
+    # Packets, verification and financial clearance
+    ("kpi_1_3_2", "kpi_1_3_1"), ("kpi_1_3_3", "kpi_1_3_1"), ("kpi_1_3_4", "kpi_1_3_1"),
+    ("kpi_1_3_5", "kpi_1_3_1"), ("kpi_1_3_6", "kpi_1_3_1"), ("kpi_1_3_7", "kpi_1_3_1"),
+    ("kpi_1_3_8", "kpi_1_3_1"),
+    ("kpi_1_3_10", "kpi_1_3_9"), ("kpi_1_3_11", "kpi_1_3_9"), ("kpi_1_3_12", "kpi_1_3_9"),
+    ("kpi_1_3_9", "kpi_1_3_14"), ("kpi_1_3_15", "kpi_1_3_14"),
+    ("kpi_1_3_13", "kpi_1_2_4"), ("kpi_1_3_14", "kpi_1_2_4"),
+    ("kpi_1_4_2", "kpi_1_4_1"), ("kpi_1_4_3", "kpi_1_4_1"), ("kpi_1_4_4", "kpi_1_4_1"),
+    ("kpi_1_3_6", "kpi_1_4_1"),
+
+    # Documentation and coding alignment
+    ("kpi_2_1_1", "kpi_2_1_4"), ("kpi_2_1_2", "kpi_2_1_4"), ("kpi_2_2_6", "kpi_2_1_1"),
+    ("kpi_2_1_6", "kpi_2_1_5"), ("kpi_2_1_7", "kpi_2_1_5"), ("kpi_2_1_8", "kpi_2_1_5"),
+    ("kpi_2_1_9", "kpi_2_1_5"),
+    ("kpi_2_1_5", "kpi_2_1_10"), ("kpi_2_1_11", "kpi_2_1_10"), ("kpi_2_1_12", "kpi_2_1_10"),
+    ("kpi_2_1_13", "kpi_2_1_10"),
+    ("kpi_2_4_7", "kpi_2_1_12"), ("kpi_2_4_8", "kpi_2_1_12"),
+    ("kpi_2_2_6", "kpi_2_2_5"), ("kpi_2_2_7", "kpi_2_2_5"),
+
+    # Throughput, productivity, orders and safety
+    ("kpi_1_2_6", "kpi_2_2_1"), ("kpi_2_2_3", "kpi_2_4_3"), ("kpi_2_2_4", "kpi_2_4_3"),
+    ("kpi_2_4_2", "kpi_2_4_1"), ("kpi_2_4_3", "kpi_2_4_1"), ("kpi_2_4_4", "kpi_2_4_1"),
+    ("kpi_1_2_3", "kpi_2_4_4"),
+    ("kpi_2_3_2", "kpi_2_3_1"), ("kpi_2_3_3", "kpi_2_3_1"), ("kpi_2_3_4", "kpi_2_3_1"),
+    ("kpi_2_3_5", "kpi_2_3_6"),
+    ("kpi_2_3_8", "kpi_2_3_7"), ("kpi_2_3_9", "kpi_2_3_7"), ("kpi_2_3_10", "kpi_2_3_7"),
+    ("kpi_2_5_2", "kpi_2_5_1"), ("kpi_2_5_3", "kpi_2_5_1"), ("kpi_2_5_4", "kpi_3_4_5"),
+    ("kpi_2_5_5", "kpi_3_4_1"),
+
+    # Surgical candidacy, authorization and OR scheduling
+    ("kpi_2_3_1", "kpi_3_1_2"), ("kpi_2_3_1", "kpi_3_1_3"),
+    ("kpi_3_1_2", "kpi_3_1_1"), ("kpi_3_1_3", "kpi_3_1_1"), ("kpi_3_1_4", "kpi_3_1_1"),
+    ("kpi_3_1_5", "kpi_3_1_1"),
+    ("kpi_3_1_4", "kpi_3_2_9"), ("kpi_2_1_13", "kpi_3_2_8"), ("kpi_2_1_11", "kpi_3_2_10"),
+    ("kpi_3_2_9", "kpi_3_2_8"), ("kpi_3_2_10", "kpi_3_2_8"),
+    ("kpi_1_4_1", "kpi_3_2_4"), ("kpi_3_1_1", "kpi_3_2_6"),
+    ("kpi_3_2_2", "kpi_3_2_1"), ("kpi_3_2_3", "kpi_3_2_1"), ("kpi_3_2_4", "kpi_3_2_1"),
+    ("kpi_3_2_5", "kpi_3_2_1"), ("kpi_3_2_6", "kpi_3_2_1"), ("kpi_3_2_8", "kpi_3_2_1"),
+    ("kpi_3_2_1", "kpi_3_3_4"), ("kpi_3_2_7", "kpi_3_3_4"), ("kpi_3_2_7", "kpi_3_3_1"),
+    ("kpi_3_3_2", "kpi_3_3_1"), ("kpi_3_3_5", "kpi_3_3_1"),
+    ("kpi_3_3_4", "kpi_3_3_3"), ("kpi_3_3_3", "kpi_3_3_12"), ("kpi_3_3_3", "kpi_3_3_6"),
+    ("kpi_3_2_1", "kpi_3_3_11"), ("kpi_3_3_11", "kpi_3_3_10"), ("kpi_3_3_12", "kpi_3_3_10"),
+    ("kpi_3_3_8", "kpi_3_3_7"), ("kpi_3_3_9", "kpi_3_3_7"), ("kpi_3_3_10", "kpi_3_3_7"),
+
+    # Post-op, complications and surgical billing
+    ("kpi_3_4_2", "kpi_3_4_1"), ("kpi_3_4_3", "kpi_3_4_1"),
+    ("kpi_3_4_5", "kpi_3_4_4"), ("kpi_3_4_6", "kpi_3_4_4"), ("kpi_3_4_4", "kpi_2_5_1"),
+    ("kpi_3_5_2", "kpi_3_5_1"), ("kpi_3_5_4", "kpi_3_5_3"), ("kpi_3_5_5", "kpi_3_5_3"),
+
+    # Clinical to coding
+    ("kpi_2_1_1", "kpi_4_1_2"), ("kpi_2_1_10", "kpi_4_1_1"), ("kpi_4_1_2", "kpi_4_1_1"),
+    ("kpi_4_1_3", "kpi_4_1_1"), ("kpi_4_1_4", "kpi_4_1_1"), ("kpi_4_1_5", "kpi_4_1_1"),
+    ("kpi_2_1_13", "kpi_4_1_5"), ("kpi_2_3_4", "kpi_4_1_4"),
+    ("kpi_2_2_7", "kpi_4_1_7"), ("kpi_4_1_7", "kpi_4_1_6"),
+
+    # Claim edits, clean claims and submission
+    ("kpi_1_3_2", "kpi_4_2_2"), ("kpi_1_3_3", "kpi_4_2_3"), ("kpi_1_3_9", "kpi_4_2_3"),
+    ("kpi_1_3_12", "kpi_4_2_4"), ("kpi_1_3_15", "kpi_4_2_5"),
+    ("kpi_4_1_1", "kpi_4_2_6"), ("kpi_2_1_12", "kpi_4_2_6"), ("kpi_3_5_3", "kpi_4_2_6"),
+    ("kpi_3_5_4", "kpi_4_2_7"),
+    ("kpi_4_2_1", "kpi_4_2_8"), ("kpi_4_2_2", "kpi_4_2_8"), ("kpi_4_2_3", "kpi_4_2_8"),
+    ("kpi_4_2_4", "kpi_4_2_8"), ("kpi_4_2_5", "kpi_4_2_8"), ("kpi_4_2_6", "kpi_4_2_8"),
+    ("kpi_4_2_7", "kpi_4_2_8"),
+    ("kpi_4_2_8", "kpi_4_2_9"),
+    ("kpi_4_1_6", "kpi_4_2_10"), ("kpi_3_5_1", "kpi_4_2_10"),
+    ("kpi_4_2_11", "kpi_4_2_10"), ("kpi_4_2_12", "kpi_4_2_10"), ("kpi_4_2_13", "kpi_4_2_10"),
+
+    # First pass, denials and appeals
+    ("kpi_4_2_9", "kpi_4_3_1"), ("kpi_4_3_2", "kpi_4_3_1"), ("kpi_4_3_3", "kpi_4_3_1"),
+    ("kpi_4_3_4", "kpi_4_3_1"),
+    ("kpi_4_2_8", "kpi_4_3_6"), ("kpi_5_4_1", "kpi_4_3_6"), ("kpi_4_1_5", "kpi_4_3_7"),
+    ("kpi_4_2_5", "kpi_4_3_8"), ("kpi_3_2_1", "kpi_4_3_8"), ("kpi_4_2_10", "kpi_4_3_9"),
+    ("kpi_1_3_9", "kpi_4_3_10"), ("kpi_1_3_10", "kpi_4_3_10"),
+    ("kpi_4_3_6", "kpi_4_3_5"), ("kpi_4_3_7", "kpi_4_3_5"), ("kpi_4_3_8", "kpi_4_3_5"),
+    ("kpi_4_3_9", "kpi_4_3_5"), ("kpi_4_3_10", "kpi_4_3_5"),
+    ("kpi_4_3_5", "kpi_4_3_1"),
+    ("kpi_4_4_3", "kpi_4_4_1"), ("kpi_4_4_4", "kpi_4_4_1"), ("kpi_4_4_1", "kpi_4_4_2"),
+    ("kpi_4_4_1", "kpi_4_3_11"), ("kpi_4_3_12", "kpi_4_3_11"),
+    ("kpi_4_4_5", "kpi_4_4_6"),
+
+    # AR, posting and collections
+    ("kpi_4_5_2", "kpi_4_5_1"), ("kpi_4_5_3", "kpi_4_5_1"), ("kpi_4_5_4", "kpi_4_5_1"),
+    ("kpi_4_5_6", "kpi_4_5_5"), ("kpi_4_5_5", "kpi_4_5_1"),
+    ("kpi_4_3_1", "kpi_4_5_1"), ("kpi_4_3_5", "kpi_4_5_5"), ("kpi_4_5_10", "kpi_4_5_1"),
+    ("kpi_4_5_1", "kpi_4_6_4"),
+    ("kpi_4_5_8", "kpi_4_5_7"), ("kpi_4_5_9", "kpi_4_5_7"),
+    ("kpi_4_6_5", "kpi_4_6_3"), ("kpi_4_6_6", "kpi_4_6_3"), ("kpi_4_6_7", "kpi_4_6_3"),
+    ("kpi_4_6_3", "kpi_4_6_1"), ("kpi_4_5_7", "kpi_4_6_1"), ("kpi_4_4_6", "kpi_4_6_1"),
+    ("kpi_4_3_11", "kpi_4_6_1"),
+    ("kpi_4_3_9", "kpi_4_6_9"), ("kpi_4_6_8", "kpi_4_6_9"), ("kpi_4_6_9", "kpi_4_6_11"),
+    ("kpi_4_3_5", "kpi_4_6_11"), ("kpi_4_6_11", "kpi_4_6_10"), ("kpi_4_6_12", "kpi_4_6_10"),
+    ("kpi_4_6_10", "kpi_4_6_1"),
+
+    # Compliance, quality, credentialing and audits
+    ("kpi_5_6_4", "kpi_5_1_1"), ("kpi_5_1_1", "kpi_5_1_2"), ("kpi_5_1_2", "kpi_5_1_3"),
+    ("kpi_5_6_2", "kpi_5_6_1"), ("kpi_5_6_1", "kpi_5_6_3"), ("kpi_5_6_5", "kpi_5_6_3"),
+    ("kpi_2_1_5", "kpi_5_1_4"), ("kpi_2_3_7", "kpi_5_1_5"),
+    ("kpi_5_2_1", "kpi_5_2_2"), ("kpi_5_2_3", "kpi_2_5_1"), ("kpi_5_2_4", "kpi_5_2_5"),
+    ("kpi_5_3_2", "kpi_5_3_1"), ("kpi_5_3_3", "kpi_5_3_1"), ("kpi_2_5_1", "kpi_5_3_1"),
+    ("kpi_3_4_4", "kpi_5_3_1"),
+    ("kpi_4_1_1", "kpi_5_3_4"), ("kpi_5_3_4", "kpi_5_3_5"), ("kpi_4_2_1", "kpi_5_3_5"),
+    ("kpi_5_4_2", "kpi_5_4_1"), ("kpi_5_4_3", "kpi_5_4_1"), ("kpi_5_4_5", "kpi_5_4_4"),
+    ("kpi_5_5_1", "kpi_5_5_2"), ("kpi_5_5_2", "kpi_5_5_4"), ("kpi_5_5_3", "kpi_5_5_4"),
+    ("kpi_5_3_5", "kpi_5_5_5"), ("kpi_5_5_5", "kpi_5_2_5"),
+]
+
+# KPIs listed in a node's peer_metrics, at most
+PEER_LIMIT = 4
+
+class DependencyGraph:
+    """DAG over KPI ids: CSR adjacency in topological order plus a cached transitive closure"""
+
+    def __init__(self, ids, edges=DEPENDENCY_EDGES, names=None):
+        """Graph over `ids` (any order); edges naming an unknown id are kept in `skipped`
+
+        Raises ValueError when the edges contain a cycle.
+        """
+        position = {kpi_id: i for i, kpi_id in enumerate(ids)}
+        pairs, self.skipped = set(), []
+        for upstream, downstream in edges:
+            if upstream in position and downstream in position:
+                pairs.add((position[upstream], position[downstream]))
+            else:
+                self.skipped.append((upstream, downstream))
+
+        # Kahn's algorithm; among ready KPIs the earliest in `ids` goes first, so the order is stable
+        children = [[] for _ in ids]
+        indegree = [0] * len(ids)
+        for upstream, downstream in pairs:
+            children[upstream].append(downstream)
+            indegree[downstream] += 1
+        ready = [i for i, degree in enumerate(indegree) if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(i)
+            for child in children[i]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(ready, child)
+        if len(order) < len(ids):
+            cyclic = sorted(ids[i] for i, degree in enumerate(indegree) if degree)
+            raise ValueError(f"dependency cycle through {', '.join(cyclic)}")
+
+        # Nodes are numbered by topological rank: bit i of a closure bitset is the i-th KPI in order
+        rank = [0] * len(ids)
+        for r, i in enumerate(order):
+            rank[i] = r
+        self.ids = [ids[i] for i in order]
+        self.rank = {kpi_id: r for r, kpi_id in enumerate(self.ids)}
+        self.names = names or {}
+        ranked = sorted((rank[upstream], rank[downstream]) for upstream, downstream in pairs)
+        self.down_offsets, self.down_targets = self._csr(ranked)
+        self.up_offsets, self.up_targets = self._csr(sorted((b, a) for a, b in ranked))
+        self._descendants = None
+        self._ancestors = None
+
+    def _csr(self, pairs):
+        """Offsets and targets arrays for sorted (source, target) rank pairs"""
+        offsets = array("i", [0] * (len(self.ids) + 1))
+        for source, _ in pairs:
+            offsets[source + 1] += 1
+        for i in range(len(self.ids)):
+            offsets[i + 1] += offsets[i]
+        return offsets, array("i", (target for _, target in pairs))
+
+    @classmethod
+    def from_catalog(cls, catalog, edges=DEPENDENCY_EDGES):
+        """Graph over a generator catalog (rows of pillar_id, pillar, macro, category, kpi_id, name, ...)"""
+        return cls([row[4] for row in catalog], edges, {row[4]: row[5] for row in catalog})
+
+    @classmethod
+    def from_document(cls, data, edges=DEPENDENCY_EDGES):
+        """Graph over the nodes of a KPI document"""
+        return cls([node["id"] for node in data["nodes"]], edges, {node["id"]: node.get("name") for node in data["nodes"]})
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, kpi_id):
+        return kpi_id in self.rank
+
+    @property
+    def edge_count(self):
+        return len(self.down_targets)
+
+    def digest(self):
+        """Hash of the graph's ids and edges"""
+        content = json.dumps([self.ids, list(self.down_offsets), list(self.down_targets)])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    def _children(self, r):
+        return self.down_targets[self.down_offsets[r]:self.down_offsets[r + 1]]
+
+    def _parents(self, r):
+        return self.up_targets[self.up_offsets[r]:self.up_offsets[r + 1]]
+
+    def _closure(self):
+        """Descendant and ancestor bitsets of every KPI, one pass each way over the topological order"""
+        if self._descendants is None:
+            descendants = [0] * len(self.ids)
+            for r in range(len(self.ids) - 1, -1, -1):
+                bits = 0
+                for child in self._children(r):
+                    bits |= (1 << child) | descendants[child]
+                descendants[r] = bits
+            ancestors = [0] * len(self.ids)
+            for r in range(len(self.ids)):
+                bits = 0
+                for parent in self._parents(r):
+                    bits |= (1 << parent) | ancestors[parent]
+                ancestors[r] = bits
+            self._descendants, self._ancestors = descendants, ancestors
+        return self._descendants, self._ancestors
+
+    def _members(self, bits):
+        """KPI ids of a bitset, in topological order"""
+        members = []
+        while bits:
+            low = bits & -bits
+            members.append(self.ids[low.bit_length() - 1])
+            bits ^= low
+        return members
+
+    def downstream(self, kpi_id, transitive=False):
+        """KPIs this one moves: direct effects, or every KPI reachable from it"""
+        r = self.rank[kpi_id]
+        if transitive:
+            return self._members(self._closure()[0][r])
+        return [self.ids[child] for child in self._children(r)]
+
+    def upstream(self, kpi_id, transitive=False):
+        """KPIs that move this one: direct causes, or every KPI it is reachable from"""
+        r = self.rank[kpi_id]
+        if transitive:
+            return self._members(self._closure()[1][r])
+        return [self.ids[parent] for parent in self._parents(r)]
+
+    def impact(self, kpi_ids):
+        """Every KPI downstream of any of `kpi_ids` (excluding them), in topological order"""
+        descendants = self._closure()[0]
+        bits = sources = 0
+        for kpi_id in kpi_ids:
+            r = self.rank[kpi_id]
+            bits |= descendants[r]
+            sources |= 1 << r
+        return self._members(bits & ~sources)
+
+    def depends_on(self, kpi_id, other_id):
+        """Whether `other_id` is upstream of `kpi_id`, directly or transitively"""
+        return bool(self._closure()[1][self.rank[kpi_id]] >> self.rank[other_id] & 1)
+
+    def peers(self, kpi_id, limit=PEER_LIMIT):
+        """KPIs sharing a direct cause or a direct effect with this one"""
+        r = self.rank[kpi_id]
+        bits = 0
+        for parent in self._parents(r):
+            for sibling in self._children(parent):
+                bits |= 1 << sibling
+        for child in self._children(r):
+            for sibling in self._parents(child):
+                bits |= 1 << sibling
+        return self._members(bits & ~(1 << r))[:limit]
+
+    def dependency_fields(self, kpi_id, suffix=""):
+        """A node's `dependencies` layer: upstream, downstream and peer KPI names (each + `suffix`)"""
+        if kpi_id not in self.rank:
+            return {"upstream": [], "downstream": [], "peer_metrics": []}
+        name = lambda other: f"{self.names.get(other, other)}{suffix}"
+        return {
+            "upstream": [name(other) for other in self.upstream(kpi_id)],
+            "downstream": [name(other) for other in self.downstream(kpi_id)],
+            "peer_metrics": [name(other) for other in self.peers(kpi_id)]
+        }
+
+    def node_dependencies(self, kpi_id):
+        """The `dependencies` layer of the node with this id
+
+        Synthetic site copies (kpi_..._siteN) point at the copies on their own site.
+        """
+        base_id, _, site = kpi_id.partition("_site")
+        return self.dependency_fields(base_id, f" (Site {site})" if site else "")
+
+def resolve_kpi(graph, key):
+    """A KPI id, given the id itself or a KPI name (case-insensitive)"""
+    if key in graph:
+        return key
+    for kpi_id, name in graph.names.items():
+        if name and name.lower() == key.lower():
+            return kpi_id
+    raise SystemExit(f"❌ No KPI {key!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the declared KPI dependency graph")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document supplying ids, names and RAG status")
+    parser.add_argument("--impact", nargs="+", metavar="KPI", help="every KPI downstream of these (ids or names)")
+    parser.add_argument("--upstream", metavar="KPI", help="every KPI upstream of this one")
+    parser.add_argument("--order", action="store_true", help="print the topological order")
+    parser.add_argument("--benchmark", action="store_true", help="time the closure build and per-KPI impact queries")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    rag = {node["id"]: node.get("rag") for node in data["nodes"]}
+    graph = DependencyGraph.from_document(data)
+    print(f"🕸️ {len(graph)} KPIs, {graph.edge_count} declared dependencies"
+          + (f" ({len(graph.skipped)} edges name KPIs not in {args.input})" if graph.skipped else ""))
+
+    def show(kpi_ids):
+        for kpi_id in kpi_ids:
+            print(f"  {kpi_id:<12}{rag.get(kpi_id) or '-':<7}{graph.names.get(kpi_id)}")
+
+    if args.order:
+        show(graph.ids)
+    if args.impact:
+        sources = [resolve_kpi(graph, key) for key in args.impact]
+        affected = graph.impact(sources)
+        print(f"\n⬇️ {len(affected)} KPIs downstream of {', '.join(graph.names[kpi_id] for kpi_id in sources)}:")
+        show(affected)
+    if args.upstream:
+        kpi_id = resolve_kpi(graph, args.upstream)
+        causes = graph.upstream(kpi_id, transitive=True)
+        print(f"\n⬆️ {len(causes)} KPIs upstream of {graph.names[kpi_id]}:")
+        show(causes)
+    if args.benchmark:
+        # A fresh graph: the queries above have already cached this one's closure
+        fresh = DependencyGraph.from_document(data)
+        start = time.perf_counter()
+        fresh._closure()
+        closure = time.perf_counter() - start
+        start = time.perf_counter()
+        total = sum(len(fresh.downstream(kpi_id, transitive=True)) for kpi_id in fresh.ids)
+        queries = time.perf_counter() - start
+        print(f"\n⏱️ Closure built in {closure * 1000:.2f} ms; {len(fresh)} transitive impact queries "
+              f"({total} results) in {queries * 1000:.2f} ms ({queries / len(fresh) * 1e6:.1f} µs each)")
+
+if __name__ == "__main__":
+    main()
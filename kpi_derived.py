@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+KPI Derived Artifacts
+Every file the dashboards read besides the KPI document itself, written in
+one place so each tree writer publishes the same set: the id index, the
+dictionary-encoded copy, the search and ownership indexes, the delta feed,
+the skeleton + detail shards and, last, the content-hashed copies listing
+all of them in build-manifest.json.
+
+  python3 kpi_derived.py                                 # rewrite them for public/kpi_map.json
+  python3 kpi_derived.py --shard-by kpi --no-hashed
+"""
+
+import argparse
+import json
+import os
+
+from kpi_artifacts import publish_hashed
+from kpi_delta import write_delta
+from kpi_index import write_index
+from kpi_normalized import write_normalized
+from kpi_ownership import write_ownership
+from kpi_profiling import stage
+from kpi_search import write_search
+from kpi_shards import write_skeleton_and_shards
+
+def write_derived_artifacts(data, public_dir="public", source="kpi_map.json", index_data=None,
+                            shard_by="pillar", hashed=True):
+    """Write the artifacts derived from `data`, just published as <public_dir>/<source>
+
+    `index_data` is the document the id index is built from when it differs
+    from `data` (an incrementally updated tree). `shard_by` "none" skips the
+    shards and `hashed` False the hashed copies. Returns {"shards": manifest,
+    "hashed": build manifest}, None for the skipped ones.
+    """
+    # id → offset / ancestor path index for O(1) lookups
+    with stage("index"):
+        write_index(data if index_data is None else index_data, public_dir)
+
+    # Dictionary-encoded copy: shared blocks stored once, resolved by static/kpi_resolver.js
+    with stage("normalized"):
+        write_normalized(data, public_dir)
+
+    # Inverted index over names, definitions, root causes and actions for search and the assistant
+    with stage("search"):
+        write_search(data, public_dir)
+
+    # Person ↔ KPI ownership joined with people_data.json, with reporting-subtree scorecards
+    with stage("ownership"):
+        write_ownership(data, public_dir)
+
+    # JSON-Patch delta from the previous build, for pages holding an older copy
+    with stage("delta"):
+        write_delta(data, public_dir, source)
+
+    # Compact skeleton for first paint + detail shards for KPI cards
+    manifest = None
+    if shard_by != "none":
+        with stage("shards"):
+            manifest = write_skeleton_and_shards(data, public_dir, shard_by)
+
+    # Content-hashed copies + build manifest for long-lived browser/CDN caching
+    build_manifest = None
+    if hashed:
+        with stage("hashed artifacts"):
+            build_manifest = publish_hashed(public_dir=public_dir)
+
+    return {"shards": manifest, "hashed": build_manifest}
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite the artifacts derived from a KPI document")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document")
+    parser.add_argument("--shard-by", choices=["pillar", "kpi", "none"], default="pillar",
+                        help="detail shard granularity (default pillar)")
+    parser.add_argument("--no-hashed", dest="hashed", action="store_false", help="skip the content-hashed copies")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    written = write_derived_artifacts(data, os.path.dirname(args.input) or ".", os.path.basename(args.input),
+                                      shard_by=args.shard_by, hashed=args.hashed)
+
+    print(f"✅ Derived artifacts of {args.input} written")
+    if written["shards"]:
+        print(f"📦 Skeleton + {len(written['shards']['shards'])} detail shards")
+    if written["hashed"]:
+        print(f"🔖 {len(written['hashed']['artifacts'])} hashed artifacts listed in build-manifest.json")
+
+if __name__ == "__main__":
+    main()
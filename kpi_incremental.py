@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+KPI Incremental Tree Rebuild
+Refreshes the tree of a KPI document by patching only the pillar / macro /
+category subtrees whose KPIs changed since the previous build, instead of
+regrouping every node and re-serializing the whole document.
+
+A sidecar state file (.kpi_state/<dir>/<document>.tree-state, outside the
+deployed directory) describes the document as last
+written: a digest of every node's text, the fields the tree is built from
+(kpi_shards.SKELETON_FIELDS), the KPI and RAG counts of every subtree and a
+digest of the tree itself. On the next run the document is decoded one
+top-level value and one node at a time, keeping each node's span, so changed
+nodes are found by digest. Only the affected subtrees are rebuilt and only
+their counts, and the rollups (kpi_rollup.py) on the paths of changed KPIs,
+are recomputed. The new tree is spliced into the document text
+in place of the old one, so `nodes` is copied through without being
+re-serialized.
+
+With no state, state for another tree shape, or a tree rewritten by another
+tool since, update_tree() returns None; the caller then does a full rebuild
+and records fresh state with save_state().
+
+  python3 fix_pillar_structure.py --incremental
+  python3 fix_tree_structure.py --incremental
+"""
+
+import hashlib
+import json
+import os
+
+from kpi_artifacts import atomic_open, link_alias, remove_legacy_sidecar, sidecar_path
+from kpi_profiling import stage
+from kpi_rollup import rollup_tree
+from kpi_shards import SKELETON_FIELDS
+from kpi_tree_builder import LEVEL_DEFAULTS, LEVELS, KpiGrouping
+
+STATE_SUFFIX = ".tree-state"
+STATE_FORMAT = "kpi-tree-state/1"
+
+# Separator of the subtree paths shown in reports and used as state keys
+PATH_SEPARATOR = " › "
+
+RAG_LEVELS = ["green", "amber", "red"]
+
+_WHITESPACE = json.decoder.WHITESPACE
+
+def add_incremental_argument(parser):
+    """Add --incremental to a tree script's parser"""
+    parser.add_argument("--incremental", action="store_true",
+                        help="patch only the subtrees whose KPIs changed since the previous build")
+
+def state_path(path):
+    return sidecar_path(path, STATE_SUFFIX)
+
+def _digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def _shape_key(shape):
+    """Stable string for the build_tree() arguments (plus version) a tree was built with"""
+    shape = dict(shape)
+    if shape.get("order"):
+        shape["order"] = sorted(shape["order"].items())
+    return json.dumps(shape, sort_keys=True)
+
+def _stub(node):
+    """The fields of a node the tree, skeleton and index are built from"""
+    return {field: node[field] for field in SKELETON_FIELDS if field in node}
+
+def _path_name(path):
+    return PATH_SEPARATOR.join(path)
+
+def _prefixes(path):
+    return [path[:depth] for depth in range(len(path) + 1)]
+
+def _tree_path(stub):
+    return tuple(stub.get(level) or LEVEL_DEFAULTS.get(level, "General") for level in LEVELS)
+
+def _member_ids(grouping, path):
+    return [grouping.nodes[position]["id"] for position in grouping.members.get(path, [])]
+
+def _aggregate(grouping, path):
+    """KPI and RAG counts of the subtree at `path`"""
+    counts = dict.fromkeys(RAG_LEVELS, 0)
+    members = grouping.members.get(path, [])
+    for position in members:
+        rag = grouping.nodes[position].get("rag")
+        if rag in counts:
+            counts[rag] += 1
+    return {"kpis": len(members), **counts}
+
+def scan_document(text):
+    """Decode a KPI document, keeping the span of every top-level field and node
+
+    Returns (data, {field: (start, end)}, [(start, end) of each node]).
+    Values are decoded one at a time with raw_decode(), so this costs about
+    as much as json.loads().
+    """
+    decoder = json.JSONDecoder()
+    data, fields, node_spans = {}, {}, []
+
+    def skip(pos, separator=None):
+        pos = _WHITESPACE.match(text, pos).end()
+        if separator is not None and text[pos] == separator:
+            pos = _WHITESPACE.match(text, pos + 1).end()
+        return pos
+
+    pos = skip(0)
+    if text[pos] != '{':
+        raise ValueError("not a KPI document: expected an object")
+    pos = skip(pos + 1)
+    while text[pos] != '}':
+        key, pos = decoder.raw_decode(text, pos)
+        pos = skip(pos, ':')
+        if key == "nodes" and text[pos] == '[':
+            nodes = []
+            pos = skip(pos + 1)
+            while text[pos] != ']':
+                node, end = decoder.raw_decode(text, pos)
+                nodes.append(node)
+                node_spans.append((pos, end))
+                pos = skip(end, ',')
+            data[key], end = nodes, pos + 1
+        else:
+            data[key], end = decoder.raw_decode(text, pos)
+            fields[key] = (pos, end)
+        pos = skip(end, ',')
+    return data, fields, node_spans
+
+def _read_document(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return (text,) + scan_document(text)
+
+def load_state(path):
+    """The tree state recorded for `path`, or None"""
+    try:
+        with open(state_path(path), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("format") == STATE_FORMAT else None
+
+def _write_state(path, shape, tree_digest, ids, digests, stubs, aggregates):
+    state = {
+        "format": STATE_FORMAT,
+        "shape": _shape_key(shape),
+        "tree": tree_digest,
+        "nodes": {kpi_id: [digest, stub] for kpi_id, digest, stub in zip(ids, digests, stubs)},
+        "aggregates": aggregates
+    }
+    os.makedirs(os.path.dirname(state_path(path)), exist_ok=True)
+    with atomic_open(state_path(path)) as f:
+        json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+    remove_legacy_sidecar(path, STATE_SUFFIX)
+
+def save_state(path, shape):
+    """Record the tree state of a document just published by a full rebuild"""
+    text, data, fields, node_spans = _read_document(path)
+    stubs = [_stub(node) for node in data["nodes"]]
+    grouping = KpiGrouping(stubs)
+    _write_state(path, shape, _digest(text[fields["tree"][0]:fields["tree"][1]]),
+                 [stub["id"] for stub in stubs], [_digest(text[start:end]) for start, end in node_spans],
+                 stubs, {_path_name(tree_path): _aggregate(grouping, tree_path) for tree_path in grouping.members})
+
+class TreeUpdate:
+    """Outcome of an incremental rebuild"""
+
+    def __init__(self, data, stubs, changed, added, removed, rebuilt, aggregates, written):
+        self.data = data                # the document as now published
+        self.stubs = stubs
+        self.changed = changed          # ids of existing KPIs whose node changed
+        self.added = added
+        self.removed = removed
+        self.rebuilt = rebuilt          # outermost rebuilt subtree paths
+        self.aggregates = aggregates    # {path: counts} for every affected subtree
+        self.written = written          # False when the document was already up to date
+
+    @property
+    def tree(self):
+        return self.data["tree"]
+
+    def index_data(self):
+        """The document with compact nodes: all kpi_index.build_index() needs"""
+        return {**self.data, "nodes": self.stubs}
+
+    def print_report(self):
+        if not self.written:
+            print("✅ Tree already up to date: no KPI changed since the previous build")
+            return
+        print(f"🔁 Incremental rebuild: {len(self.changed)} changed, {len(self.added)} added, "
+              f"{len(self.removed)} removed KPIs")
+        if not self.rebuilt:
+            print("  • Tree shape unchanged (only node contents and rollups changed)")
+        for path in self.rebuilt:
+            counts = self.aggregates.get(_path_name(path))
+            summary = (f"{counts['kpis']} KPIs (🟢 {counts['green']} 🟡 {counts['amber']} 🔴 {counts['red']})"
+                       if counts else "removed")
+            print(f"  • Rebuilt {_path_name(path) or 'all pillars'}: {summary}")
+
+def _splice(text, replacements):
+    """`text` with the given (start, end) spans replaced"""
+    parts = []
+    pos = 0
+    for (start, end), content in sorted(replacements.items()):
+        parts.append(text[pos:start])
+        parts.append(content)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+def _field_text(value, indent=2):
+    """A top-level field value laid out as publish_document() writes it"""
+    return json.dumps(value, indent=indent, ensure_ascii=True).replace("\n", "\n" + " " * indent)
+
+def update_tree(path, aliases, shape):
+    """Patch the tree of the document at `path` against its recorded state
+
+    `shape` holds the build_tree() keyword arguments (depth, order, id_style,
+    leaf_fields, keep_empty) plus the document `version`, or None to keep the
+    current one. The result is published under `path` and every alias.
+    Returns a TreeUpdate, or None when a full rebuild is needed.
+    """
+    state = load_state(path)
+    if state is None or state["shape"] != _shape_key(shape):
+        return None
+
+    with stage("catalog load"):
+        try:
+            text, data, fields, node_spans = _read_document(path)
+        except (ValueError, IndexError):
+            return None  # the full rebuild reports what is wrong with the file
+    tree_span = fields.get("tree")
+    if tree_span is None or _digest(text[tree_span[0]:tree_span[1]]) != state["tree"]:
+        return None
+    if shape.get("version") is not None and "version" not in fields:
+        return None
+
+    with stage("diff"):
+        previous = state["nodes"]
+        ids, digests, stubs = [], [], []
+        changed, added = [], []
+        for node, (start, end) in zip(data["nodes"], node_spans):
+            digest = _digest(text[start:end])
+            entry = previous.get(node["id"])
+            if entry is None:
+                added.append(node["id"])
+            elif entry[0] != digest:
+                changed.append(node["id"])
+            ids.append(node["id"])
+            digests.append(digest)
+            stubs.append(entry[1] if entry is not None and entry[0] == digest else _stub(node))
+        current = set(ids)
+        changed_ids = set(changed)
+        removed = [kpi_id for kpi_id in previous if kpi_id not in current]
+
+        # Affected subtrees: every level above a KPI whose tree fields changed (old and new
+        # position) or that was removed, plus any path whose members changed or were reordered
+        tree_fields = ["id", "name"] + LEVELS + list(shape.get("leaf_fields", []))
+        previous_grouping = KpiGrouping([stub for _, stub in previous.values()])
+        grouping = KpiGrouping(stubs)
+        affected = set()
+        for kpi_id, stub in zip(ids, stubs):
+            entry = previous.get(kpi_id)
+            if entry is None:
+                affected.update(_prefixes(_tree_path(stub)))
+            elif any(entry[1].get(field) != stub.get(field) for field in tree_fields):
+                affected.update(_prefixes(_tree_path(entry[1])) + _prefixes(_tree_path(stub)))
+        for kpi_id in removed:
+            affected.update(_prefixes(_tree_path(previous[kpi_id][1])))
+        for tree_path in set(grouping.members) | set(previous_grouping.members):
+            if tree_path not in affected and _member_ids(grouping, tree_path) != _member_ids(previous_grouping, tree_path):
+                affected.update(_prefixes(tree_path))
+
+    rebuilt = []
+    replacements = {}
+    tree = data["tree"]
+    if affected:
+        with stage("tree build"):
+            build_args = {key: value for key, value in shape.items() if key != "version"}
+            children, rebuilt = grouping.patch_tree(tree.get("children", []), affected, **build_args)
+            tree = {**tree, "children": children}
+
+    # Rollups on the path of every changed KPI, even where the tree itself kept its shape
+    stale = set(affected)
+    for kpi_id, stub in zip(ids, stubs):
+        if kpi_id in changed_ids:
+            stale.update(_prefixes(_tree_path(stub)))
+    if stale:
+        with stage("rollup"):
+            tree = rollup_tree(tree, data["nodes"], stale)
+    if tree != data["tree"]:
+        data["tree"] = tree
+        replacements[tree_span] = _field_text(data["tree"])
+    if shape.get("version") is not None and data["version"] != shape["version"]:
+        data["version"] = shape["version"]
+        replacements[fields["version"]] = _field_text(data["version"])
+
+    aggregates = dict(state["aggregates"])
+    for tree_path in affected:
+        if tree_path in grouping.members:
+            aggregates[_path_name(tree_path)] = _aggregate(grouping, tree_path)
+        else:
+            aggregates.pop(_path_name(tree_path), None)
+
+    written = bool(changed or added or removed or replacements)
+    if written:
+        with stage("write"):
+            if replacements:
+                with atomic_open(path) as f:
+                    f.write(_splice(text, replacements))
+            # Refreshed nodes were written to `path` alone; the aliases follow it either way
+            for alias in aliases:
+                link_alias(path, alias)
+        tree_digest = _digest(replacements[tree_span]) if tree_span in replacements else state["tree"]
+        _write_state(path, shape, tree_digest, ids, digests, stubs, aggregates)
+
+    return TreeUpdate(data, stubs, changed, added, removed, rebuilt,
+                      {_path_name(tree_path): aggregates[_path_name(tree_path)]
+                       for tree_path in affected if _path_name(tree_path) in aggregates},
+                      written)
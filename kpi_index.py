@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+KPI Id Index
+Precomputed id → location index for a KPI document, written next to it as
+kpi_index.json. Each entry holds the KPI's offset in `nodes`, the ids and
+names of its ancestors in `tree` (pillar, macro, category) and its tree
+position (child index at every level), so card opens, breadcrumbs and
+verification are O(1) lookups instead of scans or tree walks.
+
+The index records a SHA-256 of what it was built from (node ids in order
+and the tree), so a published index is only reused for that exact document.
+"""
+
+import hashlib
+import json
+import os
+
+from kpi_artifacts import publish_document
+
+INDEX_FILE = "kpi_index.json"
+
+def source_digest(ids, tree):
+    """SHA-256 of the inputs of an index: the node ids in document order and the tree"""
+    content = json.dumps([list(ids), tree], separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def build_index(data):
+    """Build the index for a KPI document (one pass over nodes, one walk of the tree)"""
+    kpis = {node["id"]: {"offset": offset, "path": [], "names": [], "position": []}
+            for offset, node in enumerate(data["nodes"])}
+
+    # Iterative walk: (tree node, ancestor ids, ancestor names, child positions)
+    stack = [(child, [], [], [i]) for i, child in reversed(list(enumerate(data["tree"].get("children", []))))]
+    while stack:
+        node, path, names, position = stack.pop()
+        entry = kpis.get(node.get("id"))
+        if entry is not None and not node.get("children"):
+            entry["path"], entry["names"], entry["position"] = path, names, position
+            continue
+        child_path, child_names = path + [node["id"]], names + [node["name"]]
+        for i in reversed(range(len(node.get("children", [])))):
+            stack.append((node["children"][i], child_path, child_names, position + [i]))
+
+    return {
+        "version": data.get("version"),
+        "total_nodes": len(data["nodes"]),
+        "source": source_digest((node["id"] for node in data["nodes"]), data["tree"]),
+        "kpis": kpis
+    }
+
+def write_index(data, out_dir="public"):
+    """Build the index for `data` and publish it as <out_dir>/kpi_index.json"""
+    index = build_index(data)
+    publish_document(index, [os.path.join(out_dir, INDEX_FILE)], indent=None, ensure_ascii=False)
+    return index
+
+class KpiIndex:
+    """O(1) KPI lookups backed by a kpi_index.json-shaped dict"""
+
+    def __init__(self, index):
+        self.index = index
+        self.kpis = index["kpis"]
+
+    @classmethod
+    def load(cls, path=os.path.join("public", INDEX_FILE)):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def published(cls, source, path=os.path.join("public", INDEX_FILE)):
+        """The published index if it was built from the document with this source_digest(), else None"""
+        if os.path.exists(path):
+            index = cls.load(path)
+            if index.index.get("source") == source:
+                return index
+        return None
+
+    @classmethod
+    def for_document(cls, data, path=os.path.join("public", INDEX_FILE)):
+        """Use the published index when it matches `data`, otherwise build one in memory"""
+        source = source_digest((node["id"] for node in data["nodes"]), data["tree"])
+        return cls.published(source, path) or cls(build_index(data))
+
+    def __contains__(self, kpi_id):
+        return kpi_id in self.kpis
+
+    def __len__(self):
+        return len(self.kpis)
+
+    def lookup(self, kpi_id):
+        """Index entry for a KPI: offset, ancestor path ids, names and tree position"""
+        return self.kpis[kpi_id]
+
+    def node(self, data, kpi_id):
+        """Full node for a KPI from the document's `nodes`"""
+        return data["nodes"][self.kpis[kpi_id]["offset"]]
+
+    def tree_node(self, data, kpi_id):
+        """The KPI's leaf in the document's `tree`, reached by its child positions"""
+        node = data["tree"]
+        for i in self.kpis[kpi_id]["position"]:
+            node = node["children"][i]
+        return node
+
+    def breadcrumb(self, kpi_id, root_name=None):
+        """Ancestor names from pillar down to category, optionally starting at the root"""
+        names = list(self.kpis[kpi_id]["names"])
+        return ([root_name] if root_name else []) + names
+
+    def at_depth(self, depth):
+        """Ids of KPIs whose leaf sits `depth` levels below the root, in tree order"""
+        entries = sorted((entry["position"], kpi_id) for kpi_id, entry in self.kpis.items()
+                         if len(entry["position"]) == depth)
+        return [kpi_id for position, kpi_id in entries]
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+KPI Model
+Compact in-memory KPI records: `__slots__` classes with value and target kept
+as numbers, trend histories in arrays, and repeated sub-objects (owners,
+recommended actions, factor/impact pairs, indicator names) shared between
+records instead of copied into each one. Text that create_kpi_node() derives
+from other fields (context, gap, dependencies, ...) is not stored at all; the
+existing JSON node shape is produced only by `to_node()`.
+
+Kpi.from_node(node, graph).to_node(graph) == node for every node of the 19-field,
+10-layer contract; anything that differs from the derived defaults is kept
+as an override, so hand-edited documents round-trip too.
+
+  python3 kpi_model.py                               # round-trip check + memory per KPI
+  python3 kpi_model.py --input public/complete_kpi_tree.json
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from array import array
+
+from kpi_dependencies import DependencyGraph
+
+# Shared immutable sub-objects (factor pairs, action tuples, indicator lists)
+_SHARED = {}
+
+def _shared(value):
+    """One shared instance per distinct immutable value"""
+    return _SHARED.setdefault(value, value)
+
+def _text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def parse_number(text):
+    """"245" → 245, "5.2" → 5.2; values that are already numbers pass through"""
+    if not isinstance(text, str):
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def _parse_percent(text):
+    """"28%" → 28; anything else is kept as is"""
+    if isinstance(text, str) and text.endswith("%"):
+        try:
+            return int(text[:-1])
+        except ValueError:
+            pass
+    return text
+
+class RootCause:
+    """Layer 4 entry"""
+    __slots__ = ("cause", "confidence", "impact", "data_points")
+
+    def __init__(self, cause, confidence, impact, data_points):
+        self.cause = _text(cause)
+        self.confidence = confidence
+        self.impact = _text(impact)
+        self.data_points = data_points
+
+    def to_dict(self):
+        return {"cause": self.cause, "confidence": self.confidence, "impact": self.impact,
+                "data_points": self.data_points}
+
+class Scenario:
+    """Layer 5 scenario; probability is a whole percentage"""
+    __slots__ = ("name", "value", "probability")
+
+    def __init__(self, name, value, probability):
+        self.name = _text(name)
+        self.value = value
+        self.probability = probability
+
+    def to_dict(self):
+        probability = f"{self.probability}%" if isinstance(self.probability, int) else self.probability
+        return {"name": self.name, "value": self.value, "probability": probability}
+
+class Owner:
+    """A person from the owner pool; one shared instance per person"""
+    __slots__ = ("name", "title", "department", "email")
+
+    _pool = {}
+
+    def __init__(self, name, title, department, email):
+        self.name = name
+        self.title = title
+        self.department = department
+        self.email = email
+
+    @classmethod
+    def get(cls, name, title, department, email):
+        key = (name, title, department, email)
+        owner = cls._pool.get(key)
+        if owner is None:
+            owner = cls._pool[key] = cls(*map(_text, key))
+        return owner
+
+class Accountable:
+    """Layer 8 entry: a shared Owner plus the per-KPI role and avatar colour"""
+    __slots__ = ("owner", "role", "avatar_color")
+
+    def __init__(self, owner, role, avatar_color):
+        self.owner = owner
+        self.role = _text(role)
+        self.avatar_color = _text(avatar_color)
+
+    def to_dict(self):
+        owner = self.owner
+        return {"name": owner.name, "title": owner.title, "department": owner.department,
+                "email": owner.email, "role": self.role, "avatar_color": self.avatar_color}
+
+def _freeze_dicts(items):
+    """[{...}, ...] → shared tuple of (key, value) tuples"""
+    return _shared(tuple(_shared(tuple((key, _text(value)) for key, value in item.items())) for item in items))
+
+class Kpi:
+    """One KPI with numeric value/target and shared sub-objects"""
+    __slots__ = (
+        "id", "name", "value", "target", "unit", "rag", "trend",
+        "pillar", "macro_process", "category",
+        "financial_impact", "trend_data", "root_causes",
+        "pattern", "confidence", "timeframe", "scenarios", "leading_indicators",
+        "trend_strength", "volatility", "people", "actions",
+        "internal_factors", "external_factors", "overrides"
+    )
+
+    # Fields of to_node() computed from other fields: (section or None, key)
+    DERIVED = [
+        ("context", "definition"), ("context", "business_impact"), ("context", "industry_benchmark"),
+        ("current_state", "status"), ("current_state", "value"), ("current_state", "target"),
+        ("current_state", "gap"), ("current_state", "gap_percentage"),
+        ("trend_analysis", "current_trend"), ("trend_analysis", "key_insights"),
+        ("dependencies", "upstream"), ("dependencies", "downstream"), ("dependencies", "peer_metrics"),
+        (None, "value"), (None, "target")
+    ]
+
+    @classmethod
+    def from_node(cls, node, graph):
+        """Build a record from a JSON node dict
+
+        `graph` is the kpi_dependencies.DependencyGraph the dependencies layer is
+        derived from, e.g. DependencyGraph.from_document() of the node's document.
+        """
+        kpi = cls.__new__(cls)
+        kpi.id = node["id"]
+        kpi.name = node["name"]
+        kpi.value = parse_number(node["value"])
+        kpi.target = parse_number(node["target"])
+        kpi.unit = _text(node["unit"])
+        kpi.rag = _text(node["rag"])
+        kpi.trend = _text(node["trend"])
+        kpi.pillar = _text(node["pillar"])
+        kpi.macro_process = _text(node["macro_process"])
+        kpi.category = _text(node["category"])
+
+        kpi.financial_impact = node["current_state"]["financial_impact"]
+        trend_data = node["trend_data"]
+        kpi.trend_data = array("d", trend_data) if all(type(v) is float for v in trend_data) else tuple(trend_data)
+        kpi.root_causes = tuple(RootCause(**cause) for cause in node["root_causes"])
+
+        insights = node["predictive_insights"]
+        kpi.pattern = _text(insights["pattern"])
+        kpi.confidence = insights["confidence"]
+        kpi.timeframe = _text(insights["timeframe"])
+        kpi.scenarios = tuple(Scenario(s["name"], s["value"], _parse_percent(s["probability"]))
+                              for s in insights["scenarios"])
+        kpi.leading_indicators = _shared(tuple(map(_text, insights["leading_indicators"])))
+
+        analysis = node["trend_analysis"]
+        kpi.trend_strength = _text(analysis["trend_strength"])
+        kpi.volatility = _text(analysis["volatility"])
+
+        kpi.people = tuple(
+            Accountable(Owner.get(p["name"], p["title"], p["department"], p["email"]), p["role"], p["avatar_color"])
+            for p in node["people_accountable"]
+        )
+        kpi.actions = _freeze_dicts(node["recommended_actions"])
+        factors = node["contributing_factors"]
+        kpi.internal_factors = _freeze_dicts(factors["internal"])
+        kpi.external_factors = _freeze_dicts(factors["external"])
+
+        # Keep whatever the derived defaults would not reproduce
+        kpi.overrides = None
+        default = kpi.to_node(graph)
+        overrides = {}
+        for section, key in cls.DERIVED:
+            actual = (node if section is None else node[section]).get(key)
+            expected = (default if section is None else default[section])[key]
+            if actual != expected or type(actual) is not type(expected):
+                overrides[(section, key)] = actual
+        for key in node:
+            if key not in default:
+                overrides[(None, key)] = node[key]
+        kpi.overrides = overrides or None
+        return kpi
+
+    @property
+    def gap(self):
+        return round(abs(self.target - self.value), 2)
+
+    @property
+    def gap_percentage(self):
+        return round(abs(self.target - self.value) / self.target * 100, 1) if self.target != 0 else 0
+
+    def to_node(self, graph):
+        """The JSON node dict, in create_kpi_node() key order, with dependencies from `graph`"""
+        name, rag, trend = self.name, self.rag, self.trend
+        node = {
+            "id": self.id,
+            "name": name,
+            "value": str(self.value),
+            "target": str(self.target),
+            "unit": self.unit,
+            "rag": rag,
+            "trend": trend,
+            "pillar": self.pillar,
+            "macro_process": self.macro_process,
+            "category": self.category,
+            "context": {
+                "definition": f"{name} measures the performance and effectiveness of {name.lower()} in {self.category}",
+                "business_impact": f"Critical metric for {self.macro_process} affecting overall {self.pillar} performance and revenue",
+                "industry_benchmark": f"{self.target} {self.unit} is the industry target benchmark for spine specialty practices"
+            },
+            "current_state": {
+                "status": rag,
+                "value": str(self.value),
+                "target": str(self.target),
+                "gap": self.gap,
+                "gap_percentage": self.gap_percentage,
+                "financial_impact": self.financial_impact
+            },
+            "trend_data": list(self.trend_data),
+            "root_causes": [cause.to_dict() for cause in self.root_causes],
+            "predictive_insights": {
+                "pattern": self.pattern,
+                "confidence": self.confidence,
+                "timeframe": self.timeframe,
+                "scenarios": [scenario.to_dict() for scenario in self.scenarios],
+                "leading_indicators": list(self.leading_indicators)
+            },
+            "trend_analysis": {
+                "current_trend": trend.capitalize(),
+                "trend_strength": self.trend_strength,
+                "volatility": self.volatility,
+                "key_insights": f"{name} shows {trend} trajectory requiring {'immediate attention' if rag == 'red' else 'close monitoring' if rag == 'amber' else 'maintenance'}"
+            },
+            "dependencies": graph.node_dependencies(self.id),
+            "people_accountable": [person.to_dict() for person in self.people],
+            "recommended_actions": [dict(action) for action in self.actions],
+            "contributing_factors": {
+                "internal": [dict(factor) for factor in self.internal_factors],
+                "external": [dict(factor) for factor in self.external_factors]
+            }
+        }
+        if self.overrides:
+            for (section, key), value in self.overrides.items():
+                (node if section is None else node[section])[key] = value
+        return node
+
+def load_records(path='public/kpi_map.json'):
+    """Read a KPI document; returns (document without nodes, [Kpi], its DependencyGraph)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    graph = DependencyGraph.from_document(data)
+    records = [Kpi.from_node(node, graph) for node in data.pop("nodes")]
+    return data, records, graph
+
+def generate_records(catalog, **kwargs):
+    """Generate records directly: each node dict is converted and dropped as soon as it is built
+
+    Keyword arguments are passed to generate_complete_nyss_kpis.generate_nodes.
+    """
+    from generate_complete_nyss_kpis import DEPENDENCY_GRAPH, generate_nodes
+    for node in generate_nodes(catalog, **kwargs):
+        yield Kpi.from_node(node, DEPENDENCY_GRAPH)
+
+def _traced_bytes(build):
+    """Bytes still allocated after build() returns, with its result alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the compact KPI model against a KPI document")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document to load")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        text = f.read()
+    dict_bytes, data = _traced_bytes(lambda: json.loads(text))
+    nodes = data["nodes"]
+    graph = DependencyGraph.from_document(data)
+    model_bytes, records = _traced_bytes(lambda: [Kpi.from_node(node, graph) for node in nodes])
+
+    mismatches = [record.id for record, node in zip(records, nodes)
+                  if json.dumps(record.to_node(graph)) != json.dumps(node)]
+    overridden = sum(1 for record in records if record.overrides)
+
+    print(f"📊 {len(records)} KPIs from {args.input}")
+    print(f"  • Dict nodes:   {dict_bytes / len(nodes) / 1024:6.2f} KB per KPI (whole document)")
+    print(f"  • Kpi records:  {model_bytes / len(records) / 1024:6.2f} KB per KPI")
+    print(f"  • Overrides:    {overridden} records keep non-derived values")
+    if mismatches:
+        print(f"❌ {len(mismatches)} records do not round-trip, e.g. {mismatches[:5]}")
+        sys.exit(1)
+    print("✅ Every record round-trips to its original node")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Normalized KPI Document
+Dictionary-encoded form of a KPI document, written as kpi_map_normalized.json.
+Blocks that repeat across nodes (recommended-action playbooks, accountable
+people, contributing-factor entries, root-cause texts, leading indicators and
+dependency lists) are stored once in `tables`; nodes refer to them by
+position. Per-KPI texts that follow one of TEXT_TEMPLATES (context,
+key insights) are stored as template references and re-rendered from the
+node's own fields. resolve() (or resolveKpiDocument() in
+public/static/kpi_resolver.js) rebuilds the full node view, identical to the
+source document.
+
+  python3 kpi_normalized.py                               # public/kpi_map.json → public/kpi_map_normalized.json
+  python3 kpi_normalized.py --resolve public/kpi_map_normalized.json --output /tmp/kpi_map.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from kpi_artifacts import publish_document
+
+NORMALIZED_FILE = "kpi_map_normalized.json"
+FORMAT = "kpi-normalized/1"
+
+TABLES = ["actions", "people", "factors", "causes", "indicators", "dependencies", "scenarios", "templates"]
+
+# Texts create_kpi_node() builds from the node's own fields; placeholders are
+# node fields, plus name_lower
+TEXT_TEMPLATES = [
+    "{name} measures the performance and effectiveness of {name_lower} in {category}",
+    "Critical metric for {macro_process} affecting overall {pillar} performance and revenue",
+    "{target} {unit} is the industry target benchmark for spine specialty practices",
+    "{name} shows {trend} trajectory requiring immediate attention",
+    "{name} shows {trend} trajectory requiring close monitoring",
+    "{name} shows {trend} trajectory requiring maintenance"
+]
+
+# (section, key) of the node texts tried against TEXT_TEMPLATES
+TEMPLATED_TEXTS = [
+    ("context", "definition"),
+    ("context", "business_impact"),
+    ("context", "industry_benchmark"),
+    ("trend_analysis", "key_insights")
+]
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+class _Table:
+    """Append-only list of distinct JSON values, with O(1) value → position lookup"""
+
+    def __init__(self):
+        self.values = []
+        self._positions = {}
+
+    def ref(self, value):
+        key = json.dumps(value, ensure_ascii=False)
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = len(self.values)
+            self.values.append(value)
+        return position
+
+def _template_fields(node):
+    fields = {key: value for key, value in node.items() if isinstance(value, str)}
+    fields["name_lower"] = node["name"].lower()
+    return fields
+
+def _render(template, fields):
+    return _PLACEHOLDER.sub(lambda match: fields[match.group(1)], template)
+
+def _encode_text(text, fields, tables):
+    """Template reference for a text one of TEXT_TEMPLATES reproduces, else the text itself"""
+    for template in TEXT_TEMPLATES:
+        try:
+            if _render(template, fields) == text:
+                return tables["templates"].ref(template)
+        except KeyError:
+            continue
+    return text
+
+def _encode_node(node, tables):
+    encoded = dict(node)
+    fields = _template_fields(node)
+    for section, key in TEMPLATED_TEXTS:
+        encoded[section] = dict(encoded[section])
+        encoded[section][key] = _encode_text(node[section][key], fields, tables)
+    encoded["recommended_actions"] = tables["actions"].ref(node["recommended_actions"])
+    encoded["people_accountable"] = [tables["people"].ref(person) for person in node["people_accountable"]]
+    encoded["contributing_factors"] = {
+        side: [tables["factors"].ref(factor) for factor in factors]
+        for side, factors in node["contributing_factors"].items()
+    }
+    encoded["root_causes"] = [
+        [tables["causes"].ref({"cause": cause["cause"], "impact": cause["impact"]}),
+         cause["confidence"], cause["data_points"]]
+        for cause in node["root_causes"]
+    ]
+    insights = dict(node["predictive_insights"])
+    insights["scenarios"] = [[tables["scenarios"].ref(scenario["name"]), scenario["value"], scenario["probability"]]
+                             for scenario in insights["scenarios"]]
+    insights["leading_indicators"] = [tables["indicators"].ref(name) for name in insights["leading_indicators"]]
+    encoded["predictive_insights"] = insights
+    encoded["dependencies"] = tables["dependencies"].ref(node["dependencies"])
+    return encoded
+
+def normalize(data):
+    """Dictionary-encode a KPI document; other top-level keys are kept as they are"""
+    tables = {name: _Table() for name in TABLES}
+    normalized = {"format": FORMAT}
+    for key, value in data.items():
+        normalized[key] = [_encode_node(node, tables) for node in value] if key == "nodes" else value
+    normalized["tables"] = {name: table.values for name, table in tables.items()}
+    return normalized
+
+def resolve_node(node, tables):
+    """Full node view of one normalized node"""
+    resolved = dict(node)
+    fields = _template_fields(node)
+    for section, key in TEMPLATED_TEXTS:
+        text = node[section][key]
+        if isinstance(text, int):
+            resolved[section] = {**resolved[section], key: _render(tables["templates"][text], fields)}
+    resolved["root_causes"] = [
+        {"cause": tables["causes"][ref]["cause"], "confidence": confidence,
+         "impact": tables["causes"][ref]["impact"], "data_points": data_points}
+        for ref, confidence, data_points in node["root_causes"]
+    ]
+    insights = dict(node["predictive_insights"])
+    insights["scenarios"] = [{"name": tables["scenarios"][ref], "value": value, "probability": probability}
+                             for ref, value, probability in insights["scenarios"]]
+    insights["leading_indicators"] = [tables["indicators"][ref] for ref in insights["leading_indicators"]]
+    resolved["predictive_insights"] = insights
+    resolved["dependencies"] = tables["dependencies"][node["dependencies"]]
+    resolved["people_accountable"] = [tables["people"][ref] for ref in node["people_accountable"]]
+    resolved["recommended_actions"] = tables["actions"][node["recommended_actions"]]
+    resolved["contributing_factors"] = {
+        side: [tables["factors"][ref] for ref in refs]
+        for side, refs in node["contributing_factors"].items()
+    }
+    return resolved
+
+def resolve(normalized):
+    """Rebuild the full KPI document; shared blocks are shared objects, so treat them as read-only"""
+    if normalized.get("format") != FORMAT:
+        raise ValueError(f"not a {FORMAT} document (format: {normalized.get('format')!r})")
+    tables = normalized["tables"]
+    data = {}
+    for key, value in normalized.items():
+        if key in ("format", "tables"):
+            continue
+        data[key] = [resolve_node(node, tables) for node in value] if key == "nodes" else value
+    return data
+
+def write_normalized(data, out_dir="public"):
+    """Normalize `data` and publish it as <out_dir>/kpi_map_normalized.json; returns its size in bytes"""
+    return publish_document(normalize(data), [os.path.join(out_dir, NORMALIZED_FILE)],
+                            indent=None, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write or resolve the dictionary-encoded KPI document")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document to normalize")
+    parser.add_argument("--resolve", metavar="NORMALIZED", help="rebuild the full document from a normalized one")
+    parser.add_argument("--output", help="output file (default: next to the input)")
+    args = parser.parse_args()
+
+    if args.resolve:
+        with open(args.resolve, 'r', encoding='utf-8') as f:
+            data = resolve(json.load(f))
+        output = args.output or os.path.join(os.path.dirname(args.resolve), "kpi_map_resolved.json")
+        publish_document(data, [output], ensure_ascii=False)
+        print(f"✅ Resolved {len(data['nodes'])} KPI nodes to {output}")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    normalized = normalize(data)
+    if json.dumps(resolve(normalized)) != json.dumps(data):
+        print("❌ Normalized document does not resolve to the input")
+        sys.exit(1)
+
+    output = args.output or os.path.join(os.path.dirname(args.input), NORMALIZED_FILE)
+    size = publish_document(normalized, [output], indent=None, ensure_ascii=False)
+    source = os.path.getsize(args.input)
+    print(f"✅ {output}: {size:,} bytes ({source / size:.1f}× smaller than {source:,})")
+    for name, values in normalized["tables"].items():
+        print(f"  • {name}: {len(values)} shared entries")
+
+if __name__ == "__main__":
+    main()
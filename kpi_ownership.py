@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+KPI Ownership Index
+Joins the org hierarchy in people_data.json with a KPI document once at
+build time, written as kpi_ownership.json: person → owned KPIs, KPI →
+owners, and per person RAG counts, gap totals and monthly financial impact
+for their own KPIs and for their whole reporting subtree (aggregated in a
+single bottom-up walk of the org chart). Scorecards and the people graph
+read the totals instead of walking the hierarchy and scanning every node.
+
+A KPI's owners are the people whose `kpi_ownership` lists it plus its
+`people_accountable` entries; those are matched to the hierarchy by email,
+then by name, and kept as people outside the org chart when neither matches.
+
+  python3 kpi_ownership.py                              # public/kpi_map.json + people_data.json → public/kpi_ownership.json
+  python3 kpi_ownership.py --person "Emily Davis"
+"""
+
+import argparse
+import json
+import os
+import re
+
+from kpi_artifacts import publish_document
+
+OWNERSHIP_FILE = "kpi_ownership.json"
+PEOPLE_FILE = "people_data.json"
+FORMAT = "kpi-ownership/1"
+
+RAG_LEVELS = ["red", "amber", "green"]
+
+# Role recorded for ownership declared in the hierarchy's kpi_ownership lists
+DECLARED_ROLE = "KPI Owner"
+
+# Fields copied from the hierarchy (or a people_accountable entry) into each person
+PERSON_FIELDS = ["name", "title", "department", "email", "level"]
+
+_AMOUNT = re.compile(r"\$([\d,]+(?:\.\d+)?)")
+
+def monthly_impact(text):
+    """Dollar amount of a "$89,845 impact per month" text; 0 when there is none"""
+    match = _AMOUNT.search(text or "")
+    return float(match.group(1).replace(",", "")) if match else 0.0
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+def _totals(offsets, nodes):
+    """RAG counts, gap total and monthly financial impact of the nodes at `offsets`"""
+    rag = dict.fromkeys(RAG_LEVELS, 0)
+    gap = impact = 0.0
+    for offset in offsets:
+        node = nodes[offset]
+        if node.get("rag") in rag:
+            rag[node["rag"]] += 1
+        state = node.get("current_state") or {}
+        if isinstance(state.get("gap"), (int, float)):
+            gap += state["gap"]
+        impact += monthly_impact(state.get("financial_impact"))
+    return {"kpis": len(offsets), "rag": rag, "gap": round(gap, 2), "financial_impact": round(impact, 2)}
+
+def build_ownership(data, people_data):
+    """Build the ownership index for a KPI document and a people_data.json-shaped org chart"""
+    nodes = data["nodes"]
+    offsets = {node["id"]: offset for offset, node in enumerate(nodes)}
+
+    # Flatten the hierarchy in pre-order, so every person comes before their reports
+    people, order, declared = {}, [], {}
+    stack = [(people_data["hierarchy"], None)] if people_data.get("hierarchy") else []
+    while stack:
+        person, parent = stack.pop()
+        people[person["id"]] = {
+            **{field: person.get(field) for field in PERSON_FIELDS},
+            "parent": parent,
+            "reports": [child["id"] for child in person.get("children", [])],
+            "in_org": True
+        }
+        order.append(person["id"])
+        declared[person["id"]] = person.get("kpi_ownership", [])
+        stack.extend((child, person["id"]) for child in reversed(person.get("children", [])))
+
+    by_email = {person["email"].lower(): person_id for person_id, person in people.items() if person["email"]}
+    by_name = {person["name"].lower(): person_id for person_id, person in people.items() if person["name"]}
+
+    owned = {person_id: set() for person_id in people}
+    owners = {}
+
+    def own(person_id, offset, role):
+        if offset not in owned[person_id]:
+            owned[person_id].add(offset)
+            owners.setdefault(nodes[offset]["id"], []).append({"person": person_id, "role": role})
+
+    unresolved = {}
+    for person_id in order:
+        for kpi_id in declared[person_id]:
+            if kpi_id in offsets:
+                own(person_id, offsets[kpi_id], DECLARED_ROLE)
+            else:
+                unresolved.setdefault(person_id, []).append(kpi_id)
+
+    for offset, node in enumerate(nodes):
+        for entry in node.get("people_accountable") or []:
+            email, name = (entry.get("email") or "").lower(), entry.get("name") or ""
+            person_id = (email and by_email.get(email)) or by_name.get(name.lower())
+            if person_id is None:
+                # Accountable person who is not in the org chart
+                person_id = "accountable_" + _slug(email or name)
+                if person_id not in people:
+                    people[person_id] = {
+                        **{field: entry.get(field) for field in PERSON_FIELDS},
+                        "parent": None, "reports": [], "in_org": False
+                    }
+                    owned[person_id] = set()
+            own(person_id, offset, entry.get("role") or DECLARED_ROLE)
+
+    # Bottom-up: reversed pre-order visits every report before their manager
+    subtree = {}
+    for person_id in reversed(order):
+        members = set(owned[person_id])
+        for report in people[person_id]["reports"]:
+            members |= subtree[report]
+        subtree[person_id] = members
+
+    for person_id, person in people.items():
+        person["kpis"] = [nodes[offset]["id"] for offset in sorted(owned[person_id])]
+        person["own"] = _totals(owned[person_id], nodes)
+        person["subtree"] = _totals(subtree.get(person_id, owned[person_id]), nodes)
+
+    return {
+        "format": FORMAT,
+        "version": data.get("version"),
+        "people_version": people_data.get("version"),
+        "total_nodes": len(nodes),
+        "root": order[0] if order else None,
+        "people": people,
+        "kpis": {node["id"]: owners.get(node["id"], []) for node in nodes},
+        "unresolved": unresolved
+    }
+
+def load_people(out_dir="public"):
+    with open(os.path.join(out_dir, PEOPLE_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_ownership(data, out_dir="public"):
+    """Join `data` with <out_dir>/people_data.json and publish <out_dir>/kpi_ownership.json
+
+    Returns the index, or None when there is no people_data.json to join with.
+    """
+    if not os.path.exists(os.path.join(out_dir, PEOPLE_FILE)):
+        return None
+    ownership = build_ownership(data, load_people(out_dir))
+    publish_document(ownership, [os.path.join(out_dir, OWNERSHIP_FILE)], indent=None, ensure_ascii=False)
+    return ownership
+
+class KpiOwnership:
+    """Owner and scorecard lookups backed by a kpi_ownership.json-shaped dict"""
+
+    def __init__(self, ownership):
+        self.ownership = ownership
+        self.people = ownership["people"]
+        self._by_name = {person["name"].lower(): person_id for person_id, person in self.people.items() if person["name"]}
+
+    @classmethod
+    def load(cls, path=os.path.join("public", OWNERSHIP_FILE)):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def person_id(self, key):
+        """A person's id, given the id itself or their name (case-insensitive)"""
+        if key in self.people:
+            return key
+        return self._by_name.get(key.lower())
+
+    def owners(self, kpi_id):
+        """[{person, role}] for a KPI"""
+        return self.ownership["kpis"].get(kpi_id, [])
+
+    def kpis_of(self, person_id):
+        """Ids of the KPIs a person owns, in document order"""
+        return self.people[person_id]["kpis"]
+
+    def scorecard(self, person_id, subtree=True):
+        """Totals for a person's reporting subtree (or only their own KPIs)"""
+        return self.people[person_id]["subtree" if subtree else "own"]
+
+    def reports(self, person_id):
+        """Ids of a person's direct reports"""
+        return self.people[person_id]["reports"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Write or query the person ↔ KPI ownership index")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document to join with people_data.json next to it")
+    parser.add_argument("--person", help="print a person's scorecard (id or name) instead of writing the index")
+    args = parser.parse_args()
+
+    out_dir = os.path.dirname(args.input) or "."
+    if args.person:
+        ownership = KpiOwnership.load(os.path.join(out_dir, OWNERSHIP_FILE))
+        person_id = ownership.person_id(args.person)
+        if person_id is None:
+            print(f"❌ No person {args.person!r} in {OWNERSHIP_FILE}")
+            return
+        person = ownership.people[person_id]
+        print(f"👤 {person['name']} ({person_id}) — {person['title']}, {person['department']}")
+        for label, totals in (("Own KPIs", ownership.scorecard(person_id, False)),
+                              ("Reporting subtree", ownership.scorecard(person_id))):
+            rag = " / ".join(f"{totals['rag'][level]} {level}" for level in RAG_LEVELS)
+            print(f"  • {label}: {totals['kpis']} KPIs ({rag}), gap {totals['gap']:,}, "
+                  f"${totals['financial_impact']:,.0f} impact per month")
+        for report in ownership.reports(person_id):
+            totals = ownership.scorecard(report)
+            print(f"    ↳ {ownership.people[report]['name']}: {totals['kpis']} KPIs, {totals['rag']['red']} red")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    ownership = write_ownership(data, out_dir)
+    if ownership is None:
+        print(f"❌ No {PEOPLE_FILE} in {out_dir}")
+        return
+    in_org = sum(person["in_org"] for person in ownership["people"].values())
+    owned = sum(1 for owners in ownership["kpis"].values() if owners)
+    print(f"✅ {os.path.join(out_dir, OWNERSHIP_FILE)}: {in_org} people in the org chart, "
+          f"{len(ownership['people']) - in_org} accountable outside it, {owned}/{ownership['total_nodes']} KPIs owned")
+    unresolved = sum(len(ids) for ids in ownership["unresolved"].values())
+    if unresolved:
+        print(f"⚠️ {unresolved} kpi_ownership ids in {PEOPLE_FILE} match no KPI in {args.input}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+KPI Pipeline Profiling
+Per-stage timers for the generator and tree scripts, with optional cProfile
+and tracemalloc capture, written as a JSON report.
+
+Library code marks its stages with `with stage("serialize"): ...`; this is a
+no-op unless an entry point activated a profiler (the --profile option), so
+the hooks cost nothing in normal runs. Nested stages are recorded as
+"outer/inner"; cProfile and tracemalloc snapshots are taken per top-level
+stage.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+
+_active = None
+
+class PipelineProfiler:
+    """Collects stage timings (and optionally cProfile / tracemalloc data) for one entry point"""
+
+    def __init__(self, entry_point, cprofile=False, tracemalloc_top=0, top=15):
+        self.entry_point = entry_point
+        self.cprofile = cprofile
+        self.tracemalloc_top = tracemalloc_top
+        self.top = top
+        self.stages = {}
+        self._stack = []
+        self._started_at = datetime.now()
+        self._start = time.perf_counter()
+        if tracemalloc_top and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time one stage; top-level stages also get cProfile / tracemalloc capture"""
+        top_level = not self._stack
+        self._stack.append(name)
+        full_name = "/".join(self._stack)
+        # Registered on entry so the report lists stages in the order they start
+        record = self.stages.setdefault(full_name, {"name": full_name, "wall_s": 0.0, "calls": 0})
+
+        profile = cProfile.Profile() if self.cprofile and top_level else None
+        snapshot = None
+        if self.tracemalloc_top and top_level:
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+
+            record["wall_s"] += elapsed
+            record["calls"] += 1
+            if profile is not None:
+                record["cprofile_top"] = self._cprofile_top(profile)
+            if snapshot is not None:
+                record["tracemalloc_peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                record["tracemalloc_top"] = self._tracemalloc_top(snapshot)
+
+    def _cprofile_top(self, profile):
+        """Top functions by cumulative time"""
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (calls, _, total, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "total_s": round(total, 6),
+                "cumulative_s": round(cumulative, 6)
+            })
+        rows.sort(key=lambda row: row["cumulative_s"], reverse=True)
+        return rows[:self.top]
+
+    def _tracemalloc_top(self, before):
+        """Top allocation sites by memory growth during the stage"""
+        after = tracemalloc.take_snapshot()
+        return [
+            {
+                "location": str(diff.traceback),
+                "size_kb": round(diff.size_diff / 1024, 1),
+                "count": diff.count_diff
+            }
+            for diff in after.compare_to(before, "lineno")[:self.tracemalloc_top]
+        ]
+
+    def report(self):
+        return {
+            "entry_point": self.entry_point,
+            "started_at": self._started_at.isoformat(timespec="seconds"),
+            "total_s": round(time.perf_counter() - self._start, 6),
+            "stages": [
+                {**record, "wall_s": round(record["wall_s"], 6)}
+                for record in self.stages.values()
+            ]
+        }
+
+    def write_report(self, path):
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def print_summary(self):
+        report = self.report()
+        print(f"\n⏱️ Stage timings ({report['entry_point']}, {report['total_s']:.3f}s total):")
+        for record in report["stages"]:
+            calls = f" ×{record['calls']}" if record["calls"] > 1 else ""
+            print(f"  • {record['name']:<32} {record['wall_s']:>9.3f}s{calls}")
+
+def activate(profiler):
+    """Make `profiler` the one stage() reports to (None deactivates)"""
+    global _active
+    _active = profiler
+    return profiler
+
+@contextlib.contextmanager
+def stage(name):
+    """Mark a pipeline stage; a no-op unless a profiler is active"""
+    if _active is None:
+        yield
+    else:
+        with _active.stage(name):
+            yield
+
+def add_profiling_arguments(parser):
+    """Add --profile / --profile-cprofile / --profile-tracemalloc to an entry point's parser"""
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", nargs="?", const="", metavar="REPORT",
+                       help="time every pipeline stage and write a JSON report (default profile-<script>.json)")
+    group.add_argument("--profile-cprofile", action="store_true",
+                       help="also capture the top functions of each stage with cProfile")
+    group.add_argument("--profile-tracemalloc", type=int, default=0, metavar="N",
+                       help="also capture the top N allocation sites of each stage with tracemalloc")
+
+def profiler_from_args(args, entry_point):
+    """Activate a profiler when --profile was given; returns it, or None"""
+    if args.profile is None:
+        return None
+    return activate(PipelineProfiler(entry_point, args.profile_cprofile, args.profile_tracemalloc))
+
+def finish(profiler, args):
+    """Write the report and print the stage summary for an active profiler"""
+    if profiler is None:
+        return
+    path = args.profile or f"profile-{profiler.entry_point}.json"
+    profiler.write_report(path)
+    profiler.print_summary()
+    print(f"📄 Profile report saved to {path}")
+    activate(None)
+
+def profile_cli(entry_point, description):
+    """Parse profiling-only arguments for a script without its own options; returns (profiler, args)"""
+    parser = argparse.ArgumentParser(description=description)
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    return profiler_from_args(args, entry_point), args
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+KPI RAG Rules
+Declarative RAG classification: every KPI of the catalog names its rule in
+KPI_RULES, and every rule (RULES) states its direction and its green and
+amber bands as multiples of the target. The same rules classify one KPI at
+generation time (rag_status, pure Python) and whole documents or trend
+histories at once (classify, rag_timeline) as NumPy array comparisons:
+a KPIs × periods matrix is classified in one vector operation into a
+per-period RAG timeline.
+
+Directions are declared per KPI, never guessed from the unit or name: error,
+denial, no-show and adverse-event rates are lower-is-better even though they
+are percentages, and volumes such as leads or RVUs are higher-is-better. A
+KPI without a rule is an error.
+
+  python3 kpi_rag.py                                     # check public/kpi_map.json against the rules
+  python3 kpi_rag.py --timeline                          # per-period RAG counts over the trend histories
+  python3 kpi_rag.py --benchmark 100000 --periods 36
+"""
+
+import argparse
+import hashlib
+import json
+import time
+
+# RAG codes of the vectorized classifier (same as kpi_columns.bin); 255 = unknown
+RAG_CODES = ["green", "amber", "red"]
+UNKNOWN = 255
+
+class RagRule:
+    """Direction plus green and amber bands, as multiples of the target
+
+    higher: green when value >= target × green, amber when >= target × amber
+    lower:  green when value <= target × green, amber when <= target × amber
+    Anything else is red.
+    """
+
+    __slots__ = ("direction", "green", "amber")
+
+    def __init__(self, direction, green, amber):
+        if direction not in ("higher", "lower"):
+            raise ValueError(f"direction must be 'higher' or 'lower', not {direction!r}")
+        self.direction = direction
+        self.green = green
+        self.amber = amber
+
+    def classify(self, value, target):
+        """RAG status of one value"""
+        if self.direction == "higher":
+            if value >= target * self.green:
+                return "green"
+            return "amber" if value >= target * self.amber else "red"
+        if value <= target * self.green:
+            return "green"
+        return "amber" if value <= target * self.amber else "red"
+
+    def __repr__(self):
+        return f"RagRule({self.direction!r}, {self.green}, {self.amber})"
+
+RULES = {
+    "higher": RagRule("higher", 0.95, 0.85),
+    "higher_strict": RagRule("higher", 1.0, 0.85),    # generate_nyss_kpi_data.py
+    "lower": RagRule("lower", 1.05, 1.15),
+    "lower_strict": RagRule("lower", 1.0, 1.15),      # green only at or under target
+}
+
+# Rule of every catalog KPI (generate_complete_nyss_kpis.all_kpis), in catalog order;
+# synthetic site copies (kpi_..._siteN) follow their base KPI
+KPI_RULES = {
+    "kpi_1_1_1": "higher",        # New Patient Lead Volume (patients)
+    "kpi_1_1_2": "higher",        # Lead Source Mix - Google (%)
+    "kpi_1_1_3": "higher",        # Lead Source Mix - Referral (%)
+    "kpi_1_1_4": "higher",        # Lead Source Mix - Attorney (%)
+    "kpi_1_1_5": "higher",        # Conversion Rate by Source (%)
+    "kpi_1_1_6": "lower",         # Call Abandon Rate (%)
+    "kpi_1_1_7": "higher",        # Referral-to-Appointment Conversion (%)
+    "kpi_1_1_8": "higher",        # Referral Documentation Completeness (%)
+    "kpi_1_2_1": "lower",         # Days to First Appointment (days)
+    "kpi_1_2_2": "higher",        # Slot Availability Rate (%)
+    "kpi_1_2_3": "higher",        # Provider Schedule Saturation (%)
+    "kpi_1_2_4": "lower",         # Insurance Clearance Delay (days)
+    "kpi_1_2_5": "lower_strict",  # Appointment Wait Time In-Clinic (minutes)
+    "kpi_1_2_6": "lower_strict",  # Check-in to Rooming Time (minutes)
+    "kpi_1_2_7": "lower_strict",  # Rooming to Provider Time (minutes)
+    "kpi_1_2_8": "lower",         # No-Show Rate (%)
+    "kpi_1_2_9": "lower",         # No-Show Rate - New Patients (%)
+    "kpi_1_2_10": "lower",        # No-Show Rate - Follow-ups (%)
+    "kpi_1_3_1": "higher",        # Overall Packet Completeness Rate (%)
+    "kpi_1_3_2": "higher",        # Demographics Completeness (%)
+    "kpi_1_3_3": "higher",        # Insurance Card Upload Rate (%)
+    "kpi_1_3_4": "higher",        # Claim Number Documentation (%)
+    "kpi_1_3_5": "higher",        # Attorney Info Completeness (%)
+    "kpi_1_3_6": "higher",        # Imaging Upload Rate (%)
+    "kpi_1_3_7": "higher",        # Consent Forms Completion (%)
+    "kpi_1_3_8": "lower",         # Missing Packet Item Rate (%)
+    "kpi_1_3_9": "higher",        # Eligibility Verification Accuracy (%)
+    "kpi_1_3_10": "higher",       # Active Coverage Verification (%)
+    "kpi_1_3_11": "higher",       # Copay/Deductible Validation (%)
+    "kpi_1_3_12": "higher",       # Policy Dates Verification (%)
+    "kpi_1_3_13": "lower",        # Benefit Verification Turnaround (days)
+    "kpi_1_3_14": "higher",       # Pre-Visit Financial Clearance Rate (%)
+    "kpi_1_3_15": "higher",       # Prior Auth Required Identification (%)
+    "kpi_1_4_1": "higher",        # Imaging Availability Before Visit (%)
+    "kpi_1_4_2": "higher",        # MRI Upload Completeness (%)
+    "kpi_1_4_3": "higher",        # X-Ray Upload Completeness (%)
+    "kpi_1_4_4": "higher",        # Radiologist Report Availability (%)
+    "kpi_1_4_5": "higher",        # Referral Notes Availability (%)
+    "kpi_1_5_1": "higher",        # New Patient NPS (score)
+    "kpi_1_5_2": "higher",        # Intake Satisfaction Score (rating)
+    "kpi_1_5_3": "higher",        # Staff Courtesy Rating (rating)
+    "kpi_1_5_4": "higher",        # Process Speed Rating (rating)
+    "kpi_2_1_1": "higher",        # Provider Note Completion Rate 24h (%)
+    "kpi_2_1_2": "higher",        # Initial Note Completion (%)
+    "kpi_2_1_3": "lower",         # Addendum Requirement Rate (%)
+    "kpi_2_1_4": "lower",         # Late Documentation Count (cases)
+    "kpi_2_1_5": "higher",        # Clinical Documentation Accuracy (%)
+    "kpi_2_1_6": "higher",        # HPI Completeness (%)
+    "kpi_2_1_7": "higher",        # ROS Completeness (%)
+    "kpi_2_1_8": "higher",        # Physical Exam Completeness (%)
+    "kpi_2_1_9": "higher",        # Assessment Plan Quality (%)
+    "kpi_2_1_10": "higher",       # Provider-to-Coder Match Rate (%)
+    "kpi_2_1_11": "higher",       # CPT Justification Completeness (%)
+    "kpi_2_1_12": "higher",       # ICD Linkage Correctness (%)
+    "kpi_2_1_13": "higher",       # Medical Necessity Documentation (%)
+    "kpi_2_2_1": "lower_strict",  # Rooming Time Efficiency (minutes)
+    "kpi_2_2_2": "lower_strict",  # Provider Time per Encounter (minutes)
+    "kpi_2_2_3": "lower",         # New Visit Duration (minutes)
+    "kpi_2_2_4": "lower",         # Follow-up Visit Duration (minutes)
+    "kpi_2_2_5": "higher",        # EOD Clinical Closure Rate (%)
+    "kpi_2_2_6": "higher",        # Notes Closed EOD (%)
+    "kpi_2_2_7": "higher",        # Orders Signed EOD (%)
+    "kpi_2_3_1": "higher",        # Imaging Order Accuracy (%)
+    "kpi_2_3_2": "higher",        # CPT Accuracy MRI/XR (%)
+    "kpi_2_3_3": "higher",        # Laterality Correctness (%)
+    "kpi_2_3_4": "higher",        # ICD Linkage Imaging (%)
+    "kpi_2_3_5": "higher",        # Lab Order Timeliness (%)
+    "kpi_2_3_6": "higher",        # Critical Lab Follow-up SLA (%)
+    "kpi_2_3_7": "higher",        # Controlled Substance Compliance (%)
+    "kpi_2_3_8": "higher",        # I-STOP Verification Rate (%)
+    "kpi_2_3_9": "higher",        # UDS Compliance Rate (%)
+    "kpi_2_3_10": "higher",       # PDMP Audit Completion (%)
+    "kpi_2_4_1": "higher",        # RVU per Provider Monthly (RVU)
+    "kpi_2_4_2": "higher",        # RVU per Encounter (RVU)
+    "kpi_2_4_3": "higher",        # RVU per Hour (RVU)
+    "kpi_2_4_4": "higher",        # Provider Utilization Rate (%)
+    "kpi_2_4_5": "higher",        # Template Fill Percentage (%)
+    "kpi_2_4_6": "lower",         # Clinical Documentation Error Rate (%)
+    "kpi_2_4_7": "lower",         # Missing Diagnosis Rate (%)
+    "kpi_2_4_8": "lower",         # Incorrect ICD Severity (%)
+    "kpi_2_5_1": "lower",         # Adverse Event Rate (%)
+    "kpi_2_5_2": "lower",         # Medication Error Rate (%)
+    "kpi_2_5_3": "lower",         # Patient Fall Rate (%)
+    "kpi_2_5_4": "higher",        # Infection Control Compliance (%)
+    "kpi_2_5_5": "higher",        # Follow-Up Compliance Rate (%)
+    "kpi_3_1_1": "higher",        # Surgical Candidacy Compliance (%)
+    "kpi_3_1_2": "higher",        # MRI within 6 Months (%)
+    "kpi_3_1_3": "higher",        # X-Ray within 3 Months (%)
+    "kpi_3_1_4": "higher",        # Conservative Therapy Documentation (%)
+    "kpi_3_1_5": "higher",        # Surgical Recommendation Documentation (%)
+    "kpi_3_2_1": "higher",        # Authorization Approval Rate (%)
+    "kpi_3_2_2": "higher",        # Correct CPT Submission (%)
+    "kpi_3_2_3": "higher",        # ICD CPT Linkage Accuracy (%)
+    "kpi_3_2_4": "higher",        # Imaging Attachment Rate (%)
+    "kpi_3_2_5": "higher",        # Clinical Notes Compliance (%)
+    "kpi_3_2_6": "higher",        # Payer Criteria Met Rate (%)
+    "kpi_3_2_7": "lower_strict",  # Authorization Turnaround Time (days)
+    "kpi_3_2_8": "higher",        # Medical Necessity Package Completeness (%)
+    "kpi_3_2_9": "higher",        # Conservative Care Documentation (%)
+    "kpi_3_2_10": "higher",       # CPT Justification Narrative Quality (%)
+    "kpi_3_3_1": "lower_strict",  # Surgery Scheduling Lead Time (days)
+    "kpi_3_3_2": "higher",        # Provider Calendar Availability (%)
+    "kpi_3_3_3": "higher",        # Patient Readiness Rate (%)
+    "kpi_3_3_4": "higher",        # Insurance Surgical Clearance (%)
+    "kpi_3_3_5": "higher",        # Facility Availability Rate (%)
+    "kpi_3_3_6": "higher",        # EOD Surgical Deployment Rate (%)
+    "kpi_3_3_7": "higher",        # OR Block Utilization Rate (%)
+    "kpi_3_3_8": "lower",         # Case Duration Variance (%)
+    "kpi_3_3_9": "higher",        # First Case On-Time Start (%)
+    "kpi_3_3_10": "lower",        # Surgery Cancellation Rate (%)
+    "kpi_3_3_11": "lower",        # No Auth Cancellation Rate (%)
+    "kpi_3_3_12": "lower",        # Patient Readiness Failure Rate (%)
+    "kpi_3_4_1": "higher",        # Post-Op Visit Compliance (%)
+    "kpi_3_4_2": "higher",        # Follow-up within 7 Days (%)
+    "kpi_3_4_3": "higher",        # Follow-up within 30 Days (%)
+    "kpi_3_4_4": "lower",         # Post-Op Complication Rate (%)
+    "kpi_3_4_5": "lower",         # Surgical Site Infection Rate (%)
+    "kpi_3_4_6": "lower",         # Post-Op Neurologic Deficit (%)
+    "kpi_3_5_1": "lower_strict",  # Surgery to Billing Lag Time (days)
+    "kpi_3_5_2": "lower_strict",  # Op Note Completion Time (days)
+    "kpi_3_5_3": "higher",        # Surgical CPT ICD Accuracy (%)
+    "kpi_3_5_4": "higher",        # CPT Modifier Accuracy (%)
+    "kpi_3_5_5": "higher",        # Bundling Compliance Rate (%)
+    "kpi_4_1_1": "higher",        # Clinical Doc to Coding Accuracy (%)
+    "kpi_4_1_2": "higher",        # Provider Note Completeness for Coding (%)
+    "kpi_4_1_3": "higher",        # Injury Causality Documentation (%)
+    "kpi_4_1_4": "higher",        # Imaging Documentation Linkage (%)
+    "kpi_4_1_5": "higher",        # Medical Necessity for Coding (%)
+    "kpi_4_1_6": "lower_strict",  # Coding Lag Time (days)
+    "kpi_4_1_7": "lower",         # Encounters Awaiting Signatures (cases)
+    "kpi_4_2_1": "higher",        # Claim Scrubbing Accuracy (%)
+    "kpi_4_2_2": "lower",         # Demographic Error Rate (%)
+    "kpi_4_2_3": "lower",         # Insurance Mismatch Rate (%)
+    "kpi_4_2_4": "higher",        # Policy Termination Detection (%)
+    "kpi_4_2_5": "lower",         # Missing Auth Number Rate (%)
+    "kpi_4_2_6": "lower",         # CPT ICD Mismatch Rate (%)
+    "kpi_4_2_7": "lower",         # Modifier Error Rate (%)
+    "kpi_4_2_8": "higher",        # Clean Claim Rate (%)
+    "kpi_4_2_9": "higher",        # Error-Free Submission Rate (%)
+    "kpi_4_2_10": "lower_strict", # Claim Submission Lag (days)
+    "kpi_4_2_11": "lower_strict", # Lag by Commercial Payers (days)
+    "kpi_4_2_12": "lower_strict", # Lag by WC Payers (days)
+    "kpi_4_2_13": "lower_strict", # Lag by PIP Payers (days)
+    "kpi_4_3_1": "higher",        # First Pass Acceptance FPA (%)
+    "kpi_4_3_2": "higher",        # FPA - Commercial Insurance (%)
+    "kpi_4_3_3": "higher",        # FPA - Workers Comp (%)
+    "kpi_4_3_4": "higher",        # FPA - PIP No-Fault (%)
+    "kpi_4_3_5": "lower",         # Overall Denial Rate (%)
+    "kpi_4_3_6": "lower",         # Technical Denial Rate (%)
+    "kpi_4_3_7": "lower",         # Clinical Denial Rate (%)
+    "kpi_4_3_8": "lower",         # No-Auth Denial Rate (%)
+    "kpi_4_3_9": "lower",         # Timely Filing Denial Rate (%)
+    "kpi_4_3_10": "lower",        # Eligibility Denial Rate (%)
+    "kpi_4_3_11": "higher",       # Denial Recovery Rate (%)
+    "kpi_4_3_12": "lower",        # Denial Recovery Turnaround (days)
+    "kpi_4_4_1": "higher",        # Appeal Success Rate (%)
+    "kpi_4_4_2": "higher",        # Appeal Overturn Rate (%)
+    "kpi_4_4_3": "higher",        # Appeal Documentation Quality (%)
+    "kpi_4_4_4": "higher",        # Appeal SLA Compliance (%)
+    "kpi_4_4_5": "higher",        # Underpayment Detection Rate (%)
+    "kpi_4_4_6": "lower",         # Allowed vs Paid Variance (%)
+    "kpi_4_5_1": "lower",         # AR Days Overall (days)
+    "kpi_4_5_2": "higher",        # AR 0-30 Days (%)
+    "kpi_4_5_3": "lower",         # AR 31-60 Days (%)
+    "kpi_4_5_4": "lower",         # AR 61-90 Days (%)
+    "kpi_4_5_5": "lower",         # AR Over 90 Days (%)
+    "kpi_4_5_6": "lower",         # AR Over 120 Days (%)
+    "kpi_4_5_7": "higher",        # Payment Posting Accuracy (%)
+    "kpi_4_5_8": "lower",         # Posting Error Rate (%)
+    "kpi_4_5_9": "higher",        # Adjustment Accuracy (%)
+    "kpi_4_5_10": "lower_strict", # Payment Posting Lag (days)
+    "kpi_4_6_1": "higher",        # Net Collection Rate NCR (%)
+    "kpi_4_6_2": "higher",        # Gross Collection Rate (%)
+    "kpi_4_6_3": "higher",        # Adjusted Collection Rate (%)
+    "kpi_4_6_4": "lower",         # Days in AR (days)
+    "kpi_4_6_5": "higher",        # Collection Rate - Commercial (%)
+    "kpi_4_6_6": "higher",        # Collection Rate - WC (%)
+    "kpi_4_6_7": "higher",        # Collection Rate - PIP (%)
+    "kpi_4_6_8": "higher",        # Timely Filing Compliance (%)
+    "kpi_4_6_9": "lower",         # Timely Filing Denial Count (cases)
+    "kpi_4_6_10": "lower",        # Total Write-Off Rate (%)
+    "kpi_4_6_11": "lower",        # Avoidable Write-Off Rate (%)
+    "kpi_4_6_12": "lower",        # Contractual Adjustment Rate (%)
+    "kpi_5_1_1": "higher",        # HIPAA Training Completion (%)
+    "kpi_5_1_2": "higher",        # PHI Access Audit Compliance (%)
+    "kpi_5_1_3": "lower",         # Breach Incident Rate (incidents)
+    "kpi_5_1_4": "higher",        # Medical Record Compliance Score (%)
+    "kpi_5_1_5": "higher",        # Controlled Substance Audit Score (%)
+    "kpi_5_2_1": "higher",        # Incident Report Completion Rate (%)
+    "kpi_5_2_2": "lower_strict",  # Risk Event Closure Time (days)
+    "kpi_5_2_3": "higher",        # Near Miss Reporting Rate (%)
+    "kpi_5_2_4": "higher",        # Fraud Detection Rate (%)
+    "kpi_5_2_5": "higher",        # Overpayment Recovery Rate (%)
+    "kpi_5_3_1": "higher",        # Clinical Quality Score (%)
+    "kpi_5_3_2": "higher",        # Peer Review Completion Rate (%)
+    "kpi_5_3_3": "higher",        # Quality Improvement Initiatives (active)
+    "kpi_5_3_4": "higher",        # Coding Audit Pass Rate (%)
+    "kpi_5_3_5": "higher",        # Billing Compliance Score (%)
+    "kpi_5_4_1": "higher",        # Provider Credentialing Current (%)
+    "kpi_5_4_2": "higher",        # License Renewal Compliance (%)
+    "kpi_5_4_3": "higher",        # DEA Renewal Compliance (%)
+    "kpi_5_4_4": "higher",        # Staff Certification Current (%)
+    "kpi_5_4_5": "higher",        # Continuing Education Compliance (%)
+    "kpi_5_5_1": "higher",        # Internal Audit Completion Rate (%)
+    "kpi_5_5_2": "higher",        # Audit Finding Closure Rate (%)
+    "kpi_5_5_3": "lower",         # High Risk Finding Rate (%)
+    "kpi_5_5_4": "higher",        # External Audit Pass Rate (%)
+    "kpi_5_5_5": "lower",         # Payer Audit Deficiency Rate (%)
+    "kpi_5_6_1": "higher",        # Policy Acknowledgment Rate (%)
+    "kpi_5_6_2": "higher",        # Policy Review Currency (%)
+    "kpi_5_6_3": "lower",         # Policy Violation Rate (%)
+    "kpi_5_6_4": "higher",        # Annual Training Completion (%)
+    "kpi_5_6_5": "higher",        # Training Effectiveness Score (%)
+}
+
+def rule_for(kpi_id):
+    """The RagRule of a KPI; ValueError when KPI_RULES has no entry for it"""
+    name = KPI_RULES.get(kpi_id.partition("_site")[0])
+    if name is None:
+        raise ValueError(f"no RAG rule for KPI {kpi_id!r}: declare one in kpi_rag.KPI_RULES")
+    return RULES[name]
+
+def rag_status(kpi_id, value, target):
+    """RAG status of one KPI value under its rule"""
+    return rule_for(kpi_id).classify(value, target)
+
+def rules_digest():
+    """Hash of the rule table, so generated nodes never outlive a rule change"""
+    bands = {name: [rule.direction, rule.green, rule.amber] for name, rule in RULES.items()}
+    text = json.dumps([bands, KPI_RULES], sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def rule_columns(rules):
+    """(sign, green, amber) float64 arrays for a list of RagRules; sign is +1 higher, -1 lower"""
+    import numpy as np
+    sign = np.array([1.0 if rule.direction == "higher" else -1.0 for rule in rules])
+    green = np.array([rule.green for rule in rules], dtype=np.float64)
+    amber = np.array([rule.amber for rule in rules], dtype=np.float64)
+    return sign, green, amber
+
+def classify(values, targets, rules):
+    """RAG codes (uint8, RAG_CODES order) for every KPI at once
+
+    `values` is one value per KPI, or a KPIs × periods matrix classified
+    period by period against the KPI's target; `rules` is one RagRule per
+    KPI, or rule_columns() of them. NaN values or targets give UNKNOWN.
+    Lower-is-better rules are applied as higher-is-better on negated values,
+    so every cell takes the same two comparisons.
+    """
+    import numpy as np
+    values = np.asarray(values, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    sign, green, amber = rules if isinstance(rules, tuple) else rule_columns(rules)
+    if values.ndim == 2:
+        targets, sign, green, amber = targets[:, None], sign[:, None], green[:, None], amber[:, None]
+
+    signed = sign * values
+    bound = sign * targets
+    codes = np.where(signed >= bound * green, 0, np.where(signed >= bound * amber, 1, 2)).astype(np.uint8)
+    codes[np.isnan(values) | np.isnan(targets)] = UNKNOWN
+    return codes
+
+def rag_timeline(trends, targets, rules):
+    """KPIs × periods RAG codes of trend histories (NaN-padded rows give UNKNOWN)"""
+    return classify(trends, targets, rules)
+
+def timeline_counts(codes):
+    """{status: count per period} of a rag_timeline() matrix"""
+    return {status: (codes == code).sum(axis=0) for code, status in enumerate(RAG_CODES)}
+
+def rag_names(codes):
+    """RAG status names of a code vector (None for UNKNOWN)"""
+    return [RAG_CODES[code] if code < len(RAG_CODES) else None for code in codes]
+
+def _number(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return float("nan")
+
+def document_arrays(nodes):
+    """(values, targets, trends, rules) of a node list; trends are NaN-padded to the longest history"""
+    import numpy as np
+    periods = max((len(node.get("trend_data") or []) for node in nodes), default=0)
+    trends = np.full((len(nodes), periods), np.nan)
+    for row, node in enumerate(nodes):
+        trend = node.get("trend_data") or []
+        trends[row, :len(trend)] = trend
+    values = np.array([_number(node.get("value")) for node in nodes])
+    targets = np.array([_number(node.get("target")) for node in nodes])
+    rules = [rule_for(node["id"]) for node in nodes]
+    return values, targets, trends, rules
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify KPI values and trend histories with the RAG rule table")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document")
+    parser.add_argument("--timeline", action="store_true", help="print RAG counts per trend period")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time the classification of N synthetic KPIs")
+    parser.add_argument("--periods", type=int, default=36, help="trend periods for --benchmark (default 36)")
+    args = parser.parse_args()
+
+    import numpy as np
+
+    if args.benchmark:
+        from kpi_trends import generate_trend_matrix
+        rng = np.random.default_rng(0)
+        trends = generate_trend_matrix(args.benchmark, args.periods, rng=rng)
+        targets = rng.uniform(70, 95, size=args.benchmark)
+        names = list(RULES)
+        columns = rule_columns([RULES[names[i % len(names)]] for i in range(args.benchmark)])
+        start = time.perf_counter()
+        codes = rag_timeline(trends, targets, columns)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️ {codes.size:,} KPI-periods ({args.benchmark:,} KPIs × {args.periods}) classified in "
+              f"{elapsed * 1000:.1f} ms")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        nodes = json.load(f)["nodes"]
+    try:
+        values, targets, trends, rules = document_arrays(nodes)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return
+    codes = classify(values, targets, rules)
+    counts = {name: sum(1 for node in nodes if KPI_RULES[node["id"].partition("_site")[0]] == name) for name in RULES}
+    print(f"📏 {len(nodes)} KPIs: " + ", ".join(f"{count} {name}" for name, count in counts.items() if count))
+
+    mismatches = [(node, expected) for node, expected in zip(nodes, rag_names(codes)) if node.get("rag") != expected]
+    if mismatches:
+        print(f"⚠️ {len(mismatches)} KPIs whose rag differs from their rule:")
+        for node, expected in mismatches[:10]:
+            print(f"  • {node['id']} {node['name']}: {node.get('rag')} (rule says {expected})")
+    else:
+        print(f"✅ Every rag in {args.input} matches its rule")
+
+    if args.timeline:
+        per_period = timeline_counts(rag_timeline(trends, targets, rules))
+        print(f"\n📈 RAG per trend period ({trends.shape[1]} periods):")
+        for period in range(trends.shape[1]):
+            print(f"  t{period + 1:<3} " + "  ".join(f"{status} {per_period[status][period]:>4}" for status in RAG_CODES))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+KPI Random-Access Reader
+Memory-maps a KPI document and decodes only the records asked for. A
+sidecar offsets file (.kpi_state/<dir>/<document>.offsets, outside the
+deployed directory) holds the byte span of every
+element of `nodes` with its KPI id, and of every other top-level field; it
+is built with one byte-level scan on first use and rebuilt whenever the
+document's size or mtime changes (every writer replaces the file, so both
+change on each build).
+
+  python3 kpi_reader.py kpi_1_1_1                  # print one KPI without parsing the whole file
+  python3 kpi_reader.py --benchmark                 # full json.load vs indexed lookups
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import time
+
+from kpi_artifacts import atomic_open, remove_legacy_sidecar, sidecar_path
+
+OFFSETS_SUFFIX = ".offsets"
+OFFSETS_FORMAT = "kpi-offsets/1"
+
+_TOKEN = re.compile(rb'[\[\]{}"]')
+_STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.S)
+_COLON = re.compile(rb'\s*:\s*')
+_SCALAR = re.compile(rb'[^,}\]\s]+')
+
+def _match(pattern, buf, pos, what):
+    """pattern.match(buf, pos), raising ValueError where the document is malformed or truncated"""
+    match = pattern.match(buf, pos)
+    if match is None:
+        raise ValueError(f"malformed KPI document: expected {what} at byte {pos}")
+    return match
+
+def iter_document(buf):
+    """Yield ("field", name, start, end) and ("node", kpi_id, start, end) spans in document order
+
+    Fields are the top-level values other than `nodes`; nodes are the
+    elements of `nodes`. Only brackets and strings are visited (strings are
+    skipped whole by regex), so the scan never decodes a value apart from
+    keys and node ids, and holds no state beyond the current node. Raises
+    ValueError for a malformed or truncated document.
+    """
+    depth = 0
+    key = None              # current top-level key
+    value_start = None      # start of its value
+    node_start = None       # start of the current element of `nodes`
+    node_id = None
+    in_nodes = False
+    pos = 0
+
+    while True:
+        match = _TOKEN.search(buf, pos)
+        if match is None:
+            break
+        token = match.group()
+        start = match.start()
+
+        if token == b'"':
+            end = _match(_STRING_TAIL, buf, start + 1, "the end of a string").end()
+            colon = _COLON.match(buf, end)
+            if colon is not None and depth == 1:
+                key, value_start = json.loads(buf[start:end]), colon.end()
+                if buf[value_start:value_start + 1] not in (b'{', b'['):
+                    # Scalar value: a string, number, true, false or null
+                    if buf[value_start:value_start + 1] == b'"':
+                        end = _match(_STRING_TAIL, buf, value_start + 1, "the end of a string").end()
+                    else:
+                        end = _match(_SCALAR, buf, value_start, "a value").end()
+                    yield "field", key, value_start, end
+                else:
+                    end = value_start
+            elif colon is not None and depth == 3 and in_nodes and buf[start:end] == b'"id"':
+                # Ids are strings by contract; a number, bool or null is passed on for the validator
+                # to report, and an object or array id is scanned as a value and leaves the id None
+                first = buf[colon.end():colon.end() + 1]
+                if first == b'"':
+                    end = _match(_STRING_TAIL, buf, colon.end() + 1, "the end of a string id").end()
+                elif first not in (b'{', b'['):
+                    end = _match(_SCALAR, buf, colon.end(), "an id").end()
+                else:
+                    end = colon.end()
+                if end > colon.end():
+                    try:
+                        node_id = json.loads(buf[colon.end():end])
+                    except ValueError:
+                        raise ValueError(f"malformed KPI document: invalid id at byte {colon.end()}") from None
+            pos = end
+            continue
+
+        if token in (b'{', b'['):
+            depth += 1
+            if depth == 2 and key == "nodes" and token == b'[':
+                in_nodes = True
+            elif depth == 3 and in_nodes:
+                node_start, node_id = start, None
+        else:
+            if depth == 3 and in_nodes:
+                yield "node", node_id, node_start, start + 1
+            elif depth == 2:
+                if not in_nodes:
+                    yield "field", key, value_start, start + 1
+                in_nodes = False
+            depth -= 1
+            if depth < 0:
+                raise ValueError(f"malformed KPI document: unbalanced {token.decode()} at byte {start}")
+        pos = start + 1
+
+    if depth:
+        raise ValueError(f"truncated KPI document: {depth} unclosed object(s) or array(s) at byte {len(buf)}")
+
+def scan_document(buf):
+    """({field: (start, end)}, [(kpi_id, start, end), ...]) for a whole KPI document"""
+    fields = {}
+    nodes = []
+    for kind, name, start, end in iter_document(buf):
+        if kind == "node":
+            nodes.append((name, start, end))
+        else:
+            fields[name] = (start, end)
+    return fields, nodes
+
+def offsets_path(path):
+    return sidecar_path(path, OFFSETS_SUFFIX)
+
+def build_offsets(path):
+    """Scan a KPI document and write its sidecar offsets file; returns the offsets dict"""
+    stat = os.stat(path)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        fields, nodes = scan_document(buf)
+    offsets = {
+        "format": OFFSETS_FORMAT,
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+        "fields": {field: list(span) for field, span in fields.items()},
+        "ids": [kpi_id for kpi_id, _, _ in nodes],
+        "spans": [offset for _, start, end in nodes for offset in (start, end)]
+    }
+    os.makedirs(os.path.dirname(offsets_path(path)), exist_ok=True)
+    with atomic_open(offsets_path(path)) as f:
+        json.dump(offsets, f, separators=(",", ":"))
+    remove_legacy_sidecar(path, OFFSETS_SUFFIX)
+    return offsets
+
+def load_offsets(path):
+    """The sidecar offsets for `path`, rebuilt if missing or stale"""
+    stat = os.stat(path)
+    try:
+        with open(offsets_path(path), 'r', encoding='utf-8') as f:
+            offsets = json.load(f)
+        if (offsets.get("format") == OFFSETS_FORMAT
+                and offsets["source"] == {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}):
+            return offsets
+    except (OSError, ValueError, KeyError):
+        pass
+    return build_offsets(path)
+
+class KpiReader:
+    """Random access to the nodes and top-level fields of a KPI document through mmap
+
+    Nodes are kept in document order, so a repeated id never hides a node;
+    lookups by id return its first node, and the repeats are listed in
+    `duplicates` with a warning.
+    """
+
+    def __init__(self, path='public/kpi_map.json'):
+        self.path = path
+        offsets = load_offsets(path)
+        self.fields = {field: tuple(span) for field, span in offsets["fields"].items()}
+        spans = offsets["spans"]
+        self.node_ids = offsets["ids"]
+        self.spans = [(spans[2 * i], spans[2 * i + 1]) for i in range(len(self.node_ids))]
+        self.positions = {}
+        self.duplicates = []
+        for position, kpi_id in enumerate(self.node_ids):
+            if self.positions.setdefault(kpi_id, position) != position:
+                self.duplicates.append(kpi_id)
+        if self.duplicates:
+            print(f"⚠️ {path}: {len(self.duplicates)} duplicate node ids, e.g. {self.duplicates[:5]}; "
+                  f"lookups return the first node with each id")
+        self._file = open(path, 'rb')
+        self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self._buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, kpi_id):
+        return kpi_id in self.positions
+
+    def ids(self):
+        """KPI ids in node order, repeats included"""
+        return list(self.node_ids)
+
+    def raw(self, kpi_id):
+        """The node's JSON bytes, as stored (the first node with that id)"""
+        start, end = self.spans[self.positions[kpi_id]]
+        return self._buf[start:end]
+
+    def get(self, kpi_id):
+        """Decode one node"""
+        return json.loads(self.raw(kpi_id))
+
+    def get_many(self, kpi_ids):
+        """Decode several nodes, in the order asked"""
+        return [self.get(kpi_id) for kpi_id in kpi_ids]
+
+    def iter_nodes(self):
+        """Decode the nodes one at a time, in document order"""
+        for start, end in self.spans:
+            yield json.loads(self._buf[start:end])
+
+    def field(self, name, default=None):
+        """Decode one top-level field other than `nodes` (version, tree, ...)"""
+        span = self.fields.get(name)
+        if span is None:
+            return default
+        return json.loads(self._buf[span[0]:span[1]])
+
+def main():
+    parser = argparse.ArgumentParser(description="Read KPIs from a document without parsing all of it")
+    parser.add_argument("kpi_ids", nargs="*", help="KPI ids to print")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the offsets sidecar")
+    parser.add_argument("--benchmark", action="store_true", help="compare full parsing with indexed lookups")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        start = time.perf_counter()
+        offsets = build_offsets(args.input)
+        print(f"✅ Indexed {len(offsets['ids'])} nodes in {time.perf_counter() - start:.3f}s → {offsets_path(args.input)}")
+
+    with KpiReader(args.input) as reader:
+        for kpi_id in args.kpi_ids:
+            print(json.dumps(reader.get(kpi_id), indent=2, ensure_ascii=False))
+
+        if args.benchmark:
+            ids = reader.ids()
+            start = time.perf_counter()
+            with open(args.input, 'r', encoding='utf-8') as f:
+                json.load(f)
+            full = time.perf_counter() - start
+
+            sample = ids[::max(1, len(ids) // 100)]
+            start = time.perf_counter()
+            for kpi_id in sample:
+                reader.get(kpi_id)
+            lookup = (time.perf_counter() - start) / len(sample)
+
+            start = time.perf_counter()
+            KpiReader(args.input).close()
+            reopen = time.perf_counter() - start
+
+            print(f"📊 {len(ids)} nodes, {os.path.getsize(args.input):,} bytes")
+            print(f"  • Full json.load:       {full * 1e3:9.2f} ms")
+            print(f"  • Open reader (cached): {reopen * 1e3:9.2f} ms")
+            print(f"  • Point lookup:         {lookup * 1e6:9.1f} µs")
+
+if __name__ == "__main__":
+    main()
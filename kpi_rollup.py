@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+KPI Rollups
+Aggregated status on every interior node of a KPI tree (root, pillars,
+macro processes, categories), computed in one post-order pass: the RAG
+distribution, the worst status, the mean gap % (each child weighted by its
+KPI count) and the summed monthly financial impact. Each node's rollup is
+combined from its children's, so after a KPI changes only the nodes on its
+path are recomputed (`stale`) and every other subtree is reused as it is;
+the result is the same as a full pass. The dashboards read the precomputed
+`tree.rollup` for their summary tiles instead of filtering every node.
+
+  python3 kpi_rollup.py                                  # rollups of public/kpi_map.json, per pillar
+  python3 kpi_rollup.py --input public/complete_kpi_tree.json --depth 2
+"""
+
+import argparse
+import json
+
+from kpi_ownership import monthly_impact
+
+# Worst first: a subtree's `worst` is the first level with any KPI
+RAG_LEVELS = ["red", "amber", "green"]
+
+def _gap_percentage(node):
+    gap = (node.get("current_state") or {}).get("gap_percentage")
+    return gap if isinstance(gap, (int, float)) else None
+
+def _summary(kpis, rag, gap_total, gap_kpis, impact):
+    gap_total = round(gap_total, 2)
+    return {
+        "kpis": kpis,
+        "rag": rag,
+        "worst": next((level for level in RAG_LEVELS if rag[level]), None),
+        "gap_percentage": round(gap_total / gap_kpis, 2) if gap_kpis else None,
+        "gap_total": gap_total,
+        "gap_kpis": gap_kpis,
+        "financial_impact": round(impact, 2)
+    }
+
+def _rollup(tree_node, path, nodes_by_id, stale):
+    if stale is not None and path not in stale and "rollup" in tree_node:
+        return tree_node
+
+    rag = dict.fromkeys(RAG_LEVELS, 0)
+    kpis = gap_kpis = 0
+    gap_total = impact = 0.0
+    children = []
+    for child in tree_node["children"]:
+        if "children" in child:
+            child = _rollup(child, path + (child["name"],), nodes_by_id, stale)
+            part = child["rollup"]
+            kpis += part["kpis"]
+            for level in RAG_LEVELS:
+                rag[level] += part["rag"][level]
+            gap_total += part["gap_total"]
+            gap_kpis += part["gap_kpis"]
+            impact += part["financial_impact"]
+        else:
+            kpis += 1
+            node = nodes_by_id.get(child["id"], {})
+            if node.get("rag") in rag:
+                rag[node["rag"]] += 1
+            gap = _gap_percentage(node)
+            if gap is not None:
+                gap_total += gap
+                gap_kpis += 1
+            impact += monthly_impact((node.get("current_state") or {}).get("financial_impact"))
+        children.append(child)
+
+    fields = {key: value for key, value in tree_node.items() if key not in ("rollup", "children")}
+    return {**fields, "rollup": _summary(kpis, rag, gap_total, gap_kpis, impact), "children": children}
+
+def rollup_tree(tree, nodes, stale=None):
+    """A copy of `tree` with a `rollup` on the root and every interior node
+
+    `nodes` is the document's node list (or {id: node}); KPI leaves are
+    matched to it by id. `stale` limits the pass to the interior nodes at
+    those name paths (the root is `()`, a pillar `(pillar,)`, ...) plus any
+    without a rollup yet; the others keep theirs. `tree` is not modified.
+    """
+    nodes_by_id = nodes if isinstance(nodes, dict) else {node["id"]: node for node in nodes}
+    return _rollup(tree, (), nodes_by_id, None if stale is None else set(stale))
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the RAG, gap and impact rollups of a KPI tree")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document")
+    parser.add_argument("--depth", type=int, default=1, help="tree levels to show below the root (default 1)")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    tree = data["tree"] if "rollup" in data["tree"] else rollup_tree(data["tree"], data["nodes"])
+    if tree is not data["tree"]:
+        print(f"ℹ️ {args.input} has no rollups yet: computed them from its nodes")
+
+    stack = [(tree, 0)]
+    while stack:
+        node, depth = stack.pop()
+        rollup = node["rollup"]
+        rag = " ".join(f"{rollup['rag'][level]} {level}" for level in RAG_LEVELS)
+        gap = "n/a" if rollup["gap_percentage"] is None else f"{rollup['gap_percentage']}%"
+        print(f"{'  ' * depth}• {node['name']}: {rollup['kpis']} KPIs ({rag}), worst {rollup['worst'] or 'n/a'}, "
+              f"mean gap {gap}, ${rollup['financial_impact']:,.0f} impact per month")
+        if depth < args.depth:
+            stack.extend((child, depth + 1) for child in reversed(node["children"]) if "children" in child)
+
+if __name__ == "__main__":
+    main()
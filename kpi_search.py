@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+KPI Search Index
+Inverted index over the text of a KPI document, written as kpi_search.json:
+names, definitions, root causes, recommended actions and the pillar / macro
+process / category labels are tokenized, stemmed and stored as postings
+with TF-IDF weights (field-boosted, L2-normalized per KPI). A query is a
+few dictionary probes plus a top-k over the matching postings, in Python
+(KpiSearch) and in the browser (public/static/kpi_search.js, which
+shares the tokenizer and stemmer).
+
+  python3 kpi_search.py                                  # public/kpi_map.json → public/kpi_search.json
+  python3 kpi_search.py --query "which KPIs relate to prior auth denials" -k 5
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+
+from kpi_artifacts import publish_document
+
+SEARCH_FILE = "kpi_search.json"
+FORMAT = "kpi-search/1"
+
+# Term-frequency boost per field: a word in the name counts three times a word in a root cause
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "labels": 1.5,
+    "definition": 1.0,
+    "root_causes": 1.0,
+    "recommended_actions": 0.5
+}
+
+# Words that carry no meaning in KPI texts or assistant questions
+STOPWORDS = {
+    "a", "about", "all", "an", "and", "any", "are", "as", "at", "be", "by", "do", "does", "for", "from",
+    "how", "in", "is", "it", "kpi", "kpis", "me", "metric", "metrics", "my", "of", "on", "or", "our",
+    "relate", "related", "relates", "show", "that", "the", "their", "to", "us", "we", "what", "which",
+    "who", "with"
+}
+
+# Abbreviations used in KPI names, expanded before stemming so "Prior Auth" meets "Authorization"
+ABBREVIATIONS = {
+    "auth": "authorization",
+    "auths": "authorizations",
+    "appt": "appointment",
+    "appts": "appointments"
+}
+
+# (suffix, replacement), longest first; the first that leaves a stem of 3+ letters is applied
+SUFFIXES = [
+    ("ization", "ize"), ("ational", "ate"), ("fulness", "ful"), ("iveness", "ive"),
+    ("ation", "ate"), ("ment", ""), ("ness", ""), ("ing", ""), ("ed", ""), ("ly", ""), ("al", "")
+]
+
+# Query words this long or longer that are not in the index match the terms they prefix
+MIN_PREFIX = 3
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def stem(word):
+    """Light suffix-stripping stemmer: denials / denied → deni, authorization / authorized → authoriz"""
+    word = ABBREVIATIONS.get(word, word)
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            # submitted → submit, but keep "bill", "pass", "quizz"
+            if suffix in ("ing", "ed") and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+def tokenize(text):
+    """Stemmed terms of a text, in order, stopwords dropped"""
+    return [stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+def node_fields(node):
+    """The indexed texts of a node, by FIELD_WEIGHTS field"""
+    return {
+        "name": [node.get("name", "")],
+        "labels": [node.get(key) or "" for key in ("pillar", "macro_process", "category")],
+        "definition": [(node.get("context") or {}).get("definition", "")],
+        "root_causes": [cause.get("cause", "") for cause in node.get("root_causes") or []],
+        "recommended_actions": [action.get("action", "") for action in node.get("recommended_actions") or []]
+    }
+
+def build_search(data):
+    """Build the inverted index for a KPI document"""
+    nodes = data["nodes"]
+    frequencies = []
+    document_frequency = {}
+    for node in nodes:
+        tf = {}
+        for field, texts in node_fields(node).items():
+            for text in texts:
+                for term in tokenize(text):
+                    tf[term] = tf.get(term, 0.0) + FIELD_WEIGHTS[field]
+        frequencies.append(tf)
+        for term in tf:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    postings = {}
+    for doc, tf in enumerate(frequencies):
+        weights = {term: (1 + math.log(count)) * math.log(1 + len(nodes) / document_frequency[term])
+                   for term, count in tf.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        for term, weight in weights.items():
+            postings.setdefault(term, []).extend([doc, round(weight / norm, 4)])
+
+    return {
+        "format": FORMAT,
+        "version": data.get("version"),
+        "total_nodes": len(nodes),
+        "ids": [node["id"] for node in nodes],
+        "names": [node.get("name") for node in nodes],
+        "fields": FIELD_WEIGHTS,
+        "terms": dict(sorted(postings.items()))
+    }
+
+def write_search(data, out_dir="public"):
+    """Build the search index for `data` and publish it as <out_dir>/kpi_search.json"""
+    search = build_search(data)
+    publish_document(search, [os.path.join(out_dir, SEARCH_FILE)], indent=None, ensure_ascii=False)
+    return search
+
+class KpiSearch:
+    """Ranked KPI lookups backed by a kpi_search.json-shaped dict"""
+
+    def __init__(self, search):
+        self.search = search
+        self.ids = search["ids"]
+        self.names = search["names"]
+        self.terms = search["terms"]
+        self.vocabulary = sorted(self.terms)
+
+    @classmethod
+    def load(cls, path=os.path.join("public", SEARCH_FILE)):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def for_document(cls, data, path=os.path.join("public", SEARCH_FILE)):
+        """Use the published index when it was built for `data`'s version and node count, otherwise build one"""
+        if os.path.exists(path):
+            search = cls.load(path)
+            if (search.search.get("version") == data.get("version")
+                    and search.search.get("total_nodes") == len(data["nodes"])):
+                return search
+        return cls(build_search(data))
+
+    def expand(self, term):
+        """Index terms a query term matches: itself, or the terms it prefixes when it is not indexed"""
+        if term in self.terms:
+            return [term]
+        if len(term) < MIN_PREFIX:
+            return []
+        start = bisect.bisect_left(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + "\uffff")
+        return self.vocabulary[start:end]
+
+    def query(self, text, k=10):
+        """Top-k KPIs for a free-text query: [{id, name, score, terms}], best first"""
+        scores, matched = {}, {}
+        for term in dict.fromkeys(tokenize(text)):
+            # Per query term, a KPI scores its best-matching expansion
+            best = {}
+            for expansion in self.expand(term):
+                postings = self.terms[expansion]
+                for i in range(0, len(postings), 2):
+                    doc, weight = postings[i], postings[i + 1]
+                    if weight > best.get(doc, 0.0):
+                        best[doc] = weight
+            for doc, weight in best.items():
+                scores[doc] = scores.get(doc, 0.0) + weight
+                matched.setdefault(doc, []).append(term)
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [{"id": self.ids[doc], "name": self.names[doc], "score": round(score, 4), "terms": matched[doc]}
+                for doc, score in top]
+
+def main():
+    parser = argparse.ArgumentParser(description="Write or query the KPI full-text search index")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document to index")
+    parser.add_argument("--output", help="output file (default: next to the input)")
+    parser.add_argument("--query", help="search the index instead of writing it")
+    parser.add_argument("-k", type=int, default=10, help="results to show (default 10)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(os.path.dirname(args.input), SEARCH_FILE)
+    if args.query:
+        search = KpiSearch.load(output)
+        results = search.query(args.query, args.k)
+        print(f"🔎 {args.query!r} → {' '.join(tokenize(args.query))}")
+        for rank, result in enumerate(results, 1):
+            print(f"  {rank:>2}. {result['score']:.3f}  {result['id']:<12}{result['name']}  ({', '.join(result['terms'])})")
+        if not results:
+            print("  No matching KPIs")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    search = build_search(data)
+    publish_document(search, [output], indent=None, ensure_ascii=False)
+    postings = sum(len(entries) // 2 for entries in search["terms"].values())
+    print(f"✅ {output}: {len(search['terms']):,} terms, {postings:,} postings over {search['total_nodes']} KPIs "
+          f"({os.path.getsize(output):,} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+KPI Skeleton & Detail Shards
+Splits a KPI document into a compact tree skeleton plus per-pillar (or per-KPI)
+detail files, so dashboards can draw the tree at once and fetch a card's
+intelligence layers only when it is opened.
+
+Output next to the main document:
+  kpi_skeleton.json          tree + compact nodes (id, name, RAG, value, target, ...)
+  kpi_detail/manifest.json   KPI id → shard file
+  kpi_detail/<shard>.json    full 10-layer nodes
+"""
+
+import argparse
+import json
+import os
+import re
+
+from kpi_artifacts import publish_document
+
+SKELETON_FILE = "kpi_skeleton.json"
+DETAIL_DIR = "kpi_detail"
+MANIFEST_FILE = "manifest.json"
+
+# Node fields kept in the skeleton; everything else lives in the detail shards
+SKELETON_FIELDS = ["id", "name", "value", "target", "unit", "rag", "trend", "pillar", "macro_process", "category"]
+
+# Fields copied onto KPI leaves of the skeleton tree when the tree lacks them
+LEAF_FIELDS = ["value", "target", "unit", "rag"]
+
+def slugify(name):
+    """Turn a pillar name into a file-safe shard name"""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower().replace("&", "and")).strip("_")
+
+def _skeleton_tree(tree, nodes_by_id):
+    """Copy the tree, filling in RAG/value/target on KPI leaves from their nodes"""
+    copy = {key: value for key, value in tree.items() if key != "children"}
+    node = nodes_by_id.get(copy.get("id"))
+    if node is not None:
+        for field in LEAF_FIELDS:
+            if field not in copy and field in node:
+                copy[field] = node[field]
+    if "children" in tree:
+        copy["children"] = [_skeleton_tree(child, nodes_by_id) for child in tree["children"]]
+    return copy
+
+def build_skeleton(data):
+    """Build the compact skeleton document: header, tree and compact nodes"""
+    nodes_by_id = {node["id"]: node for node in data["nodes"]}
+    skeleton = {key: value for key, value in data.items() if key not in ("tree", "nodes")}
+    skeleton["tree"] = _skeleton_tree(data["tree"], nodes_by_id)
+    skeleton["nodes"] = [
+        {field: node[field] for field in SKELETON_FIELDS if field in node}
+        for node in data["nodes"]
+    ]
+    return skeleton
+
+def build_shards(data, shard_by="pillar"):
+    """Group full nodes into shards; returns {shard file name: {kpi id: node}}"""
+    if shard_by not in ("pillar", "kpi"):
+        raise ValueError(f"shard_by must be 'pillar' or 'kpi', not {shard_by!r}")
+
+    shards = {}
+    for node in data["nodes"]:
+        key = slugify(node.get("pillar", "unknown")) if shard_by == "pillar" else node["id"]
+        shards.setdefault(f"{key}.json", {})[node["id"]] = node
+    return shards
+
+def write_skeleton_and_shards(data, out_dir="public", shard_by="pillar", indent=None):
+    """Write the skeleton, detail shards and manifest for `data` under `out_dir`
+
+    Shard files left over from a previous build are removed. Returns the
+    manifest.
+    """
+    detail_dir = os.path.join(out_dir, DETAIL_DIR)
+    os.makedirs(detail_dir, exist_ok=True)
+
+    shards = build_shards(data, shard_by)
+    for shard_file, nodes in shards.items():
+        publish_document({"version": data.get("version"), "nodes": nodes},
+                         [os.path.join(detail_dir, shard_file)], indent, ensure_ascii=False)
+
+    for stale in os.listdir(detail_dir):
+        if stale.endswith(".json") and stale != MANIFEST_FILE and stale not in shards:
+            os.remove(os.path.join(detail_dir, stale))
+
+    manifest = {
+        "version": data.get("version"),
+        "skeleton": SKELETON_FILE,
+        "shard_by": shard_by,
+        "shards": sorted(shards),
+        "kpis": {kpi_id: f"{DETAIL_DIR}/{shard_file}" for shard_file, nodes in shards.items() for kpi_id in nodes}
+    }
+    publish_document(manifest, [os.path.join(detail_dir, MANIFEST_FILE)], indent, ensure_ascii=False)
+    publish_document(build_skeleton(data), [os.path.join(out_dir, SKELETON_FILE)], indent, ensure_ascii=False)
+
+    return manifest
+
+def load_kpi_detail(kpi_id, out_dir="public"):
+    """Load one KPI's full node through the manifest, reading only its shard"""
+    with open(os.path.join(out_dir, DETAIL_DIR, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    with open(os.path.join(out_dir, manifest["kpis"][kpi_id]), 'r', encoding='utf-8') as f:
+        return json.load(f)["nodes"][kpi_id]
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a KPI document into a tree skeleton and detail shards")
+    parser.add_argument("source", nargs="?", default="public/kpi_map.json")
+    parser.add_argument("--shard-by", choices=["pillar", "kpi"], default="pillar")
+    args = parser.parse_args()
+
+    with open(args.source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    manifest = write_skeleton_and_shards(data, os.path.dirname(args.source) or ".", args.shard_by)
+    print(f"✅ Wrote {SKELETON_FILE} and {len(manifest['shards'])} {args.shard_by} shards for {len(manifest['kpis'])} KPIs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+KPI Snapshot Store
+SQLite history of generated KPI documents: one row per KPI per snapshot,
+indexed on pillar, macro process, category, RAG status and owner (each
+paired with the snapshot, so "over the last N snapshots" stays an index
+range). Full nodes are stored once per distinct content in `node_bodies`,
+so unchanged KPIs cost one row, not another copy of their 10 layers.
+
+The generator records every run (--store, default kpi_snapshots.db); other
+documents can be recorded from the CLI. A run whose nodes are identical to
+the latest snapshot is not recorded again.
+
+  python3 kpi_store.py record public/kpi_map.json
+  python3 kpi_store.py snapshots
+  python3 kpi_store.py query --pillar RCM --rag red --last 12
+  python3 kpi_store.py history kpi_1_1_1 --last 12
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+
+DEFAULT_DB = "kpi_snapshots.db"
+SCHEMA_VERSION = 1
+
+# Rows inserted per executemany() call while recording
+RECORD_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    source TEXT,
+    version TEXT,
+    total_nodes INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS node_bodies (
+    hash TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS kpis (
+    snapshot INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    kpi_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT,
+    pillar TEXT,
+    macro_process TEXT,
+    category TEXT,
+    rag TEXT,
+    owner TEXT,
+    trend TEXT,
+    unit TEXT,
+    value REAL,
+    target REAL,
+    gap REAL,
+    gap_percentage REAL,
+    body TEXT NOT NULL REFERENCES node_bodies(hash),
+    PRIMARY KEY (snapshot, kpi_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS kpis_pillar ON kpis(pillar, snapshot);
+CREATE INDEX IF NOT EXISTS kpis_macro_process ON kpis(macro_process, snapshot);
+CREATE INDEX IF NOT EXISTS kpis_category ON kpis(category, snapshot);
+CREATE INDEX IF NOT EXISTS kpis_rag ON kpis(rag, snapshot);
+CREATE INDEX IF NOT EXISTS kpis_owner ON kpis(owner, snapshot);
+CREATE INDEX IF NOT EXISTS kpis_history ON kpis(kpi_id, snapshot);
+"""
+
+# Columns query() can filter on (each has an index)
+FILTERS = ["pillar", "macro_process", "category", "rag", "owner", "kpi_id"]
+
+# Columns returned by query()
+ROW_COLUMNS = ["snapshot", "created_at", "kpi_id", "name", "pillar", "macro_process", "category",
+               "rag", "owner", "trend", "unit", "value", "target", "gap", "gap_percentage"]
+
+OWNER_ROLE = "Primary Owner"
+
+def _number(value):
+    """Numeric value of a "245" / "5.2" / 245 field; None when it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _owner(node):
+    people = node.get("people_accountable") or []
+    for person in people:
+        if person.get("role") == OWNER_ROLE:
+            return person.get("name")
+    return people[0].get("name") if people else None
+
+class KpiStore:
+    """Snapshots of KPI documents in a SQLite database"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] == 0:
+            # WAL lets dashboards and scripts read while a run is being recorded
+            self.db.execute("PRAGMA journal_mode = WAL")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, nodes, version=None, source=None):
+        """Store `nodes` (any iterable) as a new snapshot; returns its id
+
+        When the nodes are identical to the latest snapshot's, nothing is
+        stored and the latest snapshot's id is returned.
+        """
+        latest = self.latest()
+        digest = hashlib.sha256()
+        total = 0
+        with self.db:
+            snapshot = self.db.execute(
+                "INSERT INTO snapshots (created_at, source, version, total_nodes, digest) VALUES (?, ?, ?, 0, '')",
+                (datetime.now().isoformat(timespec="seconds"), source, version)).lastrowid
+            rows, bodies = [], []
+            for position, node in enumerate(nodes):
+                body = json.dumps(node, ensure_ascii=False, separators=(",", ":"))
+                body_hash = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+                digest.update(body_hash.encode("ascii"))
+                bodies.append((body_hash, body))
+                rows.append((snapshot, node["id"], position, node.get("name"), node.get("pillar"),
+                             node.get("macro_process"), node.get("category"), node.get("rag"), _owner(node),
+                             node.get("trend"), node.get("unit"), _number(node.get("value")),
+                             _number(node.get("target")), _number(node.get("current_state", {}).get("gap")),
+                             _number(node.get("current_state", {}).get("gap_percentage")), body_hash))
+                if len(rows) >= RECORD_BATCH:
+                    self._insert(rows, bodies)
+                    total += len(rows)
+                    rows, bodies = [], []
+            self._insert(rows, bodies)
+            total += len(rows)
+
+            if latest is not None and latest["digest"] == digest.hexdigest() and latest["version"] == version:
+                self.db.execute("DELETE FROM snapshots WHERE id = ?", (snapshot,))
+                return latest["id"]
+            self.db.execute("UPDATE snapshots SET total_nodes = ?, digest = ? WHERE id = ?",
+                            (total, digest.hexdigest(), snapshot))
+        return snapshot
+
+    def _insert(self, rows, bodies):
+        self.db.executemany("INSERT OR IGNORE INTO node_bodies (hash, body) VALUES (?, ?)", bodies)
+        self.db.executemany(f"INSERT INTO kpis VALUES ({', '.join('?' * 16)})", rows)
+
+    def record_document(self, data, source=None):
+        """Store a parsed KPI document as a new snapshot; returns its id"""
+        return self.record(data["nodes"], data.get("version"), source)
+
+    def snapshots(self, last=None):
+        """Snapshot rows, newest first"""
+        sql = "SELECT * FROM snapshots ORDER BY id DESC"
+        if last is not None:
+            sql += f" LIMIT {int(last)}"
+        return [dict(row) for row in self.db.execute(sql)]
+
+    def latest(self):
+        snapshots = self.snapshots(1)
+        return snapshots[0] if snapshots else None
+
+    def query(self, last=None, snapshot=None, **filters):
+        """KPI rows matching every filter (see FILTERS), newest snapshot first
+
+        `snapshot` restricts the result to one snapshot and `last` to the most
+        recent N; by default every snapshot is searched.
+        """
+        where, params = [], []
+        for column, value in filters.items():
+            if column not in FILTERS:
+                raise ValueError(f"cannot filter on {column!r}; use one of {', '.join(FILTERS)}")
+            if value is not None:
+                where.append(f"k.{column} = ?")
+                params.append(value)
+        if snapshot is not None:
+            where.append("k.snapshot = ?")
+            params.append(snapshot)
+        elif last is not None:
+            where.append("k.snapshot >= (SELECT MIN(id) FROM (SELECT id FROM snapshots ORDER BY id DESC LIMIT ?))")
+            params.append(last)
+
+        columns = ", ".join("s.created_at" if column == "created_at" else f"k.{column}" for column in ROW_COLUMNS)
+        sql = f"SELECT {columns} FROM kpis k JOIN snapshots s ON s.id = k.snapshot"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY k.snapshot DESC, k.position"
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def history(self, kpi_id, last=None):
+        """One KPI's rows across snapshots, newest first"""
+        return self.query(last=last, kpi_id=kpi_id)
+
+    def node(self, kpi_id, snapshot=None):
+        """The full node of a KPI in one snapshot (default: the latest it appears in), or None"""
+        sql = "SELECT b.body FROM kpis k JOIN node_bodies b ON b.hash = k.body WHERE k.kpi_id = ?"
+        params = [kpi_id]
+        if snapshot is not None:
+            sql += " AND k.snapshot = ?"
+            params.append(snapshot)
+        row = self.db.execute(sql + " ORDER BY k.snapshot DESC LIMIT 1", params).fetchone()
+        return json.loads(row["body"]) if row else None
+
+    def distinct(self, column):
+        """Distinct values of a filter column across all snapshots"""
+        if column not in FILTERS:
+            raise ValueError(f"unknown column {column!r}")
+        return [row[0] for row in self.db.execute(f"SELECT DISTINCT {column} FROM kpis WHERE {column} IS NOT NULL ORDER BY 1")]
+
+    def prune(self, keep):
+        """Delete all but the newest `keep` snapshots and the node bodies only they used; returns snapshots deleted"""
+        with self.db:
+            deleted = self.db.execute(
+                "DELETE FROM snapshots WHERE id NOT IN (SELECT id FROM snapshots ORDER BY id DESC LIMIT ?)",
+                (keep,)).rowcount
+            self.db.execute("DELETE FROM node_bodies WHERE hash NOT IN (SELECT body FROM kpis)")
+        return deleted
+
+def resolve_name(value, names):
+    """Match a name given in full, case-insensitively or by initials ("RCM" → Revenue Cycle Management)"""
+    if value is None or value in names:
+        return value
+    for name in names:
+        if name.lower() == value.lower():
+            return name
+    for name in names:
+        initials = "".join(word[0] for word in name.replace("&", " ").split() if word[0].isalnum())
+        if initials.lower() == value.lower():
+            return name
+    return value
+
+def print_rows(rows, limit):
+    print(f"  {'snap':>4}  {'kpi':<12}{'rag':<7}{'value':>10}{'target':>10}  {'owner':<20}name")
+    for row in rows[:limit]:
+        value = f"{row['value']:g}" if row['value'] is not None else "-"
+        target = f"{row['target']:g}" if row['target'] is not None else "-"
+        print(f"  {row['snapshot']:>4}  {row['kpi_id']:<12}{row['rag'] or '-':<7}{value:>10}{target:>10}  "
+              f"{(row['owner'] or '-')[:19]:<20}{row['name']}")
+    if len(rows) > limit:
+        print(f"  … {len(rows) - limit} more")
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and query KPI snapshots in SQLite")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database file (default {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="store a KPI document as a new snapshot")
+    record.add_argument("document", nargs="?", default="public/kpi_map.json")
+    record.add_argument("--source", help="label stored with the snapshot (default: the document path)")
+
+    listing = commands.add_parser("snapshots", help="list snapshots, newest first")
+    listing.add_argument("--last", type=int, help="only the newest N")
+
+    query = commands.add_parser("query", help="KPI rows matching filters")
+    for column in FILTERS[:-1]:
+        query.add_argument(f"--{column.replace('_', '-')}", dest=column,
+                           help="pillars and macro processes also match by initials" if column == "pillar" else None)
+    query.add_argument("--last", type=int, help="search the newest N snapshots")
+    query.add_argument("--snapshot", type=int, help="search one snapshot")
+    query.add_argument("--limit", type=int, default=50, help="rows to print (default 50)")
+    query.add_argument("--json", action="store_true", help="print the rows as JSON")
+
+    history = commands.add_parser("history", help="one KPI across snapshots")
+    history.add_argument("kpi_id")
+    history.add_argument("--last", type=int)
+
+    prune = commands.add_parser("prune", help="keep only the newest N snapshots")
+    prune.add_argument("keep", type=int)
+    args = parser.parse_args()
+
+    with KpiStore(args.db) as store:
+        if args.command == "record":
+            with open(args.document, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            snapshot = store.record_document(data, args.source or args.document)
+            print(f"💾 {args.document} → snapshot {snapshot} in {args.db} ({len(data['nodes'])} KPIs)")
+
+        elif args.command == "snapshots":
+            for row in store.snapshots(args.last):
+                print(f"  {row['id']:>4}  {row['created_at']}  {row['total_nodes']:>6} KPIs  "
+                      f"{row['version'] or '-'}  ({row['source'] or '-'})")
+
+        elif args.command == "query":
+            filters = {column: getattr(args, column) for column in FILTERS[:-1]}
+            for column in ("pillar", "macro_process"):
+                filters[column] = resolve_name(filters[column], store.distinct(column))
+            if filters["rag"]:
+                filters["rag"] = filters["rag"].lower()
+            rows = store.query(last=args.last, snapshot=args.snapshot, **filters)
+            if args.json:
+                print(json.dumps(rows, indent=2, ensure_ascii=False))
+                return
+            shown = ", ".join(f"{column}={value}" for column, value in filters.items() if value is not None)
+            scope = f"snapshot {args.snapshot}" if args.snapshot else (f"last {args.last} snapshots" if args.last else "all snapshots")
+            print(f"🔎 {len(rows)} rows ({shown or 'no filters'}; {scope})")
+            print_rows(rows, args.limit)
+
+        elif args.command == "history":
+            rows = store.history(args.kpi_id, args.last)
+            print(f"📈 {args.kpi_id}: {len(rows)} snapshots")
+            print_rows(rows, len(rows))
+
+        elif args.command == "prune":
+            print(f"🧹 Removed {store.prune(args.keep)} snapshots from {args.db}")
+
+if __name__ == "__main__":
+    main()
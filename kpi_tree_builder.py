@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+KPI Tree Builder
+One O(n) grouping pass over `nodes` (pillar → macro process → category),
+from which every tree shape is built: the 4-level pillar tree, the 2-level
+pillar → KPI tree, or any custom depth. Shared by fix_pillar_structure.py,
+fix_tree_structure.py and create_simple_kpi_tree.py so their trees cannot
+drift apart.
+"""
+
+import argparse
+import json
+import os
+
+from kpi_artifacts import publish_document
+from kpi_derived import write_derived_artifacts
+from kpi_profiling import add_profiling_arguments, finish, profiler_from_args, stage
+from kpi_rollup import rollup_tree
+
+# Grouping levels under the root, outermost first
+LEVELS = ["pillar", "macro_process", "category"]
+
+# Value used when a node lacks a grouping field
+LEVEL_DEFAULTS = {"pillar": "Unknown", "macro_process": "General", "category": "General"}
+
+# Node type, index-style id prefix and slug-style id prefix for each level
+LEVEL_TYPES = ["pillar", "macro", "category"]
+INDEX_ID_PARTS = ["pillar", "macro", "cat"]
+SLUG_ID_PREFIXES = ["pillar", "macro", "cat"]
+
+ROOT_NAME = "NYSS Complete Operations"
+
+# 5 pillars in dashboard order, with their macro processes (exact names from data)
+PILLAR_STRUCTURE = {
+    "Patient Access & Intake": [
+        "Patient Acquisition",
+        "Scheduling & Appointment Mgmt",
+        "Intake Documentation",
+        "Clinical Pre-Visit Prep",
+        "Patient Experience"
+    ],
+    "Clinical Operations": [
+        "Provider Documentation",
+        "Clinical Workflow",
+        "Orders Management",
+        "Provider Performance",
+        "Care Quality & Safety"
+    ],
+    "Surgical Coordination": [
+        "Surgical Candidacy",
+        "Pre-Cert & Authorization",
+        "Surgical Scheduling",
+        "Post-Op Care",
+        "Surgical Billing"
+    ],
+    "Revenue Cycle Management": [
+        "Pre-Billing Readiness",
+        "Claim Creation",
+        "Payer Response",
+        "Appeals",
+        "AR & Cash Posting",
+        "Financial Performance"
+    ],
+    "Compliance & Risk Management": [
+        "Regulatory Compliance",
+        "Risk Management",
+        "Quality Assurance",
+        "Credentialing",
+        "Audit & Monitoring",
+        "Policy Management"
+    ]
+}
+
+PILLAR_ORDER = list(PILLAR_STRUCTURE)
+
+def pillar_order(with_macros=True):
+    """`order` argument for build_tree(): pillars (and their macro processes) in dashboard order"""
+    order = {(): PILLAR_ORDER}
+    if with_macros:
+        order.update({(pillar,): macros for pillar, macros in PILLAR_STRUCTURE.items()})
+    return order
+
+# Fields copied onto KPI leaves of the full pillar tree
+KPI_LEAF_FIELDS = ["value", "target", "unit", "rag"]
+
+class KpiGrouping:
+    """Positions of the nodes under every pillar / macro / category path, from a single pass
+
+    `members[path]` lists node positions in node order and `children[path]`
+    the child names in first-seen order, for every path prefix from the root
+    `()` down to `(pillar, macro, category)`.
+    """
+
+    def __init__(self, nodes, levels=LEVELS):
+        self.nodes = nodes
+        self.levels = levels
+        self.members = {(): []}
+        self.children = {(): []}
+        self._trees = {}
+
+        for position, node in enumerate(nodes):
+            path = ()
+            self.members[path].append(position)
+            for level in levels:
+                name = node.get(level) or LEVEL_DEFAULTS.get(level, "General")
+                child = path + (name,)
+                members = self.members.get(child)
+                if members is None:
+                    members = self.members[child] = []
+                    self.children[child] = []
+                    self.children[path].append(name)
+                members.append(position)
+                path = child
+
+    def kpis(self, path=()):
+        """Nodes under `path`, in node order"""
+        return [self.nodes[position] for position in self.members.get(tuple(path), [])]
+
+    def build_tree(self, depth=3, order=None, id_style="index", leaf_fields=KPI_LEAF_FIELDS,
+                   keep_empty=False):
+        """Build the children of the root node for one tree shape
+
+        depth       grouping levels above the KPIs: 3 = pillar → macro → category → KPI,
+                    1 = pillar → KPI, 0 = KPIs directly under the root
+        order       optional {path tuple: [child names]} fixing the order of a level;
+                    names not listed are left out and listed names with no KPIs
+                    are skipped, except that `keep_empty` keeps empty top-level nodes
+        id_style    "index" → pillar_1, pillar_1_macro_2, ... with a "type" field;
+                    "slug"  → pillar_<name>, macro_<name>, cat_<name> without one
+        leaf_fields node fields copied onto the KPI leaves
+
+        Results are cached per shape; treat them as read-only.
+        """
+        key = (depth, json.dumps(sorted(order.items()) if order else None), id_style,
+               tuple(leaf_fields), keep_empty)
+        if key not in self._trees:
+            with stage("tree build"):
+                self._trees[key] = self._build_level((), depth, order or {}, id_style, leaf_fields,
+                                                     keep_empty, "")
+        return self._trees[key]
+
+    def patch_tree(self, previous, affected, depth=3, order=None, id_style="index",
+                   leaf_fields=KPI_LEAF_FIELDS, keep_empty=False):
+        """Rebuild only the `affected` paths of a tree built earlier with the same shape
+
+        `previous` is the root's children from that build; subtrees whose path
+        is not in `affected` are reused as they are. Where the list of child
+        names under a path changed, that whole level is rebuilt, since index
+        ids depend on sibling positions. Returns (children, rebuilt paths),
+        outermost rebuilt paths only.
+        """
+        rebuilt = []
+        children = self._patch_level(previous, (), depth, order or {}, id_style, leaf_fields, keep_empty,
+                                     "", set(affected), rebuilt)
+        return children, rebuilt
+
+    def _patch_level(self, previous, path, remaining, order, id_style, leaf_fields, keep_empty, parent_id,
+                     affected, rebuilt):
+        names = [child.get("name") for child in previous]
+        if remaining == 0 or names != self._child_names(path, order, keep_empty):
+            rebuilt.append(path)
+            return self._build_level(path, remaining, order, id_style, leaf_fields, keep_empty, parent_id)
+
+        children = []
+        for child in previous:
+            child_path = path + (child["name"],)
+            if child_path in affected:
+                child = {**child, "children": self._patch_level(child["children"], child_path, remaining - 1,
+                                                                 order, id_style, leaf_fields, keep_empty,
+                                                                 child["id"], affected, rebuilt)}
+            children.append(child)
+        return children
+
+    def _child_names(self, path, order, keep_empty):
+        """Names of the tree nodes built under `path`, in order"""
+        return [name for name in order.get(path, self.children.get(path, []))
+                if path + (name,) in self.members or (keep_empty and not path)]
+
+    def _build_level(self, path, remaining, order, id_style, leaf_fields, keep_empty, parent_id):
+        if remaining == 0:
+            return [self._leaf(self.nodes[position], len(path) + 1, id_style, leaf_fields)
+                    for position in self.members.get(path, [])]
+
+        level_index = len(path)
+        children = []
+        for name in self._child_names(path, order, keep_empty):
+            child_path = path + (name,)
+            if id_style == "index":
+                node_id = f"{parent_id}_{INDEX_ID_PARTS[level_index]}_{len(children) + 1}".lstrip("_")
+                node = {"id": node_id, "name": name, "level": level_index + 1, "type": LEVEL_TYPES[level_index]}
+            else:
+                node_id = f"{SLUG_ID_PREFIXES[level_index]}_{name.replace(' ', '_').replace('&', 'and').lower()}"
+                node = {"name": name, "id": node_id, "level": level_index + 1}
+
+            node["children"] = self._build_level(child_path, remaining - 1, order, id_style, leaf_fields,
+                                                 keep_empty, node_id)
+            children.append(node)
+        return children
+
+    def _leaf(self, kpi, level, id_style, leaf_fields):
+        if id_style == "index":
+            leaf = {"id": kpi["id"], "name": kpi["name"], "level": level, "type": "kpi"}
+        else:
+            leaf = {"name": kpi["name"], "id": kpi["id"], "level": level}
+        for field in leaf_fields:
+            leaf[field] = kpi.get(field, "")
+        return leaf
+
+def build_root(children, name=ROOT_NAME):
+    """Wrap tree children in the typed root node used by the dashboards"""
+    return {
+        "id": "root",
+        "name": name,
+        "level": 0,
+        "type": "root",
+        "children": children
+    }
+
+_GROUPING_CACHE = {}
+
+def load_grouping(path='public/kpi_map.json'):
+    """Parse a KPI document and group its nodes, reusing the result while the file is unchanged
+
+    Returns (data, grouping). The cache is keyed by path, mtime and size, so
+    scripts and tools running in one process share a single parse and pass.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _GROUPING_CACHE:
+        with stage("catalog load"):
+            with open(path, 'r') as f:
+                data = json.load(f)
+        with stage("grouping"):
+            grouping = KpiGrouping(data['nodes'])
+        _GROUPING_CACHE.clear()
+        _GROUPING_CACHE[key] = (data, grouping)
+    return _GROUPING_CACHE[key]
+
+def main():
+    """Build the dashboard trees from one parse: 4-level for the complete files, 2-level for kpi_map.json"""
+    parser = argparse.ArgumentParser(description="Rebuild the dashboard KPI trees from public/kpi_map.json")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    profiler = profiler_from_args(args, "kpi_tree_builder")
+
+    data, grouping = load_grouping('public/kpi_map.json')
+    print(f"Total KPI nodes: {len(grouping.nodes)}")
+
+    full_tree = build_root(grouping.build_tree(3, pillar_order(), keep_empty=True))
+    simple_tree = build_root(grouping.build_tree(1, pillar_order(False), leaf_fields=KPI_LEAF_FIELDS + ["trend"]))
+    with stage("rollup"):
+        full_tree = rollup_tree(full_tree, grouping.nodes)
+        simple_tree = rollup_tree(simple_tree, grouping.nodes)
+
+    publish_document({**data, "tree": full_tree, "version": "1.0-nyss-complete-all-pillars-fixed"},
+                     ['public/complete_kpi_tree.json', 'public/kpi_map_complete.json'])
+    simple_data = {**data, "tree": simple_tree, "version": "1.0-nyss-simple-2level"}
+    publish_document(simple_data, ['public/kpi_map.json'])
+    written = write_derived_artifacts(simple_data, 'public')
+
+    print("\n✅ Trees rebuilt from a single grouping pass")
+    for pillar in full_tree['children']:
+        print(f"  • {pillar['name']}: {len(pillar['children'])} macros, {len(grouping.members.get((pillar['name'],), []))} KPIs")
+    print(f"📦 Skeleton + {len(written['shards']['shards'])} detail shards written to public/kpi_detail/")
+
+    finish(profiler, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+KPI Trend Engine
+Vectorized random-walk trend histories for every KPI in a catalog at once
+"""
+
+import numpy as np
+
+# Named history horizons (number of periods)
+HORIZONS = {
+    "6m": 6,            # monthly, the default card sparkline
+    "12m": 12,
+    "36m": 36,          # 3 years of monthly points
+    "3y-daily": 3 * 365,
+}
+
+def horizon_periods(horizon):
+    """Resolve a horizon name such as "36m" or a plain period count to a number of periods"""
+    if isinstance(horizon, int):
+        return horizon
+    if horizon in HORIZONS:
+        return HORIZONS[horizon]
+    return int(horizon)
+
+def generate_trend_matrix(n_kpis, periods=6, start=(70, 95), step=5, bounds=(0, 100),
+                          decimals=1, rng=None, dtype=np.float64):
+    """Generate random-walk trend histories as a (n_kpis, periods) matrix
+
+    Each history starts from a uniform draw in `start` and moves by a uniform
+    step in [-step, step] per period, clamped to `bounds` after every step
+    (pass bounds=None for an unbounded walk). This is the same walk as
+    generate_trend_data(), computed for all KPIs together: the loop runs over
+    periods, each iteration is one vector operation across every KPI.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    periods = horizon_periods(periods)
+
+    # Walk in (periods, n_kpis) layout so each period is a contiguous row
+    walk = rng.uniform(-step, step, size=(periods, n_kpis)).astype(dtype, copy=False)
+    if periods:
+        walk[0] += rng.uniform(start[0], start[1], size=n_kpis).astype(dtype, copy=False)
+
+    if bounds is None:
+        np.cumsum(walk, axis=0, out=walk)
+    else:
+        low, high = bounds
+        if periods:
+            np.clip(walk[0], low, high, out=walk[0])
+        for t in range(1, periods):
+            np.add(walk[t], walk[t - 1], out=walk[t])
+            np.clip(walk[t], low, high, out=walk[t])
+
+    if decimals is not None:
+        np.round(walk, decimals, out=walk)
+    return np.ascontiguousarray(walk.T)
+
+def iter_trend_rows(periods=6, total=None, chunk_cells=1 << 20, **kwargs):
+    """Yield one trend history (list of floats) per KPI, generated in vectorized batches
+
+    Batches hold about `chunk_cells` values so memory stays bounded for long
+    horizons. With `total=None` rows are produced until the caller stops.
+    Extra keyword arguments go to generate_trend_matrix().
+    """
+    periods = horizon_periods(periods)
+    chunk_rows = max(1, chunk_cells // max(1, periods))
+    produced = 0
+    while total is None or produced < total:
+        rows = chunk_rows if total is None else min(chunk_rows, total - produced)
+        yield from generate_trend_matrix(rows, periods, **kwargs).tolist()
+        produced += rows
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+KPI Document Validator
+Checks every node of a KPI document against the contract in
+KPI_DATA_STRUCTURE.md (identifier and categorization fields plus the 10
+intelligence layers) and reports every violation with its node id and field
+path, e.g. `predictive_insights.scenarios: expected list, got dict`.
+
+Nodes are read one at a time from a memory-mapped file using the
+kpi_reader.py scanner, so memory stays flat however large the document is.
+With --workers the node spans are validated in batches on a process pool.
+
+  python3 kpi_validator.py                                  # public/kpi_map.json
+  python3 kpi_validator.py --input big.json --workers 8 --report violations.json
+"""
+
+import argparse
+import itertools
+import json
+import mmap
+import multiprocessing
+import sys
+import time
+
+from kpi_reader import iter_document
+
+# Worker batches: node spans per pool task
+VALIDATE_BATCH = 512
+
+class Enum:
+    """A string from a fixed set"""
+
+    def __init__(self, *values):
+        self.values = values
+
+    def check(self, value, path, errors):
+        if value not in self.values:
+            errors.append((path, f"expected one of {', '.join(self.values)}, got {value!r}"))
+
+class AnyOf:
+    """Matches if any of the alternative schemas does"""
+
+    def __init__(self, *schemas, name):
+        self.schemas = schemas
+        self.name = name
+
+    def check(self, value, path, errors):
+        for schema in self.schemas:
+            attempt = []
+            _check(value, schema, path, attempt)
+            if not attempt:
+                return
+        errors.append((path, f"expected {self.name}, got {_type_name(value)}"))
+
+NUMBER = (int, float)
+RAG = Enum("green", "amber", "red")
+
+# `name: type` for plain values, {..} for objects (every key required; extra
+# keys are allowed) and [schema] for lists whose items match schema
+NODE_SCHEMA = {
+    # Basic identifiers and categorization
+    "id": str,
+    "name": str,
+    "value": str,
+    "target": str,
+    "unit": str,
+    "rag": RAG,
+    "trend": Enum("up", "down", "stable"),
+    "pillar": str,
+    "macro_process": str,
+    "category": str,
+    # Layers 1-10
+    "context": {
+        "definition": str,
+        "business_impact": str,
+        "industry_benchmark": str
+    },
+    "current_state": {
+        "status": RAG,
+        "value": str,
+        "target": str,
+        "gap": NUMBER,
+        "gap_percentage": NUMBER,
+        "financial_impact": str
+    },
+    "trend_data": [NUMBER],
+    "root_causes": [{
+        "cause": str,
+        "confidence": NUMBER,
+        "impact": str,
+        "data_points": int
+    }],
+    "predictive_insights": {
+        "pattern": str,
+        "confidence": NUMBER,
+        "timeframe": str,
+        "scenarios": [{"name": str, "value": NUMBER, "probability": str}],
+        "leading_indicators": [str]
+    },
+    "trend_analysis": {
+        "current_trend": str,
+        "trend_strength": str,
+        "volatility": str,
+        "key_insights": str
+    },
+    "dependencies": {
+        "upstream": [str],
+        "downstream": [str],
+        "peer_metrics": [str]
+    },
+    "people_accountable": [{
+        "name": str,
+        "title": str,
+        "department": str,
+        "email": str,
+        "role": str,
+        "avatar_color": str
+    }],
+    "recommended_actions": [{
+        "priority": str,
+        "action": str,
+        "timeline": str,
+        "owner": str,
+        "expected_impact": str,
+        "resources": str,
+        "success_metrics": str
+    }],
+    "contributing_factors": {
+        "internal": [AnyOf(str, {"factor": str, "impact": str}, name="factor string or {factor, impact}")],
+        "external": [AnyOf(str, {"factor": str, "impact": str}, name="factor string or {factor, impact}")]
+    }
+}
+
+def _type_name(value):
+    return {dict: "dict", list: "list", str: "str", bool: "bool", type(None): "null"}.get(type(value), type(value).__name__)
+
+def _check(value, schema, path, errors):
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            errors.append((path, f"expected dict, got {_type_name(value)}"))
+            return
+        for key, child in schema.items():
+            child_path = f"{path}.{key}" if path else key
+            if key not in value:
+                errors.append((child_path, "missing"))
+            else:
+                _check(value[key], child, child_path, errors)
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            errors.append((path, f"expected list, got {_type_name(value)}"))
+            return
+        item_schema = schema[0]
+        if isinstance(item_schema, (type, tuple)):
+            # Lists of plain values (long trend histories): one pass, itemized only on failure
+            types = item_schema if isinstance(item_schema, tuple) else (item_schema,)
+            if all(type(item) in types for item in value):
+                return
+        for i, item in enumerate(value):
+            _check(item, item_schema, f"{path}[{i}]", errors)
+    elif isinstance(schema, (Enum, AnyOf)):
+        schema.check(value, path, errors)
+    else:
+        types = schema if isinstance(schema, tuple) else (schema,)
+        if isinstance(value, bool) or not isinstance(value, types):
+            expected = "number" if schema is NUMBER else schema.__name__
+            errors.append((path, f"expected {expected}, got {_type_name(value)}"))
+
+def validate_node(node):
+    """[(field path, message)] for one node; empty when it meets the contract"""
+    errors = []
+    _check(node, NODE_SCHEMA, "", errors)
+    if not errors:
+        state = node["current_state"]
+        if state["status"] != node["rag"]:
+            errors.append(("current_state.status", f"{state['status']!r} differs from rag {node['rag']!r}"))
+        if state["value"] != node["value"] or state["target"] != node["target"]:
+            errors.append(("current_state", "value/target differ from the node's value/target"))
+    return errors
+
+def _violations(kpi_id, position, raw):
+    """Violation dicts for one node's JSON bytes"""
+    try:
+        node = json.loads(raw)
+    except ValueError as error:
+        return [{"id": kpi_id, "position": position, "path": "", "message": f"invalid JSON: {error}"}]
+    return [{"id": kpi_id, "position": position, "path": path, "message": message}
+            for path, message in validate_node(node)]
+
+_worker_buf = None
+
+def _open_worker(path):
+    global _worker_buf
+    f = open(path, 'rb')
+    _worker_buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _validate_batch(batch):
+    """Validate a batch of (kpi_id, position, start, end) spans in a pool worker"""
+    violations = []
+    for kpi_id, position, start, end in batch:
+        violations.extend(_violations(kpi_id, position, _worker_buf[start:end]))
+    return len(batch), violations
+
+def validate_document(path, workers=1):
+    """Validate every node of a KPI document; returns (node count, [violation dicts])"""
+    violations = []
+    seen = set()
+    nodes = 0
+    total_nodes = None
+
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            def spans():
+                nonlocal total_nodes
+                position = 0
+                for kind, name, start, end in iter_document(buf):
+                    if kind == "field":
+                        if name == "total_nodes":
+                            total_nodes = json.loads(buf[start:end])
+                        continue
+                    if name in seen:
+                        violations.append({"id": name, "position": position, "path": "id", "message": "duplicate id"})
+                    seen.add(name)
+                    yield name, position, start, end
+                    position += 1
+
+            if workers > 1:
+                span_iter = spans()
+                batches = iter(lambda: list(itertools.islice(span_iter, VALIDATE_BATCH)), [])
+                with multiprocessing.Pool(workers, initializer=_open_worker, initargs=(path,)) as pool:
+                    for count, batch_violations in pool.imap(_validate_batch, batches):
+                        nodes += count
+                        violations.extend(batch_violations)
+            else:
+                for kpi_id, position, start, end in spans():
+                    violations.extend(_violations(kpi_id, position, buf[start:end]))
+                    nodes += 1
+    except ValueError as error:
+        # Truncated or malformed JSON (or an empty file, which cannot be mapped); nodes read so far are reported
+        violations.append({"id": None, "position": None, "path": "document", "message": str(error)})
+        total_nodes = None
+
+    if total_nodes is not None and total_nodes != nodes:
+        violations.append({"id": None, "position": None, "path": "total_nodes",
+                           "message": f"total_nodes is {total_nodes} but the document has {nodes} nodes"})
+    violations.sort(key=lambda v: (v["position"] is None, v["position"] or 0))
+    return nodes, violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a KPI document against the 10-layer KPI contract")
+    parser.add_argument("--input", default="public/kpi_map.json", help="KPI document")
+    parser.add_argument("--workers", type=int, default=1, help="validate on a process pool of this size")
+    parser.add_argument("--report", metavar="FILE", help="also write every violation to a JSON file")
+    parser.add_argument("--show", type=int, default=20, help="violations to print (default 20)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    nodes, violations = validate_document(args.input, args.workers)
+    elapsed = time.perf_counter() - start
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({"input": args.input, "nodes": nodes, "violations": violations}, f, indent=2)
+
+    print(f"🔍 Validated {nodes:,} KPI nodes in {elapsed:.2f}s")
+    if not violations:
+        print("✅ Every node meets the 10-layer KPI contract")
+        return
+    bad_nodes = len({v["position"] for v in violations if v["position"] is not None})
+    print(f"❌ {len(violations):,} violations in {bad_nodes:,} nodes:")
+    for violation in violations[:args.show]:
+        print(f"  • {violation['id'] or '<document>'}: {violation['path'] or '<node>'}: {violation['message']}")
+    if len(violations) > args.show:
+        print(f"  … {len(violations) - args.show:,} more" + (f" (see {args.report})" if args.report else ""))
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
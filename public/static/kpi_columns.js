@@ -0,0 +1,45 @@
+// Reader for kpi_columns.bin (written by kpi_columns.py): typed-array views
+// over the value/target/gap/RAG/scenario/trend columns, no JSON number parsing.
+//
+//   const columns = await loadKpiColumns('kpi_columns.bin');
+//   columns.value[columns.row('kpi_1_1_1')];
+//   columns.trendRow(columns.row('kpi_1_1_1'));   // Float32Array of the history
+(function (global) {
+    'use strict';
+
+    const MAGIC = 'KPICOL1\0';
+    const ALIGNMENT = 8;
+    const TYPED_ARRAYS = { float32: Float32Array, float64: Float64Array, uint8: Uint8Array };
+
+    function readKpiColumns(buffer) {
+        const bytes = new Uint8Array(buffer);
+        if (String.fromCharCode(...bytes.subarray(0, MAGIC.length)) !== MAGIC) {
+            throw new Error('not a KPI columns file');
+        }
+        const headerLength = new DataView(buffer).getUint32(MAGIC.length, true);
+        const headerStart = MAGIC.length + 4;
+        const header = JSON.parse(new TextDecoder().decode(bytes.subarray(headerStart, headerStart + headerLength)));
+        const end = headerStart + headerLength;
+        const dataStart = end + ((ALIGNMENT - end % ALIGNMENT) % ALIGNMENT);
+
+        const columns = { header: header, ids: header.ids, count: header.count, periods: header.periods };
+        for (const [name, spec] of Object.entries(header.columns)) {
+            const length = spec.shape.reduce((a, b) => a * b, 1);
+            columns[name] = new TYPED_ARRAYS[spec.dtype](buffer, dataStart + spec.offset, length);
+        }
+
+        const rows = new Map(header.ids.map((id, row) => [id, row]));
+        columns.row = id => rows.get(id);
+        columns.trendRow = row => columns.trend.subarray(row * header.periods, (row + 1) * header.periods);
+        columns.ragName = row => header.rag_codes[columns.rag[row]];
+        return columns;
+    }
+
+    async function loadKpiColumns(url) {
+        const response = await fetch(url);
+        return readKpiColumns(await response.arrayBuffer());
+    }
+
+    global.readKpiColumns = readKpiColumns;
+    global.loadKpiColumns = loadKpiColumns;
+})(window);
@@ -0,0 +1,129 @@
+// Client for the KPI delta feed (kpi_delta.json, written by kpi_delta.py).
+// A page that kept an older copy of kpi_map.json brings it up to date by
+// applying the RFC 6902 deltas between builds instead of downloading the
+// whole document again.
+//
+//   const feed = await fetchKpiDeltaFeed();
+//   const data = await syncKpiDocument({ id, data: cachedData }, feed);   // null → load in full
+(function (global) {
+    'use strict';
+
+    const FORMAT = 'kpi-delta/1';
+
+    function tokens(pointer) {
+        if (pointer === '') return [];
+        return pointer.slice(1).split('/').map(token => token.replace(/~1/g, '/').replace(/~0/g, '~'));
+    }
+
+    function index(container, token, allowEnd) {
+        if (token === '-' && allowEnd) return container.length;
+        const i = Number(token);
+        if (!/^(0|[1-9][0-9]*)$/.test(token) || i > container.length || (i === container.length && !allowEnd)) {
+            throw new Error('bad array index ' + token);
+        }
+        return i;
+    }
+
+    function parent(doc, pointer) {
+        const path = tokens(pointer);
+        let container = doc;
+        for (const token of path.slice(0, -1)) {
+            container = Array.isArray(container) ? container[index(container, token)] : container[token];
+            if (container === undefined || container === null) throw new Error('path not found: ' + pointer);
+        }
+        return [container, path[path.length - 1]];
+    }
+
+    function get(doc, pointer) {
+        if (pointer === '') return doc;
+        const [container, token] = parent(doc, pointer);
+        const value = Array.isArray(container) ? container[index(container, token)] : container[token];
+        if (value === undefined) throw new Error('path not found: ' + pointer);
+        return value;
+    }
+
+    function add(doc, pointer, value) {
+        if (pointer === '') return value;
+        const [container, token] = parent(doc, pointer);
+        if (Array.isArray(container)) container.splice(index(container, token, true), 0, value);
+        else container[token] = value;
+        return doc;
+    }
+
+    function remove(doc, pointer) {
+        const [container, token] = parent(doc, pointer);
+        if (Array.isArray(container)) return container.splice(index(container, token), 1)[0];
+        if (!(token in container)) throw new Error('path not found: ' + pointer);
+        const value = container[token];
+        delete container[token];
+        return value;
+    }
+
+    function replace(doc, pointer, value) {
+        if (pointer === '') return value;
+        const [container, token] = parent(doc, pointer);
+        if (Array.isArray(container)) container[index(container, token)] = value;
+        else if (token in container) container[token] = value;
+        else throw new Error('path not found: ' + pointer);
+        return doc;
+    }
+
+    // Apply RFC 6902 operations to `doc` in place; returns the patched document
+    function applyKpiPatch(doc, ops) {
+        const clone = value => JSON.parse(JSON.stringify(value));
+        for (const op of ops) {
+            switch (op.op) {
+                case 'add': doc = add(doc, op.path, clone(op.value)); break;
+                case 'remove': remove(doc, op.path); break;
+                case 'replace': doc = replace(doc, op.path, clone(op.value)); break;
+                case 'move': doc = add(doc, op.path, remove(doc, op.from)); break;
+                case 'copy': doc = add(doc, op.path, clone(get(doc, op.from))); break;
+                case 'test':
+                    if (JSON.stringify(get(doc, op.path)) !== JSON.stringify(op.value)) {
+                        throw new Error('test failed at ' + op.path);
+                    }
+                    break;
+                default: throw new Error('unknown operation ' + op.op);
+            }
+        }
+        return doc;
+    }
+
+    async function fetchKpiDeltaFeed(url = 'kpi_delta.json') {
+        const response = await fetch(url, { cache: 'no-cache' });
+        if (!response.ok) return null;
+        const feed = await response.json();
+        return feed.format === FORMAT && feed.latest ? feed : null;
+    }
+
+    // Feed entries leading from snapshot `id` to the latest one, or null
+    function deltaChain(feed, id) {
+        const byFrom = new Map(feed.deltas.map(entry => [entry.from, entry]));
+        const chain = [];
+        while (id !== feed.latest.id) {
+            const entry = byFrom.get(id);
+            if (!entry || chain.length > feed.deltas.length) return null;
+            chain.push(entry);
+            id = entry.to;
+        }
+        return chain;
+    }
+
+    // Bring `cached` ({id, data}) up to the feed's latest snapshot; null when it cannot be
+    async function syncKpiDocument(cached, feed) {
+        if (!cached || !feed) return null;
+        const chain = deltaChain(feed, cached.id);
+        if (!chain) return null;
+        let data = cached.data;
+        for (const entry of chain) {
+            const response = await fetch(entry.path);
+            if (!response.ok) return null;
+            data = applyKpiPatch(data, (await response.json()).ops);
+        }
+        return data;
+    }
+
+    global.applyKpiPatch = applyKpiPatch;
+    global.fetchKpiDeltaFeed = fetchKpiDeltaFeed;
+    global.syncKpiDocument = syncKpiDocument;
+})(window);
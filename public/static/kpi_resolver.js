@@ -0,0 +1,75 @@
+// Resolver for kpi_map_normalized.json (written by kpi_normalized.py).
+// Shared blocks live once in `tables`; nodes refer to them by position.
+// resolveKpiDocument() rebuilds the full kpi_map.json view, so pages can load
+// the smaller normalized file and keep using the usual node fields.
+(function (global) {
+    'use strict';
+
+    const FORMAT = 'kpi-normalized/1';
+    const TEMPLATED_TEXTS = [
+        ['context', 'definition'],
+        ['context', 'business_impact'],
+        ['context', 'industry_benchmark'],
+        ['trend_analysis', 'key_insights']
+    ];
+
+    function templateFields(node) {
+        const fields = {};
+        for (const [key, value] of Object.entries(node)) {
+            if (typeof value === 'string') fields[key] = value;
+        }
+        fields.name_lower = node.name.toLowerCase();
+        return fields;
+    }
+
+    function render(template, fields) {
+        return template.replace(/\{(\w+)\}/g, (match, key) => fields[key]);
+    }
+
+    function resolveKpiNode(node, tables) {
+        const resolved = Object.assign({}, node);
+        const fields = templateFields(node);
+        for (const [section, key] of TEMPLATED_TEXTS) {
+            const text = node[section][key];
+            if (typeof text === 'number') {
+                resolved[section] = Object.assign({}, resolved[section], { [key]: render(tables.templates[text], fields) });
+            }
+        }
+        resolved.root_causes = node.root_causes.map(([ref, confidence, dataPoints]) => ({
+            cause: tables.causes[ref].cause,
+            confidence: confidence,
+            impact: tables.causes[ref].impact,
+            data_points: dataPoints
+        }));
+        resolved.predictive_insights = Object.assign({}, node.predictive_insights, {
+            scenarios: node.predictive_insights.scenarios.map(([ref, value, probability]) => ({
+                name: tables.scenarios[ref], value: value, probability: probability
+            })),
+            leading_indicators: node.predictive_insights.leading_indicators.map(ref => tables.indicators[ref])
+        });
+        resolved.dependencies = tables.dependencies[node.dependencies];
+        resolved.people_accountable = node.people_accountable.map(ref => tables.people[ref]);
+        resolved.recommended_actions = tables.actions[node.recommended_actions];
+        resolved.contributing_factors = {};
+        for (const [side, refs] of Object.entries(node.contributing_factors)) {
+            resolved.contributing_factors[side] = refs.map(ref => tables.factors[ref]);
+        }
+        return resolved;
+    }
+
+    // Full document from a normalized one; shared blocks are shared objects, so treat them as read-only
+    function resolveKpiDocument(normalized) {
+        if (normalized.format !== FORMAT) {
+            throw new Error('not a ' + FORMAT + ' document');
+        }
+        const data = {};
+        for (const [key, value] of Object.entries(normalized)) {
+            if (key === 'format' || key === 'tables') continue;
+            data[key] = key === 'nodes' ? value.map(node => resolveKpiNode(node, normalized.tables)) : value;
+        }
+        return data;
+    }
+
+    global.resolveKpiNode = resolveKpiNode;
+    global.resolveKpiDocument = resolveKpiDocument;
+})(window);
@@ -0,0 +1,41 @@
+// RAG / gap / impact rollups precomputed on every interior tree node by
+// kpi_rollup.py: summary tiles read `tree.rollup` instead of filtering every
+// node on each render, and a KPI whose status changes in the page moves one
+// count on each of its ancestors rather than triggering a recount.
+//
+//   const rollup = kpiTreeRollup(kpiData);        // {kpis, rag: {red, amber, green}, worst, ...}
+//   moveRollupRag(ancestorRollups, 'amber', 'red');
+(function (global) {
+    'use strict';
+
+    // Worst first, as in kpi_rollup.py
+    const RAG_LEVELS = ['red', 'amber', 'green'];
+
+    function worstOf(rag) {
+        return RAG_LEVELS.find(level => rag[level] > 0) || null;
+    }
+
+    // The root rollup of a document; counted in one pass over the nodes for documents built without rollups
+    function kpiTreeRollup(data) {
+        if (data.tree && data.tree.rollup) return data.tree.rollup;
+        const rag = { red: 0, amber: 0, green: 0 };
+        for (const node of data.nodes) {
+            if (node.rag in rag) rag[node.rag]++;
+        }
+        return { kpis: data.nodes.length, rag: rag, worst: worstOf(rag) };
+    }
+
+    // Move one KPI from one RAG level to another in each of the given rollups (its ancestors')
+    function moveRollupRag(rollups, from, to) {
+        if (from === to) return;
+        for (const rollup of rollups) {
+            if (!rollup) continue;
+            if (from in rollup.rag) rollup.rag[from]--;
+            if (to in rollup.rag) rollup.rag[to]++;
+            rollup.worst = worstOf(rollup.rag);
+        }
+    }
+
+    global.kpiTreeRollup = kpiTreeRollup;
+    global.moveRollupRag = moveRollupRag;
+})(window);
@@ -0,0 +1,104 @@
+// Ranked KPI lookups over kpi_search.json (written by kpi_search.py): a query
+// is tokenized and stemmed exactly as the build did, then answered from the
+// postings of its terms instead of scanning every node's texts.
+//
+//   const search = await loadKpiSearch('kpi_search.json');
+//   search.query('which KPIs relate to prior auth denials', 5);   // [{id, name, score, terms}]
+(function (global) {
+    'use strict';
+
+    const FORMAT = 'kpi-search/1';
+
+    // Keep in step with kpi_search.py
+    const STOPWORDS = new Set([
+        'a', 'about', 'all', 'an', 'and', 'any', 'are', 'as', 'at', 'be', 'by', 'do', 'does', 'for', 'from',
+        'how', 'in', 'is', 'it', 'kpi', 'kpis', 'me', 'metric', 'metrics', 'my', 'of', 'on', 'or', 'our',
+        'relate', 'related', 'relates', 'show', 'that', 'the', 'their', 'to', 'us', 'we', 'what', 'which',
+        'who', 'with'
+    ]);
+    const ABBREVIATIONS = { auth: 'authorization', auths: 'authorizations', appt: 'appointment', appts: 'appointments' };
+    const SUFFIXES = [
+        ['ization', 'ize'], ['ational', 'ate'], ['fulness', 'ful'], ['iveness', 'ive'],
+        ['ation', 'ate'], ['ment', ''], ['ness', ''], ['ing', ''], ['ed', ''], ['ly', ''], ['al', '']
+    ];
+    const MIN_PREFIX = 3;
+
+    function stem(word) {
+        word = ABBREVIATIONS[word] || word;
+        if (word.length <= 3 || /^[0-9]+$/.test(word)) return word;
+        if (word.endsWith('ies') && word.length > 4) word = word.slice(0, -3) + 'y';
+        else if (word.endsWith('sses')) word = word.slice(0, -2);
+        else if (word.endsWith('s') && !/(ss|us|is)$/.test(word)) word = word.slice(0, -1);
+        for (const [suffix, replacement] of SUFFIXES) {
+            if (word.endsWith(suffix) && word.length - suffix.length >= 3) {
+                word = word.slice(0, -suffix.length) + replacement;
+                const last = word[word.length - 1];
+                if ((suffix === 'ing' || suffix === 'ed') && last === word[word.length - 2] && !'lsz'.includes(last)) {
+                    word = word.slice(0, -1);
+                }
+                break;
+            }
+        }
+        if (word.endsWith('e') && word.length > 4) word = word.slice(0, -1);
+        return word;
+    }
+
+    function tokenizeKpiText(text) {
+        return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(word => !STOPWORDS.has(word)).map(stem);
+    }
+
+    function readKpiSearch(index) {
+        if (index.format !== FORMAT) throw new Error('not a KPI search index');
+        const vocabulary = Object.keys(index.terms).sort();
+
+        // The term itself, or the indexed terms it prefixes (binary search over the sorted vocabulary)
+        function expand(term) {
+            if (Object.prototype.hasOwnProperty.call(index.terms, term)) return [term];
+            if (term.length < MIN_PREFIX) return [];
+            let low = 0, high = vocabulary.length;
+            while (low < high) {
+                const mid = (low + high) >> 1;
+                if (vocabulary[mid] < term) low = mid + 1; else high = mid;
+            }
+            const terms = [];
+            for (let i = low; i < vocabulary.length && vocabulary[i].startsWith(term); i++) terms.push(vocabulary[i]);
+            return terms;
+        }
+
+        function query(text, k = 10) {
+            const scores = new Map(), matched = new Map();
+            for (const term of new Set(tokenizeKpiText(text))) {
+                const best = new Map();
+                for (const expansion of expand(term)) {
+                    const postings = index.terms[expansion];
+                    for (let i = 0; i < postings.length; i += 2) {
+                        if (postings[i + 1] > (best.get(postings[i]) || 0)) best.set(postings[i], postings[i + 1]);
+                    }
+                }
+                for (const [doc, weight] of best) {
+                    scores.set(doc, (scores.get(doc) || 0) + weight);
+                    if (!matched.has(doc)) matched.set(doc, []);
+                    matched.get(doc).push(term);
+                }
+            }
+            return [...scores]
+                .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+                .slice(0, k)
+                .map(([doc, score]) => ({
+                    id: index.ids[doc], name: index.names[doc], score: Math.round(score * 1e4) / 1e4, terms: matched.get(doc)
+                }));
+        }
+
+        return { index: index, expand: expand, query: query };
+    }
+
+    async function loadKpiSearch(url = 'kpi_search.json') {
+        const response = await fetch(url);
+        if (!response.ok) return null;
+        return readKpiSearch(await response.json());
+    }
+
+    global.tokenizeKpiText = tokenizeKpiText;
+    global.readKpiSearch = readKpiSearch;
+    global.loadKpiSearch = loadKpiSearch;
+})(window);
@@ -0,0 +1,20 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+KPI_MAP = os.path.join(ROOT, "public", "kpi_map.json")
+
+@pytest.fixture(scope="session")
+def kpi_map_text():
+    with open(KPI_MAP, 'r', encoding='utf-8') as f:
+        return f.read()
+
+@pytest.fixture
+def kpi_map(kpi_map_text):
+    """A fresh copy of the committed public/kpi_map.json"""
+    return json.loads(kpi_map_text)
@@ -0,0 +1,144 @@
+import copy
+import json
+import os
+
+import pytest
+
+from kpi_delta import (DELTA_DIR, apply_patch, canonical, compose, compose_deltas, diff, load_feed, snapshot_id,
+                       write_delta)
+
+def _with_key_at(node, position, key, value):
+    items = list(node.items())
+    items.insert(position, (key, value))
+    return dict(items)
+
+def _delta(out_dir, entry):
+    with open(out_dir / entry["path"], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_diff_apply_round_trip(kpi_map):
+    new = copy.deepcopy(kpi_map)
+    new["version"] = "next"
+    new["nodes"][0]["value"] = "99"
+    new["nodes"][5]["current_state"]["gap"] = 1.5
+    del new["nodes"][7]
+    new["nodes"].insert(2, {**copy.deepcopy(new["nodes"][3]), "id": "kpi_new"})
+
+    ops = diff(kpi_map, new)
+    assert apply_patch(kpi_map, ops) == new
+    assert {"op": "replace", "path": "/nodes/0/value", "value": "99"} in ops
+
+def test_diff_of_equal_documents_is_empty(kpi_map):
+    assert diff(kpi_map, copy.deepcopy(kpi_map)) == []
+
+def test_apply_patch_leaves_input_untouched(kpi_map):
+    before = copy.deepcopy(kpi_map)
+    apply_patch(kpi_map, [{"op": "replace", "path": "/version", "value": "x"}])
+    assert kpi_map == before
+
+@pytest.mark.parametrize("ops", [
+    [{"op": "remove", "path": "/missing"}],
+    [{"op": "replace", "path": "/nodes/100000/value", "value": 1}],
+    [{"op": "test", "path": "/version", "value": "not the version"}],
+    [{"op": "move", "from": "/tree", "path": "/tree/children/0"}],
+])
+def test_apply_patch_rejects_invalid_ops(kpi_map, ops):
+    with pytest.raises(ValueError):
+        apply_patch(kpi_map, ops)
+
+def test_apply_patch_all_operations():
+    doc = {"a": [1, 2], "b": {"c": 1}}
+    ops = [
+        {"op": "add", "path": "/a/-", "value": 3},
+        {"op": "copy", "from": "/b", "path": "/d"},
+        {"op": "move", "from": "/b/c", "path": "/e"},
+        {"op": "test", "path": "/e", "value": 1},
+        {"op": "remove", "path": "/a/0"},
+    ]
+    assert apply_patch(doc, ops) == {"a": [2, 3], "b": {}, "d": {"c": 1}, "e": 1}
+
+def test_compose_matches_sequential_application(kpi_map):
+    second = copy.deepcopy(kpi_map)
+    second["nodes"][0]["value"] = "1"
+    second["nodes"][1]["rag"] = "red"
+    third = copy.deepcopy(second)
+    third["nodes"][0]["value"] = "2"
+    del third["nodes"][4]
+
+    composed = compose(diff(kpi_map, second), diff(second, third))
+    assert apply_patch(kpi_map, composed) == third
+
+def test_compose_drops_overwritten_replaces(kpi_map):
+    second = copy.deepcopy(kpi_map)
+    second["nodes"][0]["value"] = "1"
+    third = copy.deepcopy(second)
+    third["nodes"][0]["value"] = "2"
+
+    composed = compose(diff(kpi_map, second), diff(second, third))
+    assert composed == [{"op": "replace", "path": "/nodes/0/value", "value": "2"}]
+
+def test_compose_deltas_rejects_broken_chain():
+    with pytest.raises(ValueError):
+        compose_deltas([{"from": {"id": "a"}, "to": {"id": "b"}, "ops": []},
+                        {"from": {"id": "c"}, "to": {"id": "d"}, "ops": []}])
+
+def test_snapshot_id_ignores_key_order():
+    assert snapshot_id(canonical({"a": 1, "b": 2})) == snapshot_id(canonical({"b": 2, "a": 1}))
+    assert snapshot_id(canonical({"a": 1})) != snapshot_id(canonical({"a": 2}))
+
+def test_write_delta_feed(kpi_map, tmp_path):
+    assert write_delta(kpi_map, tmp_path) is None
+    assert load_feed(tmp_path)["latest"]["id"] == snapshot_id(canonical(kpi_map))
+    assert write_delta(copy.deepcopy(kpi_map), tmp_path) is None
+
+    new = copy.deepcopy(kpi_map)
+    new["nodes"][0]["value"] = "123"
+    entry = write_delta(new, tmp_path)
+    feed = load_feed(tmp_path)
+    assert feed["latest"]["id"] == entry["to"] == snapshot_id(canonical(new))
+    assert feed["deltas"] == [entry]
+    assert apply_patch(kpi_map, _delta(tmp_path, entry)["ops"]) == new
+
+def test_added_key_chain_applies(kpi_map, tmp_path):
+    """A key a delta inserts mid-object lands last, yet the next delta of the chain still applies"""
+    write_delta(kpi_map, tmp_path)
+    second = copy.deepcopy(kpi_map)
+    second["nodes"][3] = _with_key_at(second["nodes"][3], 2, "owner_note", "new")
+    first_entry = write_delta(second, tmp_path)
+    third = copy.deepcopy(second)
+    third["nodes"][3]["owner_note"] = "changed"
+    second_entry = write_delta(third, tmp_path)
+
+    patched = apply_patch(kpi_map, _delta(tmp_path, first_entry)["ops"])
+    assert list(patched["nodes"][3]) != list(second["nodes"][3])
+    assert snapshot_id(canonical(patched)) == first_entry["to"] == second_entry["from"]
+
+    patched = apply_patch(patched, _delta(tmp_path, second_entry)["ops"])
+    assert snapshot_id(canonical(patched)) == second_entry["to"]
+    assert patched == third
+
+def test_feed_prunes_old_deltas(kpi_map, tmp_path):
+    write_delta(kpi_map, tmp_path, keep=2)
+    for value in ("1", "2", "3"):
+        new = copy.deepcopy(kpi_map)
+        new["nodes"][0]["value"] = value
+        write_delta(new, tmp_path, keep=2)
+    feed = load_feed(tmp_path)
+    assert len(feed["deltas"]) == 2
+    assert sorted(p.name for p in (tmp_path / DELTA_DIR).iterdir()) == sorted(
+        entry["path"].split("/")[-1] for entry in feed["deltas"])
+
+def test_snapshot_is_kept_outside_the_published_directory(kpi_map, tmp_path):
+    public = tmp_path / "public"
+    public.mkdir()
+    write_delta(kpi_map, public)
+    assert not any(name.endswith(".snapshot") for name in os.listdir(public))
+    assert (tmp_path / ".kpi_state" / "public" / "kpi_map.json.snapshot").exists()
+
+def test_legacy_snapshot_continues_the_chain(kpi_map, tmp_path):
+    (tmp_path / "kpi_map.json.snapshot").write_bytes(canonical(kpi_map))
+    new = copy.deepcopy(kpi_map)
+    new["nodes"][0]["value"] = "5"
+    entry = write_delta(new, tmp_path)
+    assert entry["from"] == snapshot_id(canonical(kpi_map))
+    assert not (tmp_path / "kpi_map.json.snapshot").exists()
@@ -0,0 +1,71 @@
+import copy
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import KPI_MAP, ROOT
+from kpi_artifacts import publish_document
+
+OUTPUTS = ["kpi_map.json", "complete_kpi_tree.json", "kpi_map_complete.json", "kpi_index.json", "kpi_skeleton.json"]
+
+def _run(script, cwd, *args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, script), *args], cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout
+
+def _change_value(data):
+    data["nodes"][0]["value"] = "1"
+    data["nodes"][0]["current_state"]["value"] = "1"
+
+def _change_rag(data):
+    data["nodes"][10]["rag"] = "red" if data["nodes"][10]["rag"] != "red" else "green"
+
+def _move_category(data):
+    data["nodes"][20]["category"] = data["nodes"][40]["category"]
+    data["nodes"][20]["macro_process"] = data["nodes"][40]["macro_process"]
+    data["nodes"][20]["pillar"] = data["nodes"][40]["pillar"]
+
+def _remove_node(data):
+    del data["nodes"][30]
+
+def _add_node(data):
+    data["nodes"].append({**copy.deepcopy(data["nodes"][50]), "id": "kpi_9_9_9", "name": "Added KPI"})
+
+@pytest.mark.parametrize("script", ["fix_pillar_structure.py", "fix_tree_structure.py"])
+@pytest.mark.parametrize("edit", [_change_value, _change_rag, _move_category, _remove_node, _add_node])
+def test_incremental_matches_full_rebuild(tmp_path, script, edit):
+    incremental, full = tmp_path / "incremental", tmp_path / "full"
+    os.makedirs(incremental / "public")
+    shutil.copyfile(KPI_MAP, incremental / "public" / "kpi_map.json")
+    _run(script, incremental, "--incremental")
+
+    document = incremental / "public" / "kpi_map.json"
+    with open(document, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    edit(data)
+    publish_document(data, [str(document)])
+    shutil.copytree(incremental, full)
+
+    assert "Incremental rebuild" in _run(script, incremental, "--incremental")
+    _run(script, full)
+    for name in OUTPUTS:
+        assert (incremental / "public" / name).read_bytes() == (full / "public" / name).read_bytes(), name
+
+def test_unchanged_document_is_not_rewritten(tmp_path):
+    os.makedirs(tmp_path / "public")
+    shutil.copyfile(KPI_MAP, tmp_path / "public" / "kpi_map.json")
+    _run("fix_pillar_structure.py", tmp_path, "--incremental")
+    mtime = os.stat(tmp_path / "public" / "kpi_map.json").st_mtime_ns
+    assert "already up to date" in _run("fix_pillar_structure.py", tmp_path, "--incremental")
+    assert os.stat(tmp_path / "public" / "kpi_map.json").st_mtime_ns == mtime
+
+def test_state_is_kept_outside_public(tmp_path):
+    os.makedirs(tmp_path / "public")
+    shutil.copyfile(KPI_MAP, tmp_path / "public" / "kpi_map.json")
+    (tmp_path / "public" / "kpi_map.json.tree-state").write_text("{}")
+    _run("fix_pillar_structure.py", tmp_path, "--incremental")
+    assert (tmp_path / ".kpi_state" / "public" / "kpi_map.json.tree-state").exists()
+    assert not any(name.endswith((".tree-state", ".snapshot", ".offsets")) for name in os.listdir(tmp_path / "public"))
@@ -0,0 +1,68 @@
+import pytest
+
+from generate_complete_nyss_kpis import all_kpis, generate_nodes, synthetic_catalog
+from kpi_rag import KPI_RULES, RULES, classify, rag_names, rag_status, rule_for, rules_digest
+
+def test_every_catalog_kpi_has_a_rule():
+    catalog_ids = [row[4] for row in all_kpis]
+    assert list(KPI_RULES) == catalog_ids
+    assert set(KPI_RULES.values()) <= set(RULES)
+
+def test_unknown_kpi_raises():
+    with pytest.raises(ValueError, match="no RAG rule"):
+        rule_for("kpi_9_9_9")
+
+@pytest.mark.parametrize("kpi_id, value, target, status", [
+    ("kpi_1_1_1", 280, 280, "green"),   # New Patient Lead Volume: higher is better
+    ("kpi_1_1_1", 250, 280, "amber"),
+    ("kpi_1_1_1", 200, 280, "red"),
+    ("kpi_4_6_4", 30, 35, "green"),     # Days in AR: lower is better
+    ("kpi_4_6_4", 39, 35, "amber"),
+    ("kpi_4_6_4", 45, 35, "red"),
+    ("kpi_1_2_8", 8, 10, "green"),      # No-Show Rate
+    ("kpi_1_2_8", 12, 10, "red"),
+    ("kpi_1_2_5", 15, 15, "green"),     # In-clinic wait: green only at or under target
+    ("kpi_1_2_5", 15.5, 15, "amber"),
+    ("kpi_1_2_5", 18, 15, "red"),
+])
+def test_rag_status_follows_kpi_direction(kpi_id, value, target, status):
+    assert rag_status(kpi_id, value, target) == status
+
+def test_lower_is_better_kpis_are_not_scored_as_higher():
+    # A value far under target is the best case for these KPIs, never red
+    for kpi_id, name in KPI_RULES.items():
+        if RULES[name].direction == "lower":
+            assert rag_status(kpi_id, 1, 100) == "green", kpi_id
+            assert rag_status(kpi_id, 200, 100) == "red", kpi_id
+
+def test_synthetic_sites_follow_their_base_kpi():
+    assert rule_for("kpi_4_6_4_site3") is rule_for("kpi_4_6_4")
+
+def test_generated_nodes_use_their_kpi_rule():
+    for node in generate_nodes(all_kpis, progress_every=0, seed=1):
+        assert node["rag"] == rag_status(node["id"], float(node["value"]), float(node["target"])), node["id"]
+
+def test_generated_synthetic_nodes_use_their_base_rule():
+    for node in generate_nodes(list(synthetic_catalog(2 * len(all_kpis))), progress_every=0, seed=1):
+        assert node["rag"] == rag_status(node["id"], float(node["value"]), float(node["target"])), node["id"]
+
+def test_classify_matches_rag_status():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    ids = list(KPI_RULES)
+    targets = rng.uniform(1, 100, len(ids))
+    values = targets * rng.uniform(0.5, 1.5, len(ids))
+    codes = classify(values, targets, [rule_for(kpi_id) for kpi_id in ids])
+    assert rag_names(codes) == [rag_status(kpi_id, value, target) for kpi_id, value, target in zip(ids, values, targets)]
+
+def test_classify_timeline_and_missing_values():
+    np = pytest.importorskip("numpy")
+    rules = [rule_for("kpi_1_1_1"), rule_for("kpi_4_6_4")]
+    trends = np.array([[280.0, 250.0, np.nan], [30.0, 39.0, 45.0]])
+    codes = classify(trends, [280, 35], rules)
+    assert [rag_names(row) for row in codes] == [["green", "amber", None], ["green", "amber", "red"]]
+
+def test_rules_digest_tracks_the_table(monkeypatch):
+    digest = rules_digest()
+    monkeypatch.setitem(KPI_RULES, "kpi_1_1_1", "lower")
+    assert rules_digest() != digest
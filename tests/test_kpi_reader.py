@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+from kpi_reader import KpiReader, iter_document, load_offsets, scan_document
+
+def _spans(doc_bytes):
+    return [(kind, name, doc_bytes[start:end]) for kind, name, start, end in iter_document(doc_bytes)]
+
+def _write(tmp_path, data):
+    path = tmp_path / "kpi_map.json"
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return str(path)
+
+def test_scan_matches_json(kpi_map_text):
+    content = kpi_map_text.encode("utf-8")
+    data = json.loads(kpi_map_text)
+    fields, nodes = scan_document(content)
+    assert [kpi_id for kpi_id, _, _ in nodes] == [node["id"] for node in data["nodes"]]
+    assert [json.loads(content[start:end]) for _, start, end in nodes] == data["nodes"]
+    assert {name: json.loads(content[start:end]) for name, (start, end) in fields.items()} == {
+        key: value for key, value in data.items() if key != "nodes"}
+
+def test_brackets_and_escapes_inside_strings():
+    data = {
+        "version": "a \"quoted\" ] } [ { version",
+        "tree": {"name": "x\\", "children": [{"name": "]}\\\"{["}]},
+        "nodes": [
+            {"id": "kpi_\"1\"", "name": "[brackets] {braces}", "notes": ["\\", "\\\"]"]},
+            {"name": "id after other keys", "nested": {"id": "not the node id"}, "id": "kpi_2"},
+        ],
+        "total_nodes": 2,
+    }
+    for indent in (None, 2):
+        content = json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")
+        spans = _spans(content)
+        assert [name for kind, name, _ in spans if kind == "node"] == ["kpi_\"1\"", "kpi_2"]
+        assert [json.loads(raw) for kind, _, raw in spans if kind == "node"] == data["nodes"]
+        assert {name: json.loads(raw) for kind, name, raw in spans if kind == "field"} == {
+            "version": data["version"], "tree": data["tree"], "total_nodes": 2}
+
+@pytest.mark.parametrize("node_id", [42, 4.5, None, True, {"x": 1}, [1, 2]])
+def test_non_string_ids_are_passed_on(node_id):
+    data = {"nodes": [{"id": node_id, "name": "n"}, {"id": "kpi_2"}]}
+    spans = _spans(json.dumps(data).encode("utf-8"))
+    expected = node_id if not isinstance(node_id, (dict, list)) else None
+    assert [name for kind, name, _ in spans if kind == "node"] == [expected, "kpi_2"]
+    assert [json.loads(raw) for kind, _, raw in spans if kind == "node"] == data["nodes"]
+
+@pytest.mark.parametrize("content", [
+    b'{"nodes": [{"id": "kpi_1"',
+    b'{"nodes": [{"id": "kpi_1}]}',
+    b'{"nodes": [{"id": tru}]}',
+    b'{"nodes": []}]',
+    b'{"version": "1.0',
+])
+def test_malformed_documents_raise_value_error(content):
+    with pytest.raises(ValueError, match="malformed|truncated"):
+        list(iter_document(content))
+
+def test_reader_lookups(tmp_path, kpi_map):
+    path = _write(tmp_path, kpi_map)
+    with KpiReader(path) as reader:
+        assert len(reader) == len(kpi_map["nodes"])
+        assert reader.ids() == [node["id"] for node in kpi_map["nodes"]]
+        assert reader.get(kpi_map["nodes"][7]["id"]) == kpi_map["nodes"][7]
+        assert list(reader.iter_nodes()) == kpi_map["nodes"]
+        assert reader.field("tree") == kpi_map["tree"]
+        assert reader.field("missing", "default") == "default"
+        assert "kpi_9_9_9" not in reader
+
+def test_reader_keeps_duplicate_ids(tmp_path, kpi_map, capsys):
+    duplicate = {**kpi_map["nodes"][1], "id": kpi_map["nodes"][0]["id"]}
+    kpi_map["nodes"].insert(5, duplicate)
+    with KpiReader(_write(tmp_path, kpi_map)) as reader:
+        assert len(reader) == len(kpi_map["nodes"])
+        assert list(reader.iter_nodes()) == kpi_map["nodes"]
+        assert reader.ids().count(duplicate["id"]) == 2
+        assert reader.get(duplicate["id"]) == kpi_map["nodes"][0]
+        assert reader.duplicates == [duplicate["id"]]
+    assert "duplicate node ids" in capsys.readouterr().out
+
+def test_offsets_are_rebuilt_when_the_document_changes(tmp_path, kpi_map):
+    path = _write(tmp_path, kpi_map)
+    assert len(load_offsets(path)["ids"]) == len(kpi_map["nodes"])
+    del kpi_map["nodes"][0]
+    _write(tmp_path, kpi_map)
+    with KpiReader(path) as reader:
+        assert reader.ids() == [node["id"] for node in kpi_map["nodes"]]
+
+def test_offsets_are_kept_outside_the_document_directory(tmp_path, kpi_map):
+    public = tmp_path / "public"
+    public.mkdir()
+    path = _write(public, kpi_map)
+    (public / "kpi_map.json.offsets").write_text("{}")
+    with KpiReader(path) as reader:
+        assert len(reader) == len(kpi_map["nodes"])
+    assert os.listdir(public) == ["kpi_map.json"]
+    assert (tmp_path / ".kpi_state" / "public" / "kpi_map.json.offsets").exists()
@@ -0,0 +1,74 @@
+import copy
+import json
+
+import pytest
+
+from kpi_reader import iter_document
+from kpi_validator import validate_document, validate_node
+
+def _write(tmp_path, content, name="kpi_map.json"):
+    path = tmp_path / name
+    path.write_bytes(content if isinstance(content, bytes) else json.dumps(content, indent=2).encode("utf-8"))
+    return str(path)
+
+def _paths(violations):
+    return {(violation["id"], violation["path"]) for violation in violations}
+
+def test_valid_node_has_no_errors(kpi_map):
+    assert validate_node(kpi_map["nodes"][0]) == []
+
+@pytest.mark.parametrize("edit, path", [
+    (lambda node: node.pop("unit"), "unit"),
+    (lambda node: node.update(rag="purple"), "rag"),
+    (lambda node: node["current_state"].update(gap="1"), "current_state.gap"),
+    (lambda node: node["trend_data"].insert(0, "x"), "trend_data[0]"),
+    (lambda node: node["current_state"].update(status="red" if node["rag"] != "red" else "green"),
+     "current_state.status"),
+])
+def test_node_violations(kpi_map, edit, path):
+    node = copy.deepcopy(kpi_map["nodes"][0])
+    edit(node)
+    assert path in [error_path for error_path, _ in validate_node(node)]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_committed_document_is_valid(tmp_path, kpi_map, workers):
+    nodes, violations = validate_document(_write(tmp_path, kpi_map), workers)
+    assert nodes == len(kpi_map["nodes"])
+    assert violations == []
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_document_violations(tmp_path, kpi_map, workers):
+    kpi_map["nodes"][3]["rag"] = "purple"
+    kpi_map["nodes"][5]["id"] = kpi_map["nodes"][4]["id"]
+    kpi_map["total_nodes"] = len(kpi_map["nodes"]) + 1
+    nodes, violations = validate_document(_write(tmp_path, kpi_map), workers)
+
+    assert nodes == len(kpi_map["nodes"])
+    assert _paths(violations) == {(kpi_map["nodes"][3]["id"], "rag"), (kpi_map["nodes"][5]["id"], "id"),
+                                  (None, "total_nodes")}
+    assert [violation["position"] for violation in violations] == [3, 5, None]
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("fraction", [0.001, 0.3, 0.5, 0.999])
+def test_truncated_document_is_a_violation(tmp_path, kpi_map_text, workers, fraction):
+    content = kpi_map_text.encode("utf-8")
+    nodes, violations = validate_document(_write(tmp_path, content[:int(len(content) * fraction)]), workers)
+    assert "document" in [violation["path"] for violation in violations]
+    assert "total_nodes" not in [violation["path"] for violation in violations]
+
+@pytest.mark.parametrize("content", [b"", b"{", b'{"nodes": [{"id": "kpi_1', b'{"nodes": []}]', b'{"version": '])
+def test_malformed_document_is_a_violation(tmp_path, content):
+    nodes, violations = validate_document(_write(tmp_path, content))
+    assert [violation["path"] for violation in violations] == ["document"]
+
+def test_reader_rejects_truncated_document(kpi_map_text):
+    content = kpi_map_text.encode("utf-8")
+    with pytest.raises(ValueError, match="truncated|malformed"):
+        list(iter_document(content[:len(content) // 2]))
+    assert sum(kind == "node" for kind, *_ in iter_document(content)) == len(json.loads(kpi_map_text)["nodes"])
+
+def test_numeric_id_is_reported_not_raised(tmp_path, kpi_map):
+    kpi_map["nodes"][2]["id"] = 42
+    nodes, violations = validate_document(_write(tmp_path, kpi_map))
+    assert nodes == len(kpi_map["nodes"])
+    assert _paths(violations) == {(42, "id")}
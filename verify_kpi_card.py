@@ -2,24 +2,27 @@
 """
 Verify KPI card data structure and key_insights fix
 """
-import json
+from kpi_index import KpiIndex, build_index, source_digest
+from kpi_reader import KpiReader
+from kpi_validator import validate_document
 
-# Load KPI data
-with open('public/kpi_map.json', 'r') as f:
-    data = json.load(f)
+# Memory-mapped KPI data: only the records used below are decoded
+reader = KpiReader('public/kpi_map.json')
 
-# Find first KPI node (level 4)
-def find_kpi(node, path=[]):
-    if isinstance(node, dict):
-        if node.get('type') == 'kpi' and node.get('level') == 4:
-            return node, path + [node['name']]
-        for child in node.get('children', []):
-            result = find_kpi(child, path + [node.get('name', 'Root')])
-            if result and result[0]:
-                return result
-    return None, []
+# Id → path index (public/kpi_index.json, or built from the full document if stale)
+index = (KpiIndex.published(source_digest(reader.ids(), reader.field('tree')))
+         or KpiIndex(build_index({**{name: reader.field(name) for name in reader.fields},
+                                  'nodes': list(reader.iter_nodes())})))
 
-kpi, path = find_kpi(data)
+# Find first KPI node (level 4) and its full record from `nodes`
+def find_kpi(level=4):
+    kpi_ids = index.at_depth(level)
+    if not kpi_ids:
+        return None, []
+    kpi = reader.get(kpi_ids[0])
+    return kpi, index.breadcrumb(kpi['id'], reader.field('tree', {}).get('name', 'Root')) + [kpi['name']]
+
+kpi, path = find_kpi()
 
 if not kpi:
     print('❌ No KPI found!')
@@ -53,6 +56,15 @@ for field in required_fields:
     symbol = '✅' if exists else '❌'
     print(f'   {symbol} {field}: {"Present" if exists else "MISSING"}')
 
+print()
+
+# Validate every node against the full KPI contract, not just this card
+nodes_checked, violations = validate_document('public/kpi_map.json')
+symbol = '✅' if not violations else '❌'
+print(f'{symbol} Full contract check: {nodes_checked} nodes, {len(violations)} violations')
+for violation in violations[:10]:
+    print(f'   ❌ {violation["id"]}: {violation["path"]}: {violation["message"]}')
+
 print()
 print('=' * 60)
 print('✅ ALL FIXES APPLIED:')